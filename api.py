@@ -0,0 +1,472 @@
+# HTTP JSON 接口：用 asyncio 直接提供收入、状态、每秒收入和批量查询，供其他内部工具调用。
+# 只依赖 clock / weekly / presets / lru（不导入 Streamlit），相同的日程定义在所有请求间共享同一个编译日历
+#
+#   python api.py --port 8765
+#   curl -s localhost:8765/status -d '{"schedule": {"timezone": "Asia/Shanghai", "daily_salary": 300,
+#        "periods": [["09:00", "12:00"], ["13:00", "18:00"]], "workdays": [0, 1, 2, 3, 4]}}'
+#   curl -sN localhost:8765/stream -d '{"schedule": {"daily_salary": 300, "preset": "Standard (9-18)"}}'
+#   curl -s localhost:8765/earnings -d '{"schedule": {"daily_salary": 300, "preset": "Standard (9-18)",
+#        "workdays": [0, 1, 2, 3, 4], "weekday_periods": {"5": [["10:00", "14:00"]]}}}'
+import argparse
+import asyncio
+import json
+import math
+import time
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from broadcast import DEFAULT_TICK_INTERVAL, Broadcaster
+from clock import get_timezone
+from lru import LRUCache
+from presets import find_preset
+from rates import make_tier, normalize_tiers
+from weekly import ALL_WEEKDAYS, WeeklySchedule, get_calendar, goal_eta, normalize_shifts, status_at
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFINITION_CACHE_SIZE = 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_QUERIES = 10000
+LISTEN_BACKLOG = 4096
+# 数值字段的上限：超出时日历计算会溢出或失去意义
+MAX_MOMENT = 32503680000.0  # 3000-01-01 UTC
+MAX_DAILY_SALARY = 1e9
+MAX_MULTIPLIER = 100.0
+MAX_GOAL_AMOUNT = 1e12
+
+STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+# 原始定义 -> 日程，以及规范化定义 -> 日程两级缓存：重复的请求跳过解析，写法不同但等价的定义共享同一个日程
+_definition_cache = LRUCache(DEFINITION_CACHE_SIZE)
+_schedule_cache = LRUCache(DEFINITION_CACHE_SIZE)
+
+
+# 请求中的错误：以对应的 HTTP 状态码和 {"error": ...} 返回
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _bad_request(message):
+    return ApiError(HTTPStatus.BAD_REQUEST, message)
+
+
+# JSON 数值字段：必须是有限的数（不接受布尔值、NaN 和无穷大），且大于 0（allow_zero 时不小于 0）、不大于 high
+def _parse_number(value, high, message, allow_zero=False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _bad_request(message)
+    try:
+        number = float(value)
+    except OverflowError:
+        raise _bad_request(message)
+    if not math.isfinite(number) or number > high or number < 0 or (number == 0 and not allow_zero):
+        raise _bad_request(message)
+    return number
+
+
+def _parse_time(value):
+    try:
+        return datetime.strptime(value, "%H:%M").time()
+    except (TypeError, ValueError):
+        raise _bad_request(f"invalid time {value!r}, expected HH:MM")
+
+
+# 原始定义的可哈希形式；结构不可哈希时返回 None，直接走完整解析
+def _definition_key(definition):
+    salary = definition.get("daily_salary")
+    periods = definition.get("periods")
+    workdays = definition.get("workdays")
+    weekday_periods = definition.get("weekday_periods")
+    try:
+        key = (
+            definition.get("timezone"),
+            type(salary),
+            salary,
+            tuple(map(tuple, periods)) if isinstance(periods, list) else periods,
+            definition.get("preset"),
+            tuple(workdays) if isinstance(workdays, list) else workdays,
+            _tiers_key(definition.get("tiers")),
+            tuple(
+                (weekday, tuple(map(tuple, periods)) if isinstance(periods, list) else periods)
+                for weekday, periods in sorted(weekday_periods.items())
+            ) if isinstance(weekday_periods, dict) else weekday_periods,
+        )
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _tiers_key(tiers):
+    if not isinstance(tiers, list):
+        return tiers
+    return tuple(
+        tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(tier.items()))
+        if isinstance(tier, dict) else tier
+        for tier in tiers
+    )
+
+
+# 计薪倍率档位：[{"start": "18:00", "end": "00:00", "multiplier": 1.5, "workdays": [0, 1, 2, 3, 4]}]，
+# workdays 省略时每天生效；结束不晚于开始表示跨越午夜，相等表示整天
+def _parse_tiers(tiers):
+    if not isinstance(tiers, list):
+        raise _bad_request("tiers must be a list of objects")
+    parsed = []
+    for tier in tiers:
+        if not isinstance(tier, dict):
+            raise _bad_request("tiers must be a list of objects")
+        multiplier = _parse_number(tier.get("multiplier"), MAX_MULTIPLIER,
+                                   f"tier multiplier must be a positive number no greater than {MAX_MULTIPLIER:g}")
+        workdays = tier.get("workdays", list(ALL_WEEKDAYS))
+        if not isinstance(workdays, list) or not all(day in ALL_WEEKDAYS and not isinstance(day, bool) for day in workdays):
+            raise _bad_request("tier workdays must be a list of integers 0 (Monday) to 6 (Sunday)")
+        parsed.append(make_tier(workdays, _parse_time(tier.get("start")), _parse_time(tier.get("end")), multiplier))
+    return normalize_tiers(parsed)
+
+
+# [["09:00", "12:00"], ...] 解析为工作时间段；name 为错误信息中的字段名
+def _parse_periods(periods, name):
+    if not isinstance(periods, list) or not all(isinstance(period, list) and len(period) == 2 for period in periods):
+        raise _bad_request(f"{name} must be a list of [start, end] pairs")
+    return [{"start_time": _parse_time(start), "end_time": _parse_time(end)} for start, end in periods]
+
+
+# 按星期几单独设置的时间段：{"5": [["10:00", "14:00"]]}，键为 "0"（星期一）到 "6"（星期日），空列表表示当天休息
+def _parse_weekday_periods(weekday_periods):
+    if not isinstance(weekday_periods, dict):
+        raise _bad_request("weekday_periods must be an object mapping weekday 0-6 to periods")
+    overrides = {}
+    for weekday, periods in weekday_periods.items():
+        if weekday not in {str(day) for day in ALL_WEEKDAYS}:
+            raise _bad_request(f"invalid weekday {weekday!r} in weekday_periods, expected 0 (Monday) to 6 (Sunday)")
+        overrides[int(weekday)] = _parse_periods(periods, f"weekday_periods[{weekday}]")
+    return overrides
+
+
+# JSON 日程定义解析为 (WeeklySchedule, 时区)；定义中任何无法解析或编译的内容都以 400 返回
+def parse_schedule(definition):
+    if not isinstance(definition, dict):
+        raise _bad_request("schedule must be an object")
+    key = _definition_key(definition)
+    try:
+        if key is None:
+            return _compile_definition(definition)
+        return _definition_cache.get_or_create(key, lambda: _compile_definition(definition))
+    except (TypeError, ValueError, OverflowError) as error:
+        raise _bad_request(f"invalid schedule: {error}")
+
+
+# 校验并规范化（解析钟点、合并重叠、展开跨午夜的时间段），以规范化结果为键共享同一个日程对象
+def _compile_definition(definition):
+    timezone = definition.get("timezone", "Asia/Shanghai")
+    if not isinstance(timezone, str):
+        raise _bad_request("timezone must be a string, e.g. Asia/Shanghai")
+    try:
+        get_timezone(timezone)
+    except (KeyError, ValueError):
+        raise _bad_request(f"unknown timezone {timezone!r}")
+
+    salary = _parse_number(definition.get("daily_salary"), MAX_DAILY_SALARY,
+                           f"daily_salary must be a positive number no greater than {MAX_DAILY_SALARY:g}")
+
+    if "periods" in definition:
+        periods = _parse_periods(definition["periods"], "periods")
+    elif "preset" in definition:
+        periods = find_preset(str(definition["preset"]))
+        if periods is None:
+            raise _bad_request(f"unknown preset {definition['preset']!r}")
+    else:
+        raise _bad_request("schedule needs periods or preset")
+
+    workdays = definition.get("workdays", list(ALL_WEEKDAYS))
+    if not isinstance(workdays, list) or not all(day in ALL_WEEKDAYS and not isinstance(day, bool) for day in workdays):
+        raise _bad_request("workdays must be a list of integers 0 (Monday) to 6 (Sunday)")
+
+    tiers = _parse_tiers(definition.get("tiers", []))
+    overrides = _parse_weekday_periods(definition.get("weekday_periods", {}))
+
+    shifts = normalize_shifts(periods)
+    workdays = frozenset(workdays)
+    key = (
+        tuple(
+            normalize_shifts(overrides[weekday]) if weekday in overrides else shifts if weekday in workdays else ()
+            for weekday in ALL_WEEKDAYS
+        ),
+        salary,
+        tiers,
+        timezone,
+    )
+    weekly = _schedule_cache.get_or_create(key, lambda: WeeklySchedule(key[0], key[1], key[2]))
+    return weekly, timezone
+
+
+def _parse_moment(query):
+    moment = query.get("at")
+    if moment is None:
+        return time.time()
+    return _parse_number(moment, MAX_MOMENT, f"at must be a Unix timestamp in seconds between 0 and {MAX_MOMENT:.0f}",
+                         allow_zero=True)
+
+
+# 当前工作日截至 at 的收入
+def query_earnings(query):
+    weekly, timezone = parse_schedule(query.get("schedule"))
+    moment = _parse_moment(query)
+    day, work_seconds, earned = get_calendar(weekly, timezone, moment).day_totals(moment)
+    return {
+        "at": moment,
+        "work_day": day.isoformat(),
+        "earned": earned,
+        "work_seconds": work_seconds,
+        "progress": earned / weekly.daily_salary * 100,
+    }
+
+
+# at 时刻的完整状态
+def query_status(query):
+    weekly, timezone = parse_schedule(query.get("schedule"))
+    return status_at(weekly, timezone, _parse_moment(query))
+
+
+# at 时刻的每秒收入，以及下一次收入速率变化的时刻
+def query_rate(query):
+    weekly, timezone = parse_schedule(query.get("schedule"))
+    moment = _parse_moment(query)
+    calendar = get_calendar(weekly, timezone, moment)
+    rate = calendar.rate_at(moment)
+    next_change = calendar.next_boundary(moment)
+    return {
+        "at": moment,
+        "working": rate > 0,
+        "money_per_second": rate,
+        "money_per_hour": rate * 3600,
+        "seconds_per_dollar": 1 / rate if rate > 0 else None,
+        "next_change": next_change,
+    }
+
+
+# 当前工作日的收入达到 amount 的时刻：已达成时 reached 为 true；一年内达不到时 reached_at 为 null
+def query_goal(query):
+    weekly, timezone = parse_schedule(query.get("schedule"))
+    moment = _parse_moment(query)
+    amount = _parse_number(query.get("amount"), MAX_GOAL_AMOUNT,
+                           f"amount must be a positive number no greater than {MAX_GOAL_AMOUNT:g}")
+    reached, reached_at = goal_eta(weekly, timezone, moment, amount)
+    return {
+        "at": moment,
+        "amount": amount,
+        "reached": reached,
+        "reached_at": reached_at,
+        "seconds_left": reached_at - moment if reached_at is not None else None,
+    }
+
+
+QUERIES = {
+    "earnings": query_earnings,
+    "status": query_status,
+    "rate": query_rate,
+    "goal": query_goal,
+}
+
+
+# 执行一项查询：请求内容导致的解析或计算错误（类型不对、数值越界等）都转为 400
+def run_query(handler, query):
+    try:
+        return handler(query)
+    except (TypeError, ValueError, OverflowError) as error:
+        raise _bad_request(f"invalid query: {error}")
+
+
+# 批量查询：每一项带 kind（earnings/status/rate/goal），单项出错不影响其他项
+def query_batch(body):
+    queries = body.get("queries")
+    if not isinstance(queries, list):
+        raise _bad_request("queries must be a list")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH_QUERIES} queries per batch")
+    results = []
+    for query in queries:
+        if not isinstance(query, dict) or query.get("kind") not in QUERIES:
+            results.append({"error": f"kind must be one of {', '.join(QUERIES)}"})
+            continue
+        try:
+            results.append(run_query(QUERIES[query["kind"]], query))
+        except ApiError as error:
+            results.append({"error": error.message})
+    return {"results": results}
+
+
+def _route(path):
+    return path.split("?", 1)[0].rstrip("/") or "/"
+
+
+# 路由：返回 (状态码, 响应对象)
+def dispatch(method, path, body, broadcaster=None):
+    path = _route(path)
+    if path == "/health":
+        stats = broadcaster.stats() if broadcaster is not None else {}
+        return HTTPStatus.OK, {"status": "ok", **stats}
+
+    handler = QUERIES.get(path.lstrip("/"))
+    if handler is None and path != "/batch":
+        raise ApiError(HTTPStatus.NOT_FOUND, f"unknown endpoint {path}")
+    if method != "POST":
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST with a JSON body")
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise _bad_request("body is not valid JSON")
+    if not isinstance(payload, dict):
+        raise _bad_request("body must be a JSON object")
+    if handler is None:
+        return HTTPStatus.OK, query_batch(payload)
+    return HTTPStatus.OK, run_query(handler, payload)
+
+
+def encode_response(status, payload, keep_alive):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+# 推送流订阅的日程：GET 时为查询参数 schedule（JSON），POST 时为请求体 {"schedule": {...}}
+def parse_stream_request(method, path, body):
+    if method == "GET":
+        values = parse_qs(urlsplit(path).query).get("schedule")
+        if not values:
+            raise _bad_request("missing schedule query parameter")
+        raw = values[0]
+    elif method == "POST":
+        raw = body or b"{}"
+    else:
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET or POST")
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        raise _bad_request("schedule is not valid JSON")
+    if method == "POST":
+        if not isinstance(payload, dict):
+            raise _bad_request("body must be a JSON object")
+        payload = payload.get("schedule")
+    return parse_schedule(payload)
+
+
+# 推送流（SSE）：订阅后连接交给广播器按节拍写入，直到客户端断开
+async def stream_events(method, path, body, reader, writer, broadcaster):
+    try:
+        weekly, timezone = parse_stream_request(method, path, body)
+    except ApiError as error:
+        writer.write(encode_response(error.status, {"error": error.message}, False))
+        return
+    writer.write(STREAM_HEADERS)
+    key = broadcaster.subscribe(weekly, timezone, writer)
+    try:
+        # 客户端之后不再发送数据，读到 EOF 即表示断开
+        while await reader.read(1024):
+            pass
+    except ConnectionError:
+        pass
+    finally:
+        broadcaster.unsubscribe(key, writer)
+
+
+# 一个连接上的请求循环（HTTP/1.1 默认保持连接）
+async def handle_connection(reader, writer, broadcaster=None):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                method, path, version = request_line.split(" ", 2)
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                writer.write(encode_response(HTTPStatus.BAD_REQUEST, {"error": "malformed request"}, False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(encode_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"}, False))
+                break
+            try:
+                body = await reader.readexactly(length) if length else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            if broadcaster is not None and _route(path) == "/stream":
+                await stream_events(method, path, body, reader, writer, broadcaster)
+                break
+
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            try:
+                status, payload = dispatch(method, path, body, broadcaster)
+            except ApiError as error:
+                status, payload = error.status, {"error": error.message}
+            except Exception:
+                # 未预料的错误也要回复状态码，而不是直接断开连接
+                status, payload, keep_alive = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}, False
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None, stream_interval=DEFAULT_TICK_INTERVAL):
+    broadcaster = Broadcaster(stream_interval)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, broadcaster),
+        host, port, backlog=LISTEN_BACKLOG,
+    )
+    broadcaster.start()
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await broadcaster.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Money Tracker JSON HTTP API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--stream-interval", type=float, default=DEFAULT_TICK_INTERVAL,
+                        help="seconds between pushed earnings ticks on /stream")
+    args = parser.parse_args(argv)
+
+    def announce(server):
+        address = server.sockets[0].getsockname()
+        print(f"listening on http://{address[0]}:{address[1]}", flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, announce, args.stream_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# 批量收入计算：一次向量化计算多名员工在多个时刻的收入
+import numpy as np
+
+from engine import SECONDS_PER_DAY, normalize_periods
+
+# 分块计算时每块的元素数量
+CHUNK_ELEMENTS = 64 * 1024
+
+
+# 多名员工的编译日程：按员工补齐到相同区间数，空位用长度为 0 的区间填充
+class ScheduleBatch:
+    __slots__ = ("starts", "durations", "money_per_second")
+
+    def __init__(self, starts, durations, money_per_second):
+        self.starts = starts
+        self.durations = durations
+        self.money_per_second = money_per_second
+
+    def __len__(self):
+        return self.starts.shape[0]
+
+    # 每名员工在给定时刻（当天秒数）已完成的工作秒数，返回形状为 (员工数, 时刻数) 的数组
+    def work_seconds_at(self, seconds):
+        seconds = np.asarray(seconds, dtype=np.float64)
+        result = np.zeros((len(self), seconds.shape[0]), dtype=np.float64)
+        # 按行分块计算，让中间结果保持在 CPU 缓存内
+        rows = max(1, CHUNK_ELEMENTS // max(1, seconds.shape[0]))
+        scratch = np.empty((rows, seconds.shape[0]), dtype=np.float64)
+        for top in range(0, len(self), rows):
+            block = result[top:top + rows]
+            work = scratch[:block.shape[0]]
+            starts = self.starts[top:top + rows]
+            durations = self.durations[top:top + rows]
+            for k in range(starts.shape[1]):
+                np.subtract(seconds[np.newaxis, :], starts[:, k:k + 1], out=work)
+                np.clip(work, 0.0, durations[:, k:k + 1], out=work)
+                block += work
+        return result
+
+    # 每名员工在给定时刻已赚取的金额，返回形状为 (员工数, 时刻数) 的数组
+    def earned_at(self, seconds):
+        result = self.work_seconds_at(seconds)
+        result *= self.money_per_second[:, np.newaxis]
+        return result
+
+
+# 编译多名员工的日程；employees 为 (work_periods, daily_salary) 的可迭代对象
+def compile_schedules(employees):
+    normalized = [(normalize_periods(periods), daily_salary) for periods, daily_salary in employees]
+    width = max((len(intervals) for intervals, _ in normalized), default=0)
+
+    starts = np.zeros((len(normalized), width), dtype=np.float64)
+    durations = np.zeros((len(normalized), width), dtype=np.float64)
+    money_per_second = np.zeros(len(normalized), dtype=np.float64)
+    for row, (intervals, daily_salary) in enumerate(normalized):
+        total = 0
+        for col, (start, end) in enumerate(intervals):
+            starts[row, col] = start
+            durations[row, col] = end - start
+            total += end - start
+        if total > 0:
+            money_per_second[row] = daily_salary / total
+    return ScheduleBatch(starts, durations, money_per_second)
+
+
+# 将 Unix 时间戳（秒）或 datetime64 数组转换为当地的当天秒数
+def seconds_of_day(timestamps, utc_offset_seconds=0):
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        timestamps = timestamps.astype("datetime64[us]").astype(np.int64) / 1_000_000
+    return np.mod(timestamps.astype(np.float64) + utc_offset_seconds, SECONDS_PER_DAY)
@@ -0,0 +1,163 @@
+# HTTP 接口压测：在子进程中启动 api.py，用 asyncio 建立大量并发保持连接的客户端，
+# 每个客户端顺序发送请求，报告 p50/p99 延迟和每秒请求数
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_PATH = os.path.join(ROOT_DIR, "api.py")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from st_client import free_port  # noqa: E402
+
+TIMEZONES = ["Asia/Shanghai", "America/New_York", "Europe/London", "Australia/Sydney"]
+
+
+# 生成若干不同的日程定义，模拟多个调用方
+def schedule_definitions(count, seed):
+    rng = random.Random(seed)
+    definitions = []
+    for _ in range(count):
+        start = rng.randrange(6, 12)
+        lunch = start + rng.randrange(2, 5)
+        end = lunch + 1 + rng.randrange(3, 6)
+        definitions.append({
+            "timezone": rng.choice(TIMEZONES),
+            "daily_salary": rng.randrange(100, 1000),
+            "periods": [[f"{start:02d}:00", f"{lunch:02d}:00"], [f"{lunch + 1:02d}:00", f"{end % 24:02d}:00"]],
+            "workdays": [0, 1, 2, 3, 4],
+        })
+    return definitions
+
+
+def build_request(port, endpoint, definition, batch_size):
+    if endpoint == "batch":
+        payload = {"queries": [
+            {"kind": kind, "schedule": definition}
+            for kind in (["earnings", "status", "rate"] * batch_size)[:batch_size]
+        ]}
+    else:
+        payload = {"schedule": definition}
+    body = json.dumps(payload).encode()
+    head = (
+        f"POST /{endpoint} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+# 一个保持连接的客户端：顺序发送 requests 个请求并记录每个请求的延迟
+async def client(port, requests, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for index in range(requests):
+            started = time.perf_counter()
+            writer.write(payloads[index % len(payloads)])
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode())
+    finally:
+        writer.close()
+
+
+async def run_clients(port, clients, requests, payloads):
+    latencies = []
+    errors = []
+    # 所有客户端同时运行，服务端始终有 clients 个并发连接
+    await asyncio.gather(*(
+        client(port, requests, payloads[index::clients] or payloads, latencies, errors)
+        for index in range(clients)
+    ))
+    return latencies, errors
+
+
+def worker(port, clients, requests, payloads, queue):
+    started = time.perf_counter()
+    latencies, errors = asyncio.run(run_clients(port, clients, requests, payloads))
+    queue.put((latencies, errors, time.perf_counter() - started))
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the JSON HTTP API")
+    parser.add_argument("--clients", type=int, default=1000, help="concurrent keep-alive clients")
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--endpoint", choices=["earnings", "status", "rate", "batch"], default="status")
+    parser.add_argument("--batch-size", type=int, default=100, help="queries per request for --endpoint batch")
+    parser.add_argument("--schedules", type=int, default=50, help="distinct schedule definitions")
+    parser.add_argument("--processes", type=int, default=1, help="client processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, API_PATH, "--port", str(port)],
+        cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        server.stdout.readline()
+        definitions = schedule_definitions(args.schedules, args.seed)
+        payloads = [build_request(port, args.endpoint, definition, args.batch_size) for definition in definitions]
+
+        queue = multiprocessing.Queue()
+        per_process = [args.clients // args.processes + (index < args.clients % args.processes)
+                       for index in range(args.processes)]
+        started = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=worker, args=(port, count, args.requests, payloads, queue))
+            for count in per_process if count
+        ]
+        for process in workers:
+            process.start()
+        results = [queue.get() for _ in workers]
+        elapsed = time.perf_counter() - started
+        for process in workers:
+            process.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    errors = [error for result in results for error in result[1]]
+    summary = {
+        "endpoint": args.endpoint,
+        "clients": args.clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "queries_per_second": len(latencies) * (args.batch_size if args.endpoint == "batch" else 1) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"{summary['endpoint']}: {summary['clients']} clients, {summary['requests']} requests "
+          f"({summary['errors']} errors) in {summary['seconds']:.2f}s")
+    print(f"  {summary['requests_per_second']:.0f} req/s ({summary['queries_per_second']:.0f} queries/s)")
+    print(f"  p50 {summary['p50_ms']:.1f} ms   p99 {summary['p99_ms']:.1f} ms   mean {summary['mean_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# 批量收入计算基准：10k 名员工 × 1k 个时刻
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import time as dt_time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import compile_schedules  # noqa: E402
+from engine import compile_schedule  # noqa: E402
+
+
+# 生成随机的工作时间段（以 15 分钟为粒度）
+def random_periods(rng):
+    periods = []
+    cursor = rng.randrange(6 * 4, 10 * 4)
+    for _ in range(rng.randint(1, 4)):
+        length = rng.randrange(4, 16)
+        end = min(cursor + length, 24 * 4 - 1)
+        if end <= cursor:
+            break
+        periods.append({
+            "start_time": dt_time(cursor // 4, cursor % 4 * 15),
+            "end_time": dt_time(end // 4, end % 4 * 15),
+        })
+        cursor = end + rng.randrange(1, 8)
+        if cursor >= 24 * 4 - 1:
+            break
+    return periods
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized batch earnings")
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--timestamps", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    employees = [(random_periods(rng), rng.uniform(100, 1000)) for _ in range(args.employees)]
+    seconds = np.linspace(0, 24 * 3600, args.timestamps, endpoint=False)
+
+    started = time.perf_counter()
+    batch = compile_schedules(employees)
+    compile_time = time.perf_counter() - started
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        earned = batch.earned_at(seconds)
+        timings.append(time.perf_counter() - started)
+
+    # 抽样与逐个计算的结果对比
+    for row in rng.sample(range(args.employees), min(50, args.employees)):
+        periods, daily_salary = employees[row]
+        schedule = compile_schedule(periods)
+        rate = daily_salary / schedule.total_seconds
+        for col in rng.sample(range(args.timestamps), min(20, args.timestamps)):
+            expected = schedule.earned_at(seconds[col], rate)
+            assert abs(expected - earned[row, col]) < 1e-6, (row, col, expected, earned[row, col])
+
+    print(f"employees x timestamps: {args.employees} x {args.timestamps} ({earned.size:,} values)")
+    print(f"compile: {compile_time * 1000:.1f} ms")
+    print(f"evaluate: best {min(timings) * 1000:.1f} ms, median {sorted(timings)[len(timings) // 2] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
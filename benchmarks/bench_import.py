@@ -0,0 +1,128 @@
+# 日程导入压测：生成含大量事件的 CSV 和 iCalendar 文件（乱序、有重叠、跨夏令时切换），
+# 报告导入耗时、每个事件的耗时、tracemalloc 峰值内存与文件大小之比，并抽查区间合并结果
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from importer import import_path  # noqa: E402
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+# 随机事件：每天若干个 30 分钟到 4 小时的班次，约三成与其他事件重叠，顺序打乱
+def random_events(count, seed):
+    rng = random.Random(seed)
+    days = max(1, count // 4)
+    events = []
+    for _ in range(count):
+        day = FIRST_DAY + timedelta(days=rng.randrange(days))
+        start = rng.randrange(6 * 60, 20 * 60, 15)
+        length = rng.randrange(30, 4 * 60 + 1, 15)
+        events.append((day, start, start + length))
+    return events
+
+
+def clock_text(minutes, separator=":"):
+    return f"{minutes // 60:02d}{separator}{minutes % 60:02d}"
+
+
+def write_csv(path, events):
+    with open(path, "w") as output:
+        output.write("start,end\n")
+        for day, start, end in events:
+            end_day = day + timedelta(days=end // (24 * 60))
+            output.write(f"{day}T{clock_text(start)},{end_day}T{clock_text(end % (24 * 60))}\n")
+
+
+def write_ics(path, events):
+    with open(path, "w", newline="") as output:
+        output.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for index, (day, start, end) in enumerate(events):
+            end_day = day + timedelta(days=end // (24 * 60))
+            output.write(
+                "BEGIN:VEVENT\r\n"
+                f"UID:{index}@bench\r\n"
+                f"SUMMARY:Shift {index}\r\n"
+                f"DTSTART;TZID=America/New_York:{day:%Y%m%d}T{clock_text(start, '')}00\r\n"
+                f"DTEND;TZID=America/New_York:{end_day:%Y%m%d}T{clock_text(end % (24 * 60), '')}00\r\n"
+                "END:VEVENT\r\n"
+            )
+        output.write("END:VCALENDAR\r\n")
+
+
+# 参考答案：按本地日期逐日合并区间（事件不跨午夜），得到总工作秒数
+def expected_seconds(events):
+    by_day = {}
+    for day, start, end in events:
+        by_day.setdefault(day, []).append((start, end))
+    total = 0
+    for intervals in by_day.values():
+        intervals.sort()
+        current_start, current_end = intervals[0]
+        for start, end in intervals[1:]:
+            if start <= current_end:
+                current_end = max(current_end, end)
+            else:
+                total += current_end - current_start
+                current_start, current_end = start, end
+        total += current_end - current_start
+    return total * 60
+
+
+# 先单独计时，再在 tracemalloc 下重跑一次取峰值内存（tracemalloc 会明显拖慢分配密集的代码）
+def measure(path, timezone):
+    started = time.perf_counter()
+    schedule, stats = import_path(path, timezone)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    import_path(path, timezone)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return schedule, stats, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streaming CSV/ICS schedule import")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    events = random_events(args.events, args.seed)
+    expected = expected_seconds(events)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for kind, writer in (("csv", write_csv), ("ics", write_ics)):
+            path = os.path.join(directory, f"schedule.{kind}")
+            writer(path, events)
+            schedule, stats, elapsed, peak = measure(path, "America/New_York")
+            if abs(schedule.total_seconds - expected) > 1e-6:
+                raise RuntimeError(f"{kind}: merged {schedule.total_seconds} s, expected {expected} s")
+            results[kind] = {
+                "file_mb": os.path.getsize(path) / 2 ** 20,
+                "seconds": elapsed,
+                "us_per_event": elapsed / stats.events * 1e6,
+                "peak_mb": peak / 2 ** 20,
+                **stats.as_dict(),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for kind, result in results.items():
+        print(f"{kind}: {result['events']} events ({result['file_mb']:.1f} MB) -> {result['intervals']} intervals "
+              f"in {result['seconds']:.2f}s ({result['us_per_event']:.1f} us/event), "
+              f"peak traced memory {result['peak_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# 多收入来源压测：按来源数 k 给出合计收入曲线的构建耗时和每次查询的耗时，对比
+#   merged  堆归并各来源日历的分段边界得到的合计曲线，合计收入/时薪各一次二分查找
+#   sum     每次查询都在 k 个日历上各查一次再相加
+#   sorted  把所有边界拼在一起整体排序再扫描（构建方式的对照）
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from operator import itemgetter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from clock import TIMEZONE_OPTIONS  # noqa: E402
+from presets import PRESET_PERIODS, WORK_TIME_PRESETS  # noqa: E402
+from streams import CombinedCalendar, IncomeStream, _boundaries  # noqa: E402
+from weekly import PayCurve, WeeklySchedule, get_calendar  # noqa: E402
+
+PRESETS = [PRESET_PERIODS[name] for name, periods in WORK_TIME_PRESETS["en"].items() if periods]
+TIMEZONES = list(TIMEZONE_OPTIONS)
+# 查询时刻的起点：2025-03-03 00:00 UTC（星期一）
+SIMULATION_START = 1740960000.0
+
+
+def make_streams(count, seed):
+    rng = random.Random(seed)
+    return [
+        IncomeStream(
+            f"stream {index}",
+            WeeklySchedule.from_periods(PRESETS[index % len(PRESETS)], (0, 1, 2, 3, 4), float(rng.randrange(100, 1000, 10))),
+            TIMEZONES[index % len(TIMEZONES)],
+        )
+        for index in range(count)
+    ]
+
+
+# 对照：拼接后整体排序
+def sorted_curve(calendars):
+    curve = PayCurve()
+    curve._sweep(sorted((event for calendar in calendars for event in _boundaries(calendar)), key=itemgetter(0)))
+    return curve
+
+
+def timed(func, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - started) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare combined-earnings queries over k income streams")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.streams:
+        streams = make_streams(count, args.seed)
+        calendars = tuple(get_calendar(stream.weekly, stream.timezone, SIMULATION_START) for stream in streams)
+        combined = CombinedCalendar(calendars)
+        rng = random.Random(args.seed)
+        moments = [rng.uniform(combined.window_start, combined.window_end) for _ in range(args.queries)]
+
+        def merged_queries():
+            for moment in moments:
+                combined.pay_at(moment)
+                combined.rate_at(moment)
+
+        def sum_queries():
+            for moment in moments:
+                sum(calendar.pay_at(moment) for calendar in calendars)
+                sum(calendar.rate_at(moment) for calendar in calendars)
+
+        number = max(1, 200 // count)
+        results.append({
+            "streams": count,
+            "segments": len(combined.starts),
+            "merge_build_ms": timed(lambda: CombinedCalendar(calendars), number) * 1000,
+            "sorted_build_ms": timed(lambda: sorted_curve(calendars), number) * 1000,
+            "merged_query_us": timed(merged_queries, 3) / len(moments) * 1e6,
+            "sum_query_us": timed(sum_queries, 3) / len(moments) * 1e6,
+            "breakdown_us": timed(lambda: [combined.breakdown(moment) for moment in moments[:2000]], 3) / 2000 * 1e6,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'streams':>7} {'segments':>8} {'merge ms':>9} {'sort ms':>8} {'merged us':>10} {'sum us':>7} {'breakdown us':>12}")
+    for row in results:
+        print(f"{row['streams']:>7} {row['segments']:>8} {row['merge_build_ms']:>9.2f} {row['sorted_build_ms']:>8.2f} "
+              f"{row['merged_query_us']:>10.2f} {row['sum_query_us']:>7.2f} {row['breakdown_us']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# 并发会话容量测试：启动本地应用，逐级增加处于运行状态的会话数 N，
+# 每个会话使用各自的预设日程、时区、日薪和刷新周期，像浏览器一样按周期请求实时区域重跑。
+# 每一级报告服务进程 CPU、内存、重跑延迟分布和错过的刷新截止时间，用于估算单个服务进程的容量
+#
+#   python benchmarks/bench_load.py --steps 10 25 50 100 --duration 30
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_terminal import rss_kb  # noqa: E402
+from clock import TIMEZONE_OPTIONS  # noqa: E402
+from presets import WORK_TIME_PRESETS  # noqa: E402
+from st_client import StreamlitSession, free_port, start_app  # noqa: E402
+from texts import TEXTS  # noqa: E402
+
+# 与应用中实时区域的 run_every 一致
+DEFAULT_INTERVAL = 5.0
+TIMEZONE_LABEL = "选择时区 / Select Timezone"
+SALARY_LABEL = TEXTS["zh"]["daily_salary"]
+PRESET_NAMES = [name for name, periods in WORK_TIME_PRESETS["zh"].items() if periods]
+TIMEZONE_NAMES = list(TIMEZONE_OPTIONS)
+
+
+# 进程已消耗的 CPU 时间（用户态 + 内核态，秒）
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# 一个模拟的追踪者：配置自己的日程后开始追踪，之后按自己的周期请求实时区域重跑
+class Tracker:
+    def __init__(self, port, index, interval, rng):
+        self.session = StreamlitSession(port)
+        self.preset = PRESET_NAMES[index % len(PRESET_NAMES)]
+        self.timezone = TIMEZONE_NAMES[index % len(TIMEZONE_NAMES)]
+        self.salary = float(rng.randrange(100, 1000, 10))
+        self.interval = interval
+        self.phase = rng.uniform(0, interval)
+
+    async def start(self):
+        session = self.session
+        await session.connect()
+        await session.rerun()
+        await session.rerun(
+            clicked=self.preset,
+            values={
+                TIMEZONE_LABEL: ("int_value", TIMEZONE_NAMES.index(self.timezone)),
+                SALARY_LABEL: ("double_value", self.salary),
+            },
+        )
+        start_label = next(label for label in session.buttons if "🚀" in label)
+        await session.rerun(clicked=start_label)
+        if not session.fragment_id:
+            raise RuntimeError("running view did not register a live fragment")
+        if session.exceptions:
+            raise RuntimeError(session.exceptions[0])
+
+    # 按周期请求重跑直到 state["done"]；measuring 置位时记录延迟和错过的截止时间
+    async def refresh_loop(self, state, window):
+        due = time.monotonic() + self.phase
+        while not state["done"]:
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if state["done"]:
+                break
+            latency = await self.session.rerun_fragment()
+            finished = time.monotonic()
+            # 本次重跑要在下一次刷新之前完成；超出的每个周期都算一次错过
+            missed = int((finished - due) // self.interval)
+            if state["measuring"]:
+                window["latencies"].append(latency)
+                window["missed"] += missed
+                window["refreshes"] += 1
+            due += self.interval * (missed + 1)
+
+    def close(self):
+        self.session.close()
+
+
+async def run(port, pid, steps, duration, interval, jitter, connect_concurrency, seed):
+    rng = random.Random(seed)
+    trackers = []
+    loops = []
+    state = {"measuring": False, "done": False}
+    window = {}
+    gate = asyncio.Semaphore(connect_concurrency)
+
+    async def started(tracker):
+        async with gate:
+            await tracker.start()
+        loops.append(asyncio.ensure_future(tracker.refresh_loop(state, window)))
+
+    try:
+        for target in steps:
+            new = [
+                Tracker(port, index, interval * (1 + rng.uniform(-jitter, jitter)), rng)
+                for index in range(len(trackers), target)
+            ]
+            trackers.extend(new)
+            await asyncio.gather(*(started(tracker) for tracker in new))
+
+            # 新会话进入周期后再开始统计
+            await asyncio.sleep(interval)
+            window.update(latencies=[], missed=0, refreshes=0)
+            cpu_before = cpu_seconds(pid)
+            client_before = time.process_time()
+            started_at = time.monotonic()
+            state["measuring"] = True
+            await asyncio.sleep(duration)
+            state["measuring"] = False
+            elapsed = time.monotonic() - started_at
+
+            latencies = sorted(window["latencies"])
+            expected = sum(duration / tracker.interval for tracker in trackers)
+            result = {
+                "sessions": len(trackers),
+                "refreshes": window["refreshes"],
+                "expected_refreshes": round(expected),
+                "missed_deadlines": window["missed"],
+                "missed_ratio": window["missed"] / max(1, window["missed"] + window["refreshes"]),
+                "latency_ms_p50": percentile(latencies, 0.5) * 1000 if latencies else None,
+                "latency_ms_p95": percentile(latencies, 0.95) * 1000 if latencies else None,
+                "latency_ms_p99": percentile(latencies, 0.99) * 1000 if latencies else None,
+                "latency_ms_max": latencies[-1] * 1000 if latencies else None,
+                "latency_ms_mean": statistics.fmean(latencies) * 1000 if latencies else None,
+                "server_cpu_percent": (cpu_seconds(pid) - cpu_before) / elapsed * 100,
+                "client_cpu_percent": (time.process_time() - client_before) / elapsed * 100,
+                "server_rss_mb": rss_kb(pid) / 1024,
+            }
+            yield result
+    finally:
+        state["done"] = True
+        for loop in loops:
+            loop.cancel()
+        await asyncio.gather(*loops, return_exceptions=True)
+        for tracker in trackers:
+            tracker.close()
+
+
+def format_row(result):
+    def ms(key):
+        return "-" if result[key] is None else f"{result[key]:.0f}"
+
+    return (f"{result['sessions']:>6} {result['refreshes']:>7}/{result['expected_refreshes']:<7} "
+            f"{ms('latency_ms_p50'):>6} {ms('latency_ms_p95'):>6} {ms('latency_ms_p99'):>6} {ms('latency_ms_max'):>6} "
+            f"{result['missed_deadlines']:>6} {result['missed_ratio']:>6.1%} "
+            f"{result['server_cpu_percent']:>6.0f}% {result['client_cpu_percent']:>6.0f}% {result['server_rss_mb']:>7.1f}")
+
+
+async def main_async(args):
+    database = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    database.close()
+    port = free_port()
+    process = start_app(port, {"MONEYTRACKER_DB": database.name})
+    results = []
+    try:
+        if not args.json:
+            print(f"{'N':>6} {'refreshes':>15} {'p50':>6} {'p95':>6} {'p99':>6} {'max':>6} "
+                  f"{'missed':>6} {'ratio':>6} {'server':>7} {'client':>7} {'RSS MB':>7}")
+        steps = run(port, process.pid, sorted(args.steps), args.duration, args.interval,
+                    args.jitter, args.connect_concurrency, args.seed)
+        async for result in steps:
+            results.append(result)
+            if not args.json:
+                print(format_row(result), flush=True)
+            if result["missed_ratio"] > args.max_missed:
+                break
+        await steps.aclose()
+    finally:
+        process.terminate()
+        process.wait()
+        os.remove(database.name)
+
+    # 容量：错过比例不超过阈值的最大会话数
+    capacity = max((result["sessions"] for result in results if result["missed_ratio"] <= args.max_missed), default=0)
+    if args.json:
+        print(json.dumps({"steps": results, "capacity": capacity, "max_missed": args.max_missed}, indent=2))
+    else:
+        print(f"capacity: {capacity} sessions within {args.max_missed:.0%} missed refreshes "
+              f"(interval {args.interval:g}s, client shares the machine with the server)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp concurrent running sessions and report refresh capacity")
+    parser.add_argument("--steps", type=int, nargs="+", default=[10, 25, 50, 100, 200],
+                        help="session counts to measure, in increasing order")
+    parser.add_argument("--duration", type=float, default=30.0, help="measurement window per step in seconds")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="refresh interval in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2,
+                        help="per-session interval spread (0.2 = each session refreshes every 4-6 s)")
+    parser.add_argument("--max-missed", type=float, default=0.01,
+                        help="stop ramping once this fraction of refresh deadlines is missed")
+    parser.add_argument("--connect-concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# 里程碑提醒压测：N 个会话（不同的预设日程、时区和日薪）按刷新周期推进一段模拟时间，
+# 对比两种检查方式每次刷新的耗时：
+#   queue  每个会话一个 MilestoneQueue，只看堆顶是否到期
+#   naive  每次刷新都重新计算当天收入，并与当天所有金额阈值逐一比较
+# 并报告事件表的编译耗时、共享事件表的数量和每个会话队列占用的内存
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from clock import TIMEZONE_OPTIONS  # noqa: E402
+from milestones import MILESTONE_FRACTIONS, MilestoneQueue, get_milestones  # noqa: E402
+from presets import PRESET_PERIODS, WORK_TIME_PRESETS  # noqa: E402
+from weekly import WeeklySchedule, get_calendar  # noqa: E402
+
+PRESETS = [PRESET_PERIODS[name] for name, periods in WORK_TIME_PRESETS["en"].items() if periods]
+TIMEZONES = list(TIMEZONE_OPTIONS)
+# 模拟时间的起点：2025-03-03 00:00 UTC（星期一）
+SIMULATION_START = 1740960000.0
+
+
+def make_sessions(count, seed):
+    rng = random.Random(seed)
+    return [
+        (
+            WeeklySchedule.from_periods(PRESETS[index % len(PRESETS)], (0, 1, 2, 3, 4), float(rng.randrange(100, 1000, 10))),
+            TIMEZONES[index % len(TIMEZONES)],
+        )
+        for index in range(count)
+    ]
+
+
+# 朴素做法：每次刷新都算出当天收入，和当天每一个阈值比较，记住已经提醒过的阈值
+def naive_tick(weekly, timezone, moment, step, fired):
+    day, _, earned = get_calendar(weekly, timezone, moment).day_totals(moment)
+    thresholds = [multiple * step for multiple in range(1, int(weekly.daily_salary / step) + 1)]
+    thresholds += [fraction * weekly.daily_salary for fraction in MILESTONE_FRACTIONS]
+    count = 0
+    for threshold in thresholds:
+        if earned >= threshold and (day, threshold) not in fired:
+            fired.add((day, threshold))
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare milestone checks: per-session heap vs re-evaluating thresholds")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--hours", type=float, default=24.0, help="simulated time span")
+    parser.add_argument("--interval", type=float, default=5.0, help="refresh interval in seconds")
+    parser.add_argument("--step", type=float, default=10.0, help="alert every STEP dollars")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions, args.seed)
+    ticks = int(args.hours * 3600 / args.interval)
+
+    started = time.perf_counter()
+    tables = {id(get_milestones(weekly, timezone, SIMULATION_START, args.step)) for weekly, timezone in sessions}
+    compile_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    queues = [MilestoneQueue(weekly, timezone, args.step, SIMULATION_START) for weekly, timezone in sessions]
+    queue_bytes = (tracemalloc.get_traced_memory()[0] - before) / len(queues)
+    tracemalloc.stop()
+
+    results = {"sessions": args.sessions, "ticks_per_session": ticks, "shared_tables": len(tables),
+               "table_compile_ms": compile_seconds / len(tables) * 1000, "queue_bytes_per_session": queue_bytes}
+    for name in ("queue", "naive"):
+        fired = [set() for _ in sessions]
+        events = 0
+        started = time.perf_counter()
+        for tick in range(1, ticks + 1):
+            moment = SIMULATION_START + tick * args.interval
+            if name == "queue":
+                for queue in queues:
+                    events += len(queue.due(moment))
+            else:
+                for index, (weekly, timezone) in enumerate(sessions):
+                    events += naive_tick(weekly, timezone, moment, args.step, fired[index])
+        elapsed = time.perf_counter() - started
+        results[name] = {"events": events, "us_per_check": elapsed / (ticks * len(sessions)) * 1e6, "seconds": elapsed}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.sessions} sessions x {ticks} refreshes, {len(tables)} shared event tables "
+          f"({results['table_compile_ms']:.2f} ms each), {queue_bytes:.0f} B per session queue")
+    for name in ("queue", "naive"):
+        result = results[name]
+        print(f"{name:>6}: {result['us_per_check']:.2f} us per check, {result['events']} events, {result['seconds']:.1f}s total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# 单次重跑计时：运行状态下整页重跑（原先 st_autorefresh 的代价）对比实时区域的局部重跑
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from st_client import StreamlitSession, free_port, start_app  # noqa: E402
+
+
+def summarize(name, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<16} median {statistics.median(timings) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms   (n={len(timings)})")
+
+
+async def measure(port, repeat):
+    session = StreamlitSession(port)
+    await session.connect()
+    try:
+        await session.rerun()
+        start_label = next(label for label in session.buttons if "🚀" in label)
+        await session.rerun(clicked=start_label)
+        if not session.fragment_id:
+            raise RuntimeError("running view did not register a live fragment")
+
+        # 预热
+        await session.rerun()
+        await session.rerun_fragment()
+
+        full = [await session.rerun() for _ in range(repeat)]
+        fragment = [await session.rerun_fragment() for _ in range(repeat)]
+    finally:
+        session.close()
+    if session.exceptions:
+        raise RuntimeError(session.exceptions[0])
+    return full, fragment
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a full rerun vs a live-fragment rerun")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    port = free_port()
+    process = start_app(port)
+    try:
+        full, fragment = asyncio.run(measure(port, args.repeat))
+    finally:
+        process.terminate()
+        process.wait()
+
+    summarize("full rerun", full)
+    summarize("fragment rerun", fragment)
+    print(f"speedup          {statistics.median(full) / statistics.median(fragment):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
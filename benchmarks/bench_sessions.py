@@ -0,0 +1,92 @@
+# 会话内存压测：启动本地应用，同时保持大量已完成首屏（可选已开始追踪）的会话，
+# 报告服务进程内存增量和每个会话的平均占用
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_terminal import rss_kb  # noqa: E402
+from st_client import StreamlitSession, free_port, start_app  # noqa: E402
+
+
+# 打开一个会话并完成首屏；start 为真时再点击“开始追踪”进入运行视图
+async def open_session(port, start):
+    session = StreamlitSession(port)
+    await session.connect()
+    await session.rerun()
+    if start:
+        start_label = next(label for label in session.buttons if "🚀" in label)
+        await session.rerun(clicked=start_label)
+    if session.exceptions:
+        raise RuntimeError(session.exceptions[0])
+    return session
+
+
+async def run(port, pid, sessions, start, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def opened():
+        async with gate:
+            return await open_session(port, start)
+
+    # 预热：第一个会话会导入图表库、填充各级缓存，不计入每会话开销
+    warmup = await open_session(port, True)
+    await asyncio.sleep(1)
+    idle_rss = rss_kb(pid)
+
+    started = time.perf_counter()
+    opened_sessions = await asyncio.gather(*(opened() for _ in range(sessions)))
+    open_seconds = time.perf_counter() - started
+    await asyncio.sleep(1)
+    loaded_rss = rss_kb(pid)
+
+    for session in [warmup, *opened_sessions]:
+        session.close()
+    return idle_rss, loaded_rss, open_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure server memory per connected session")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--setup-only", action="store_true", help="keep sessions on the setup view instead of tracking")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions opened at the same time")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    database = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    database.close()
+    port = free_port()
+    process = start_app(port, {"MONEYTRACKER_DB": database.name})
+    try:
+        idle_rss, loaded_rss, open_seconds = asyncio.run(
+            run(port, process.pid, args.sessions, not args.setup_only, args.concurrency)
+        )
+    finally:
+        process.terminate()
+        process.wait()
+        os.remove(database.name)
+
+    summary = {
+        "sessions": args.sessions,
+        "tracking": not args.setup_only,
+        "open_seconds": open_seconds,
+        "server_rss_mb_idle": idle_rss / 1024,
+        "server_rss_mb_loaded": loaded_rss / 1024,
+        "per_session_kb": (loaded_rss - idle_rss) / args.sessions,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    state = "tracking" if summary["tracking"] else "setup"
+    print(f"{args.sessions} {state} sessions opened in {open_seconds:.1f}s")
+    print(f"  server RSS: {summary['server_rss_mb_idle']:.1f} MB -> {summary['server_rss_mb_loaded']:.1f} MB "
+          f"({summary['per_session_kb']:.1f} KB per session)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# 冷启动基准：分别测量各依赖的导入耗时，以及设置页面和运行页面的首次渲染耗时
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "numpy", "altair", "plotly.graph_objects", "pyarrow"]
+IMPORTS = ["streamlit", "pytz", "engine", "charts"] + HEAVY_MODULES
+
+# 在全新进程中测量单个模块的导入耗时
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+__import__(sys.argv[1])
+print(json.dumps({"seconds": time.perf_counter() - started}))
+"""
+
+# 在全新进程中用 AppTest 渲染设置页面，再点击开始追踪渲染运行页面
+RENDER_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file("moneytracker.py", default_timeout=120)
+at.run()
+setup_done = time.perf_counter()
+assert not at.exception, at.exception
+setup_modules = [name for name in sys.argv[1:] if name in sys.modules]
+start_button = next(b for b in at.button if b.label and "\U0001F680" in b.label)
+start_button.click().run()
+running_done = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({
+    "streamlit_import": imported - started,
+    "setup_render": setup_done - imported,
+    "running_render": running_done - setup_done,
+    "heavy_modules_after_setup": setup_modules,
+}))
+"""
+
+
+def run_probe(code, *args):
+    output = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=ROOT_DIR,
+        env=dict(os.environ, PYTHONPATH=ROOT_DIR),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and first-render time in fresh processes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {"imports": {}, "render": {}}
+    for module in IMPORTS:
+        results["imports"][module] = statistics.median(
+            run_probe(IMPORT_PROBE, module)["seconds"] for _ in range(args.repeat)
+        )
+
+    renders = [run_probe(RENDER_PROBE, *HEAVY_MODULES) for _ in range(args.repeat)]
+    for key in ("streamlit_import", "setup_render", "running_render"):
+        results["render"][key] = statistics.median(render[key] for render in renders)
+    results["heavy_modules_after_setup"] = renders[-1]["heavy_modules_after_setup"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("import time (fresh process, median):")
+    for module, seconds in results["imports"].items():
+        print(f"  {module:<22} {seconds * 1000:8.1f} ms")
+    print("first render (fresh process, median):")
+    print(f"  {'streamlit import':<22} {results['render']['streamlit_import'] * 1000:8.1f} ms")
+    print(f"  {'setup screen':<22} {results['render']['setup_render'] * 1000:8.1f} ms")
+    print(f"  {'running screen':<22} {results['render']['running_render'] * 1000:8.1f} ms")
+    print(f"heavy modules loaded by the setup screen: {', '.join(results['heavy_modules_after_setup']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# 统计面板基准：10 年以上的合成每日记录逐天写入历史存储，测量 record_day（含增量汇总和最佳/最差日维护）
+# 的单次耗时，以及统计面板每个粒度读取汇总行（HistoryStore.rollups）并组成统计表（summarize_rollups）的耗时
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, time as dt_time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import ROLLUP_TABLES, HistoryStore  # noqa: E402
+from stats import summarize_rollups  # noqa: E402
+
+PERIODS = (
+    {"start_time": dt_time(9, 0), "end_time": dt_time(12, 0)},
+    {"start_time": dt_time(14, 0), "end_time": dt_time(18, 0)},
+)
+WORK_SECONDS = 7 * 3600
+
+
+# 生成每日记录：工作日记一天，日薪随机浮动
+def synthetic_days(years, seed):
+    rng = random.Random(seed)
+    first = date(2010, 1, 1)
+    for offset in range(int(years * 365.25)):
+        day = first + timedelta(days=offset)
+        if day.weekday() < 5:
+            yield day, rng.uniform(200, 600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark history writes and period statistics over synthetic days")
+    parser.add_argument("--years", type=float, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20, help="rollup reads and summaries per granularity")
+    args = parser.parse_args()
+
+    days = list(synthetic_days(args.years, args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"))
+        started = time.perf_counter()
+        for day, salary in days:
+            store.record_day(day, "UTC", salary, PERIODS, WORK_SECONDS, salary)
+        write_time = time.perf_counter() - started
+        print(f"record_day: {len(days):,} days over {args.years:g} years, "
+              f"{write_time * 1000 / len(days):.3f} ms per day ({write_time:.2f} s total)")
+
+        for granularity in ROLLUP_TABLES:
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                rows = store.rollups(granularity)
+            read_time = (time.perf_counter() - started) / args.repeat
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                summary = summarize_rollups(rows)
+            summary_time = (time.perf_counter() - started) / args.repeat
+            print(f"{granularity:<8} rollups: {read_time * 1000:7.2f} ms, summarize_rollups: "
+                  f"{summary_time * 1000:7.2f} ms ({len(summary)} periods)")
+
+            # 校验：汇总后的总收入与写入的记录一致
+            total = sum(salary for _, salary in days)
+            assert abs(summary["earned"].sum() - total) < 1e-6 * max(1.0, total)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
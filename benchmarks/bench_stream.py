@@ -0,0 +1,146 @@
+# 推送流压测：在子进程中启动 api.py，建立大量 SSE 订阅（分布在若干个不同日程上），
+# 报告服务端每个节拍的扇出耗时、服务进程内存，以及客户端观察到的送达延迟
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_PATH = os.path.join(ROOT_DIR, "api.py")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_api import schedule_definitions  # noqa: E402
+from bench_terminal import rss_kb  # noqa: E402
+from st_client import free_port  # noqa: E402
+
+
+def stream_request(port, definition):
+    body = json.dumps({"schedule": definition}).encode()
+    head = (
+        f"POST /stream HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+# 一个订阅者：连接后持续读取事件；measuring 置位后记录每条事件的送达延迟（接收时刻 - 事件 id）
+async def subscriber(port, payload, connected, state, lags):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(payload)
+        await reader.readuntil(b"\r\n\r\n")
+        await reader.readuntil(b"\n\n")
+        connected.release()
+        while not state["done"]:
+            event = await reader.readuntil(b"\n\n")
+            if state["measuring"]:
+                moment = float(event[4:event.index(b"\n")])
+                lags.append(time.time() - moment)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def health(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=10) as response:
+        return json.loads(response.read())
+
+
+async def run(port, subscribers, payloads, connect_concurrency, ticks, interval):
+    connected = asyncio.Semaphore(0)
+    state = {"measuring": False, "done": False}
+    lags = []
+    tasks = []
+    gate = asyncio.Semaphore(connect_concurrency)
+
+    async def start(index):
+        async with gate:
+            task = asyncio.ensure_future(subscriber(port, payloads[index % len(payloads)], connected, state, lags))
+            tasks.append(task)
+            await connected.acquire()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(start(index) for index in range(subscribers)))
+    connect_seconds = time.perf_counter() - started
+
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(interval)
+    state["measuring"] = True
+    tick_ms = []
+    for _ in range(ticks):
+        await asyncio.sleep(interval)
+        tick_ms.append((await loop.run_in_executor(None, health, port))["last_tick_ms"])
+    state["measuring"] = False
+    final = await loop.run_in_executor(None, health, port)
+    state["done"] = True
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return connect_seconds, tick_ms, lags, final
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure SSE fan-out cost of the shared broadcaster")
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--schedules", type=int, default=50, help="distinct schedules (topics)")
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=1.0, help="server tick interval in seconds")
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, API_PATH, "--port", str(port), "--stream-interval", str(args.interval)],
+        cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        server.stdout.readline()
+        idle_rss = rss_kb(server.pid)
+        payloads = [stream_request(port, definition) for definition in schedule_definitions(args.schedules, 0)]
+        connect_seconds, tick_ms, lags, final = asyncio.run(
+            run(port, args.subscribers, payloads, args.connect_concurrency, args.ticks, args.interval)
+        )
+        loaded_rss = rss_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    lags.sort()
+    summary = {
+        "subscribers": final["subscribers"],
+        "topics": final["topics"],
+        "connect_seconds": connect_seconds,
+        "tick_ms_median": statistics.median(tick_ms),
+        "tick_ms_max": max(tick_ms),
+        "per_subscriber_us": statistics.median(tick_ms) * 1000 / max(1, final["subscribers"]),
+        "events_received": len(lags),
+        "lag_ms_p50": lags[len(lags) // 2] * 1000 if lags else None,
+        "lag_ms_p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000 if lags else None,
+        "skipped_writes": final["skipped_writes"],
+        "server_rss_mb_idle": idle_rss / 1024,
+        "server_rss_mb_loaded": loaded_rss / 1024,
+    }
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"{summary['subscribers']} subscribers on {summary['topics']} topics "
+          f"(connected in {summary['connect_seconds']:.1f}s)")
+    print(f"  fan-out per tick: median {summary['tick_ms_median']:.1f} ms, max {summary['tick_ms_max']:.1f} ms "
+          f"({summary['per_subscriber_us']:.2f} us per subscriber)")
+    if lags:
+        print(f"  delivery lag (client-observed): p50 {summary['lag_ms_p50']:.1f} ms, "
+              f"p99 {summary['lag_ms_p99']:.1f} ms over {summary['events_received']} events")
+    print(f"  server RSS: {summary['server_rss_mb_idle']:.1f} MB idle -> "
+          f"{summary['server_rss_mb_loaded']:.1f} MB loaded, skipped writes {summary['skipped_writes']}")
+
+
+if __name__ == "__main__":
+    main()
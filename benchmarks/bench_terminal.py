@@ -0,0 +1,153 @@
+# 终端模式基准：测量 --once --json 的耗时和峰值内存、常驻刷新进程的内存和单帧耗时，
+# 并与运行中的 Streamlit 服务（一个会话）的内存对比
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from presets import find_preset  # noqa: E402
+from terminal import render_line  # noqa: E402
+from weekly import ALL_WEEKDAYS, WeeklySchedule, status_at  # noqa: E402
+
+TERMINAL_PATH = os.path.join(ROOT_DIR, "terminal.py")
+
+# 在子进程中运行一次 --once --json，报告耗时和峰值 RSS
+ONCE_PROBE = """
+import json, resource, runpy, sys, time
+started = time.perf_counter()
+sys.argv = [sys.argv[1], "--once", "--json"]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": sorted(name for name in ("streamlit", "pandas", "numpy", "altair", "plotly") if name in sys.modules),
+}))
+"""
+
+
+# 从 /proc 读取进程当前的常驻内存（KB）
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def measure_once(repeat):
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", ONCE_PROBE, TERMINAL_PATH],
+            cwd=ROOT_DIR, check=True, capture_output=True, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "max_rss_mb": max(run["max_rss_kb"] for run in runs) / 1024,
+        "heavy_modules": runs[-1]["modules"],
+    }
+
+
+# 常驻刷新进程运行一段时间后的内存
+def measure_live(seconds, interval):
+    process = subprocess.Popen(
+        [sys.executable, TERMINAL_PATH, "--interval", str(interval)],
+        cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        time.sleep(seconds)
+        rss = rss_kb(process.pid)
+    finally:
+        process.terminate()
+        output, _ = process.communicate()
+    return {"rss_mb": rss / 1024, "frames": len(output.splitlines()), "seconds": seconds}
+
+
+# 单帧（计算状态 + 渲染一行）的耗时
+def measure_frame(frames):
+    weekly = WeeklySchedule.from_periods(find_preset("Standard (9-18)"), ALL_WEEKDAYS, 200.0)
+    now = time.time()
+    render_line(status_at(weekly, "America/New_York", now))
+    started = time.perf_counter()
+    for index in range(frames):
+        render_line(status_at(weekly, "America/New_York", now + index * 0.2))
+    return (time.perf_counter() - started) / frames
+
+
+async def open_running_session(port):
+    from st_client import StreamlitSession
+
+    session = StreamlitSession(port)
+    await session.connect()
+    try:
+        await session.rerun()
+        await session.rerun(clicked=next(label for label in session.buttons if "🚀" in label))
+    finally:
+        session.close()
+
+
+# 启动 Streamlit 服务并让一个会话进入运行视图，测量服务进程的内存
+def measure_streamlit():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from st_client import free_port, start_app
+
+    port = free_port()
+    process = start_app(port, env={"MONEYTRACKER_DB": os.path.join(ROOT_DIR, ".bench_terminal.db")})
+    try:
+        asyncio.run(open_running_session(port))
+        return {"rss_mb": rss_kb(process.pid) / 1024}
+    finally:
+        process.terminate()
+        process.wait()
+        for suffix in ("", "-journal"):
+            path = os.path.join(ROOT_DIR, ".bench_terminal.db" + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure terminal mode latency and memory")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live-seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.2)
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--skip-streamlit", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = {
+        "once": measure_once(args.repeat),
+        "live": measure_live(args.live_seconds, args.interval),
+        "frame_seconds": measure_frame(args.frames),
+    }
+    if not args.skip_streamlit:
+        results["streamlit"] = measure_streamlit()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    once = results["once"]
+    live = results["live"]
+    print(f"--once --json: {once['seconds'] * 1000:.1f} ms, peak RSS {once['max_rss_mb']:.1f} MB, "
+          f"heavy modules loaded: {once['heavy_modules'] or 'none'}")
+    print(f"live mode: RSS {live['rss_mb']:.1f} MB after {live['seconds']:.0f}s, "
+          f"{live['frames']} frames at {args.interval}s interval")
+    print(f"per frame: {results['frame_seconds'] * 1e6:.1f} us")
+    if "streamlit" in results:
+        print(f"streamlit server (1 session, running view): RSS {results['streamlit']['rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
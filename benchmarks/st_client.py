@@ -0,0 +1,124 @@
+# 最小化的 Streamlit WebSocket 客户端：启动本地应用并像浏览器一样请求重跑，用于计时和压测
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from tornado.websocket import websocket_connect
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "moneytracker.py")
+
+
+# 找一个空闲端口
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# 以无界面模式启动应用，等待健康检查通过后返回进程对象
+def start_app(port, env=None, timeout=60):
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT_DIR,
+        env=dict(os.environ, **(env or {})),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("Streamlit app did not become healthy in time")
+
+
+# 一个模拟浏览器的会话
+class StreamlitSession:
+    def __init__(self, port, query_string=""):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.query_string = query_string
+        self.connection = None
+        self.buttons = {}
+        self.widgets = {}
+        self.fragment_id = ""
+        self.fragment_interval = 0.0
+        self.exceptions = []
+
+    async def connect(self):
+        self.connection = await websocket_connect(self.url)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    # 请求一次重跑并等待结束，返回耗时（秒）；values 为 {控件标签: (值类型, 值)}，例如 {"日薪 ($)": ("double_value", 500.0)}
+    async def rerun(self, clicked=None, fragment_id="", is_auto_rerun=False, values=None):
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = self.query_string
+        client_state.is_auto_rerun = is_auto_rerun
+        if fragment_id:
+            client_state.fragment_id = fragment_id
+        widget_states = WidgetStates()
+        if clicked is not None:
+            widget = widget_states.widgets.add()
+            widget.id = self.buttons[clicked]
+            widget.trigger_value = True
+        for label, (value_type, value) in (values or {}).items():
+            widget = widget_states.widgets.add()
+            widget.id = self.widgets[label]
+            setattr(widget, value_type, value)
+        client_state.widget_states.CopyFrom(widget_states)
+
+        started = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError("Streamlit server closed the connection")
+            forward = ForwardMsg.FromString(payload)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._record_delta(forward.delta)
+            elif kind == "auto_rerun":
+                self.fragment_id = forward.auto_rerun.fragment_id
+                self.fragment_interval = forward.auto_rerun.interval
+            elif kind == "script_finished":
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - started
+
+    # 请求一次实时区域的定时重跑，返回耗时（秒）
+    async def rerun_fragment(self):
+        return await self.rerun(fragment_id=self.fragment_id, is_auto_rerun=True)
+
+    def _record_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "button":
+            self.buttons[element.button.label] = element.button.id
+        elif kind in ("selectbox", "number_input", "time_input", "multiselect"):
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = widget.id
+        elif kind == "exception":
+            self.exceptions.append(element.exception.message)
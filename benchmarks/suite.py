@@ -0,0 +1,214 @@
+# 基准测试套件：热点函数、AppTest 整页重跑（设置/运行两种状态）和进程冷启动，
+# 结果写入 JSON，可与之前保存的结果对比并在超过回归阈值时返回非零退出码
+#
+#   python benchmarks/suite.py --output before.json
+#   python benchmarks/suite.py --output after.json --compare before.json --threshold 0.2
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+GROUPS = ("engine", "rerun", "startup")
+DEFAULT_THRESHOLD = 0.2
+
+# 单个用例至少运行这么久来确定每轮的调用次数
+MIN_ROUND_SECONDS = 0.1
+
+
+# 多轮计时：先估算每轮调用次数，返回每次调用耗时的中位数和最小值（秒）
+def measure(func, rounds, min_round_seconds=MIN_ROUND_SECONDS, number=None):
+    func()
+    if number is None:
+        number = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - started >= min_round_seconds or number >= 1 << 20:
+                break
+            number *= 2
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {"median": statistics.median(timings), "min": min(timings), "rounds": rounds, "number": number}
+
+
+# 热点函数：在裸模式下导入应用脚本，直接调用其中的函数
+def engine_cases(rounds):
+    import streamlit as st
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    # 裸模式下每次访问 session_state 都会打印“missing ScriptRunContext”警告，会干扰计时；
+    # Streamlit 读取配置时会重设日志级别，因此配置项和当前级别都要改
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    import moneytracker
+    from charts import _build_gauge, _build_timeline_spec, get_timeline_charts
+    from engine import compile_schedule
+
+    periods = st.session_state.work_periods
+    labels = moneytracker.TEXTS[st.session_state.language]
+    moneytracker.start_tracking()
+    schedule = st.session_state.tracking.schedule
+    charts = get_timeline_charts(schedule, st.session_state.language, st.session_state.timezone, labels)
+
+    cases = {
+        "calculate_earned_money": moneytracker.calculate_earned_money,
+        "calculate_work_seconds": lambda: moneytracker.calculate_work_seconds(periods),
+        "compile_schedule": lambda: compile_schedule(periods),
+        "generate_timeline_html": lambda: moneytracker.generate_timeline_html(schedule),
+        "timeline_chart_build": lambda: _build_timeline_spec(schedule, labels),
+        "gauge_build": lambda: _build_gauge(labels),
+        "timeline_spec_at": lambda: charts.timeline_spec_at(12.5),
+    }
+    return {name: measure(func, rounds) for name, func in cases.items()}
+
+
+# 整页重跑：AppTest 无界面运行脚本，分别在设置状态和运行状态下重复 run()
+def rerun_cases(rounds):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "moneytracker.py"), default_timeout=120)
+    at.run()
+    results = {"rerun_setup": measure(at.run, rounds, number=1)}
+    next(button for button in at.button if button.label and "🚀" in button.label).click().run()
+    if at.session_state.tracking is None:
+        raise RuntimeError("start tracking did not switch to the running view")
+    results["rerun_running"] = measure(at.run, rounds, number=1)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return results
+
+
+# 冷启动：全新进程中导入并渲染首屏（复用 bench_startup 的探针）
+def startup_cases(rounds):
+    from bench_startup import HEAVY_MODULES, RENDER_PROBE, run_probe
+
+    renders = [run_probe(RENDER_PROBE, *HEAVY_MODULES) for _ in range(rounds)]
+    results = {}
+    for key in ("streamlit_import", "setup_render", "running_render"):
+        timings = [render[key] for render in renders]
+        results[f"cold_{key}"] = {"median": statistics.median(timings), "min": min(timings), "rounds": rounds, "number": 1}
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(ROOT_DIR, "terminal.py"), "--once", "--json"],
+                       cwd=ROOT_DIR, check=True, capture_output=True)
+        timings.append(time.perf_counter() - started)
+    results["cold_terminal_once"] = {"median": statistics.median(timings), "min": min(timings), "rounds": rounds, "number": 1}
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# 与基线对比：返回 (表格行, 回归的用例名)
+def compare(results, baseline, threshold):
+    rows = []
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, current["median"], None, None, "new"))
+            continue
+        ratio = current["median"] / previous["median"] if previous["median"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, current["median"], previous["median"], ratio, verdict))
+    return rows, regressions
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against a baseline")
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--rounds", type=int, default=7, help="timing rounds for in-process cases")
+    parser.add_argument("--slow-rounds", type=int, default=3, help="rounds for reruns and cold start")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file written by a previous run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median before a case counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # 应用脚本会写历史数据库，基准运行使用临时文件
+    database = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    database.close()
+    os.environ["MONEYTRACKER_DB"] = database.name
+    try:
+        results = {}
+        if "engine" in args.groups:
+            results.update(engine_cases(args.rounds))
+        if "rerun" in args.groups:
+            results.update(rerun_cases(args.slow_rounds))
+        if "startup" in args.groups:
+            results.update(startup_cases(args.slow_rounds))
+    finally:
+        os.remove(database.name)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows, regressions = compare(results, baseline["results"], args.threshold)
+        print(f"compared with {baseline['meta'].get('revision') or args.compare} (threshold {args.threshold:.0%})")
+        for name, current, previous, ratio, verdict in rows:
+            ratio_text = f"{ratio:6.2f}x" if ratio is not None else "      -"
+            print(f"  {name:<26} {format_seconds(current):>12} {format_seconds(previous):>12} {ratio_text}  {verdict}")
+    else:
+        for name, result in results.items():
+            print(f"  {name:<26} {format_seconds(result['median']):>12}  (min {format_seconds(result['min'])})")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
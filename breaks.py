@@ -0,0 +1,94 @@
+# 带薪休息记录：按类别维护合并后的有序区间索引，休息期间赚到的钱 = 日历在每个区间内的收入（已含倍率档位）；
+# 显示的是当前工作日的收入，只计算工作日起算点（与收入计数器相同）之后的部分
+from bisect import bisect_left, bisect_right
+
+BREAK_CATEGORIES = ("gym", "water", "meal", "study")
+
+
+# 单个类别的区间索引：starts/ends 有序且互不重叠，earned 为每个区间内赚到的钱
+class BreakIntervals:
+    __slots__ = ("starts", "ends", "earned")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.earned = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    # 插入 [start, end)，与已有的重叠或相邻区间合并，并缓存合并后区间内的收入
+    def add(self, start, end, schedule):
+        if end <= start:
+            return
+        first = bisect_left(self.ends, start)
+        last = bisect_right(self.starts, end)
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        earned = schedule.earned_between(start, end)
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+        self.earned[first:last] = [earned]
+
+    # [since, until] 内各区间的收入：完全落在范围内的区间直接取缓存，只有首尾跨过边界的区间重新计算
+    def earned_within(self, since, until, schedule):
+        first = bisect_right(self.ends, since)
+        last = bisect_left(self.starts, until)
+        total = sum(self.earned[first:last])
+        for index in {first, last - 1} if first < last else ():
+            start, end = self.starts[index], self.ends[index]
+            if start < since or end > until:
+                total += schedule.earned_between(max(start, since), min(end, until)) - self.earned[index]
+        return total
+
+
+# 带薪休息记录（时间均为 Unix 秒）；schedule 为提供 earned_between(开始, 结束) 的日历
+class BreakLog:
+    __slots__ = ("intervals", "open_since")
+
+    def __init__(self):
+        self.intervals = {category: BreakIntervals() for category in BREAK_CATEGORIES}
+        self.open_since = {}
+
+    def is_open(self, category):
+        return category in self.open_since
+
+    # 开始一次休息；同一类别已在休息中时忽略
+    def start(self, category, second):
+        self.open_since.setdefault(category, second)
+
+    # 结束一次休息并写入区间索引
+    def stop(self, category, second, schedule):
+        started = self.open_since.pop(category, None)
+        if started is not None:
+            self.intervals[category].add(started, second, schedule)
+
+    # 直接记录一段已结束的休息
+    def add(self, category, start, end, schedule):
+        self.intervals[category].add(start, end, schedule)
+
+    # 某类别在 [since, now] 内休息期间赚到的钱：已结束部分取缓存，进行中的部分做一次二分查找
+    def earned(self, category, since, now, schedule):
+        intervals = self.intervals[category]
+        total = intervals.earned_within(since, now, schedule)
+        started = self.open_since.get(category)
+        if started is not None and now > max(started, since):
+            # 进行中的休息可能与已记录的区间重叠，只计算未被覆盖的部分
+            total += self._uncovered_earned(intervals, max(started, since), now, schedule)
+        return total
+
+    # 各类别在 [since, now] 内休息期间赚到的钱；since 通常为当前工作日的起算点
+    def earned_by_category(self, since, now, schedule):
+        return {category: self.earned(category, since, now, schedule) for category in BREAK_CATEGORIES}
+
+    def _uncovered_earned(self, intervals, start, end, schedule):
+        earned = schedule.earned_between(start, end)
+        first = bisect_left(intervals.ends, start)
+        last = bisect_right(intervals.starts, end)
+        for index in range(first, last):
+            overlap_start = max(start, intervals.starts[index])
+            overlap_end = min(end, intervals.ends[index])
+            if overlap_end > overlap_start:
+                earned -= schedule.earned_between(overlap_start, overlap_end)
+        return earned
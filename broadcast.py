@@ -0,0 +1,116 @@
+# 收入推送广播器：订阅同一日程（同一时区）的所有连接归为一个主题，
+# 每个节拍每个主题只计算一次状态、编码一次 SSE 消息，再把同一份字节写给所有订阅者
+import asyncio
+import json
+import logging
+import time
+
+from weekly import status_at
+
+DEFAULT_TICK_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+# 订阅者的发送缓冲超过该字节数时跳过本次推送（慢客户端只会少收几帧，不会拖慢其他订阅者）
+MAX_PENDING_BYTES = 64 * 1024
+
+
+# 一个主题：同一个 WeeklySchedule + 时区的全部订阅连接
+class Topic:
+    __slots__ = ("weekly", "timezone", "writers")
+
+    def __init__(self, weekly, timezone):
+        self.weekly = weekly
+        self.timezone = timezone
+        self.writers = set()
+
+
+# SSE 消息：id 为计算时刻（Unix 秒），data 为状态 JSON
+def encode_event(moment, status):
+    return f"id: {moment:.3f}\ndata: {json.dumps(status, separators=(',', ':'))}\n\n".encode()
+
+
+class Broadcaster:
+    def __init__(self, interval=DEFAULT_TICK_INTERVAL):
+        self.interval = interval
+        self.topics = {}
+        self.subscribers = 0
+        self.ticks = 0
+        self.last_tick_seconds = 0.0
+        self.skipped = 0
+        self.errors = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # 订阅：立即推送一次当前状态，之后随节拍推送
+    def subscribe(self, weekly, timezone, writer):
+        key = (weekly.key(), timezone)
+        topic = self.topics.get(key)
+        if topic is None:
+            topic = self.topics[key] = Topic(weekly, timezone)
+        topic.writers.add(writer)
+        self.subscribers += 1
+        moment = time.time()
+        writer.write(encode_event(moment, status_at(weekly, timezone, moment)))
+        return key
+
+    def unsubscribe(self, key, writer):
+        topic = self.topics.get(key)
+        if topic is None or writer not in topic.writers:
+            return
+        topic.writers.discard(writer)
+        self.subscribers -= 1
+        if not topic.writers:
+            del self.topics[key]
+
+    # 一个节拍：每个主题计算一次，再把同一份消息写给所有订阅者。
+    # 某个主题出错只记录日志并跳过该主题，其他主题照常推送，节拍循环也不会因此退出
+    def tick(self, moment):
+        started = time.perf_counter()
+        for topic in list(self.topics.values()):
+            try:
+                self._publish(topic, moment)
+            except Exception:
+                self.errors += 1
+                logger.exception("broadcast tick failed for %s", topic.timezone)
+        self.ticks += 1
+        self.last_tick_seconds = time.perf_counter() - started
+
+    def _publish(self, topic, moment):
+        event = encode_event(moment, status_at(topic.weekly, topic.timezone, moment))
+        for writer in topic.writers:
+            transport = writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+                self.skipped += 1
+                continue
+            transport.write(event)
+
+    async def _run(self):
+        while True:
+            # 对齐到节拍间隔的整数倍，所有订阅者在同一时刻收到更新
+            await asyncio.sleep(self.interval - time.time() % self.interval)
+            self.tick(time.time())
+
+    def stats(self):
+        return {
+            "subscribers": self.subscribers,
+            "topics": len(self.topics),
+            "ticks": self.ticks,
+            "last_tick_ms": self.last_tick_seconds * 1000,
+            "skipped_writes": self.skipped,
+            "tick_errors": self.errors,
+        }
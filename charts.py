@@ -0,0 +1,115 @@
+# 运行视图的图表缓存：静态图层和规格按日程配置编译一次，每次刷新只替换当前时间红线和仪表盘数值
+import threading
+
+import altair as alt
+import plotly.graph_objects as go
+
+from lru import LRUCache
+
+CHART_CACHE_SIZE = 64
+
+_chart_cache = LRUCache(CHART_CACHE_SIZE)
+
+
+# 某一日程配置下已编译好的图表
+class TimelineCharts:
+    __slots__ = ("timeline_spec", "bar_layer", "rule_layer", "gauge", "_gauge_lock")
+
+    def __init__(self, timeline_spec, gauge):
+        self.timeline_spec = timeline_spec
+        self.bar_layer, self.rule_layer = timeline_spec["layer"]
+        self.gauge = gauge
+        self._gauge_lock = threading.Lock()
+
+    # 生成带当前时间红线的时间轴规格（只复制顶层和红线图层）
+    def timeline_spec_at(self, hour):
+        spec = dict(self.timeline_spec)
+        spec["layer"] = [self.bar_layer, dict(self.rule_layer, data={"values": [{"hour": hour}]})]
+        return spec
+
+    # 在锁内把共享仪表盘的数值改为 value，并交给 render 序列化
+    def render_gauge(self, value, render):
+        with self._gauge_lock:
+            self.gauge.data[0].value = value
+            return render(self.gauge)
+
+
+# 构建全天时间轴（每15分钟一个点）的 Vega-Lite 规格
+def _build_timeline_spec(schedule, labels):
+    minutes_in_day = list(range(0, 24 * 60, 15))
+    is_work_minute = [schedule.is_working_minute(minute) for minute in minutes_in_day]
+
+    rows = [
+        {
+            "minute": minute,
+            "hour": minute / 60,
+            "is_work": is_work,
+            "status": labels["work_time"] if is_work else labels["non_work_time"],
+        }
+        for minute, is_work in zip(minutes_in_day, is_work_minute)
+    ]
+
+    chart = alt.Chart(alt.Data(values=rows)).mark_bar().encode(
+        x=alt.X('hour:Q', title=labels['hours'], axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('count():Q', title=None, axis=None),
+        color=alt.Color('status:N',
+                      scale=alt.Scale(domain=[labels['work_time'], labels['non_work_time']],
+                                     range=['#4361ee', '#e9ecef']),
+                      legend=alt.Legend(title=labels["status"])),
+        tooltip=['hour:Q', 'status:N']
+    ).properties(
+        width=600,
+        height=100
+    )
+
+    current_time_indicator = alt.Chart(alt.Data(values=[{"hour": 0}])).mark_rule(
+        color='red',
+        strokeWidth=2
+    ).encode(
+        x='hour:Q'
+    )
+
+    return (chart + current_time_indicator).to_dict()
+
+
+# 构建收入进度仪表盘
+def _build_gauge(labels):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=0,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': labels["progress"], 'font': {'size': 24}},
+        delta={'reference': 0, 'increasing': {'color': "#4361ee"}},
+        gauge={
+            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "#FFD700"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 25], 'color': '#f8f9fa'},
+                {'range': [25, 50], 'color': '#e9ecef'},
+                {'range': [50, 75], 'color': '#dee2e6'},
+                {'range': [75, 100], 'color': '#ced4da'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 100
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=50, b=20),
+    )
+    return fig
+
+
+# 按（规范化后的工作时间段, 语言, 时区）取出缓存的图表；labels 由语言决定，因此不参与缓存键
+def get_timeline_charts(schedule, language, timezone, labels):
+    return _chart_cache.get_or_create(
+        (schedule.intervals, language, timezone),
+        lambda: TimelineCharts(_build_timeline_spec(schedule, labels), _build_gauge(labels)),
+    )
@@ -0,0 +1,74 @@
+# 时钟服务：缓存时区对象，每次运行只取一次当前时间快照供所有组件共享；
+# 跨日边界（午夜、班次开始/结束）统一换算为 UTC 纪元秒后再做加减，夏令时切换日也不会偏移
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+import pytz
+
+from lru import LRUCache
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# 可选时区及其显示名称
+TIMEZONE_OPTIONS = {
+    'Asia/Shanghai': '🇨🇳 中国标准时间 (UTC+8)',
+    'America/New_York': '🇺🇸 美国东部时间 (UTC-5/-4)',
+    'America/Los_Angeles': '🇺🇸 美国西部时间 (UTC-8/-7)',
+    'Europe/London': '🇬🇧 英国时间 (UTC+0/+1)',
+    'Europe/Paris': '🇫🇷 欧洲中部时间 (UTC+1/+2)',
+    'Asia/Tokyo': '🇯🇵 日本标准时间 (UTC+9)',
+    'Australia/Sydney': '🇦🇺 澳大利亚东部时间 (UTC+10/+11)'
+}
+
+TIMEZONE_CACHE_SIZE = 64
+
+_timezone_cache = LRUCache(TIMEZONE_CACHE_SIZE)
+
+
+# 按名称取出时区对象，进程内只构造一次
+def get_timezone(name):
+    return _timezone_cache.get_or_create(name, lambda: pytz.timezone(name))
+
+
+# 某一天的某个本地钟点（可超过 24 小时）对应的 Unix 时间，按当天实际的 UTC 偏移换算；
+# 夏令时跳过的钟点按切换前的偏移计算，重复的钟点取第二次出现（标准时间）
+def local_epoch(tz, day, seconds=0):
+    extra_days, seconds = divmod(seconds, SECONDS_PER_DAY)
+    wall = datetime.combine(day + timedelta(days=extra_days), dt_time(0)) + timedelta(seconds=seconds)
+    return tz.localize(wall, is_dst=False).timestamp()
+
+
+# 某个时区内本地日期 day 的实际长度（秒）：夏令时切换日为 23 或 25 小时
+def day_length(tz, day):
+    return local_epoch(tz, day + timedelta(days=1)) - local_epoch(tz, day)
+
+
+# 一次时间快照：epoch 为 Unix 秒，local 为所选时区的本地时间
+class ClockSnapshot:
+    __slots__ = ("timezone", "epoch", "local")
+
+    def __init__(self, timezone, epoch):
+        self.timezone = timezone
+        self.epoch = epoch
+        self.local = datetime.fromtimestamp(epoch, get_timezone(timezone))
+
+    # 本地日期当天午夜的 Unix 时间
+    def midnight_epoch(self):
+        return local_epoch(get_timezone(self.timezone), self.local.date())
+
+    # 本地日期当天的午夜（带正确 UTC 偏移的 datetime）
+    def midnight(self):
+        return datetime.fromtimestamp(self.midnight_epoch(), get_timezone(self.timezone))
+
+    # 从本地午夜起实际经过的秒数（夏令时切换日与钟面时间相差一小时）
+    def elapsed_today(self):
+        return self.epoch - self.midnight_epoch()
+
+    # 钟面上的分钟数（0-1439），用于时间轴上的当前时间红线
+    def minute_of_day(self):
+        return self.local.hour * 60 + self.local.minute
+
+
+# 取一次当前时间快照；epoch 可显式传入以便复现某个时刻
+def take_snapshot(timezone, epoch=None):
+    return ClockSnapshot(timezone, time.time() if epoch is None else epoch)
@@ -0,0 +1,127 @@
+# 收入计算引擎：不依赖 Streamlit / Altair / Plotly，可在脚本、测试和其他服务中直接导入
+from bisect import bisect_right
+from itertools import accumulate
+
+from lru import LRUCache
+
+SECONDS_PER_DAY = 24 * 60 * 60
+MINUTES_PER_DAY = 24 * 60
+
+# 进程内共享的编译日程缓存容量
+SCHEDULE_CACHE_SIZE = 256
+
+
+# 时间对象转换为当天的秒数
+def time_to_seconds(time_obj):
+    if time_obj is None:
+        return None
+    return time_obj.hour * 3600 + time_obj.minute * 60 + time_obj.second
+
+
+# datetime 转换为当天已过去的秒数（含小数部分）
+def seconds_of_day(dt):
+    return dt.hour * 3600 + dt.minute * 60 + dt.second + dt.microsecond / 1_000_000
+
+
+# 规范化工作时间段：过滤无效项、按开始时间排序并合并重叠区间；
+# 跨越午夜的时间段（结束早于开始）在单日视图中拆成当天的两段
+def normalize_periods(periods):
+    intervals = []
+    for period in periods:
+        start = time_to_seconds(period["start_time"])
+        end = time_to_seconds(period["end_time"])
+        if start is None or end is None or end == start:
+            continue
+        if end < start:
+            intervals.append((start, SECONDS_PER_DAY))
+            if end > 0:
+                intervals.append((0, end))
+        else:
+            intervals.append((start, end))
+    intervals.sort()
+
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+# 编译后的工作日程：有序的区间边界 + 每个区间开始前已累计的工作秒数，
+# 以及 1440 分钟的工作位图和分钟级累计数组，用于常数时间的状态查询。编译后不可变，可在会话间共享
+class CompiledSchedule:
+    __slots__ = ("intervals", "starts", "ends", "cumulative", "total_seconds",
+                 "minute_bitmap", "cumulative_minutes", "minute_aligned")
+
+    def __init__(self, intervals):
+        self.intervals = tuple(intervals)
+        self.starts = [start for start, _ in intervals]
+        self.ends = [end for _, end in intervals]
+        self.cumulative = []
+        total = 0
+        for start, end in intervals:
+            self.cumulative.append(total)
+            total += end - start
+        self.total_seconds = total
+
+        # 某分钟的起点落在工作区间内即视为工作分钟
+        bitmap = bytearray(MINUTES_PER_DAY)
+        for start, end in intervals:
+            first = -(-start // 60)
+            last = min(-(-end // 60), MINUTES_PER_DAY)
+            bitmap[first:last] = b"\x01" * max(0, last - first)
+        self.minute_bitmap = bytes(bitmap)
+        self.cumulative_minutes = [0, *accumulate(bitmap)]
+        self.minute_aligned = all(start % 60 == 0 and end % 60 == 0 for start, end in intervals)
+
+    # 给定当天秒数，找到最后一个开始时间不晚于它的区间下标（没有则为 -1）
+    def _locate(self, second):
+        return bisect_right(self.starts, second) - 1
+
+    # 某分钟（0-1439）是否为工作时间
+    def is_working_minute(self, minute):
+        return self.minute_bitmap[minute] == 1
+
+    # 当天 0 点到第 minute 分钟开始时已累计的工作分钟数
+    def work_minutes_before(self, minute):
+        return self.cumulative_minutes[minute]
+
+    # 截至某一时刻已完成的工作秒数；边界都在整分钟上时直接查位图
+    def work_seconds_at(self, second):
+        if self.minute_aligned and 0 <= second < SECONDS_PER_DAY:
+            minute = int(second // 60)
+            elapsed = self.cumulative_minutes[minute] * 60
+            if self.minute_bitmap[minute]:
+                elapsed += second - minute * 60
+            return elapsed
+        index = self._locate(second)
+        if index < 0:
+            return 0
+        return self.cumulative[index] + min(second, self.ends[index]) - self.starts[index]
+
+    # 某一时刻是否处于工作时间段内
+    def is_working_at(self, second):
+        if self.minute_aligned and 0 <= second < SECONDS_PER_DAY:
+            return self.minute_bitmap[int(second // 60)] == 1
+        index = self._locate(second)
+        return index >= 0 and second < self.ends[index]
+
+    # 截至某一时刻已赚取的金额
+    def earned_at(self, second, money_per_second):
+        return self.work_seconds_at(second) * money_per_second
+
+
+_schedule_cache = LRUCache(SCHEDULE_CACHE_SIZE)
+
+
+# 按规范化后的区间取出编译日程；相同配置在所有会话间共享同一个对象
+def get_compiled_schedule(intervals):
+    return _schedule_cache.get_or_create(intervals, lambda: CompiledSchedule(intervals))
+
+
+# 将 session_state 中的工作时间段编译为 CompiledSchedule
+def compile_schedule(periods):
+    return get_compiled_schedule(normalize_periods(periods))
@@ -0,0 +1,241 @@
+# 本地收入历史：SQLite 按档案（profile）保存每天的日程、日薪和收入，并在写入时增量维护月度/季度/年度汇总
+# （天数、工时、收入以及收入最高和最低的一天）。
+# 同一个数据库可以被多个会话共用，不同档案的记录和汇总互不影响
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+DEFAULT_DB_PATH = os.environ.get(
+    "MONEYTRACKER_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "moneytracker_history.db"),
+)
+
+# 未指定档案时使用的档案名；旧版本（没有档案列）数据库中的记录迁移到该档案
+DEFAULT_PROFILE = "default"
+
+# 汇总粒度 -> 表名
+ROLLUP_TABLES = {
+    "month": "monthly_rollups",
+    "quarter": "quarterly_rollups",
+    "year": "yearly_rollups",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    profile TEXT NOT NULL,
+    day TEXT NOT NULL,
+    timezone TEXT NOT NULL,
+    daily_salary REAL NOT NULL,
+    work_periods TEXT NOT NULL,
+    work_seconds REAL NOT NULL,
+    earned REAL NOT NULL,
+    PRIMARY KEY (profile, day)
+);
+""" + "".join(
+    f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    profile TEXT NOT NULL,
+    period TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    work_seconds REAL NOT NULL,
+    earned REAL NOT NULL,
+    best_day TEXT,
+    best_earned REAL,
+    worst_day TEXT,
+    worst_earned REAL,
+    PRIMARY KEY (profile, period)
+);
+"""
+    for table in ROLLUP_TABLES.values()
+)
+
+# 汇总表中的最佳/最差日列（旧版本的汇总表没有这些列）
+EXTREME_COLUMNS = {"best_day": "TEXT", "best_earned": "REAL", "worst_day": "TEXT", "worst_earned": "REAL"}
+
+
+# 旧版本的表没有档案列：改名后按新结构重建，原有记录归入 DEFAULT_PROFILE
+def _migrate_without_profile(connection):
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(days)")]
+    if not columns or "profile" in columns:
+        return
+    tables = ["days", *ROLLUP_TABLES.values()]
+    for table in tables:
+        connection.execute(f"ALTER TABLE {table} RENAME TO {table}_without_profile")
+    connection.executescript(_SCHEMA)
+    for table in tables:
+        old_columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table}_without_profile)")]
+        names = ", ".join(old_columns)
+        connection.execute(
+            f"INSERT INTO {table} (profile, {names}) SELECT ?, {names} FROM {table}_without_profile",
+            (DEFAULT_PROFILE,),
+        )
+        connection.execute(f"DROP TABLE {table}_without_profile")
+
+
+# 日期所属的各粒度汇总周期键
+def period_key(day, granularity):
+    if granularity == "month":
+        return f"{day.year:04d}-{day.month:02d}"
+    if granularity == "quarter":
+        return f"{day.year:04d}-Q{(day.month - 1) // 3 + 1}"
+    if granularity == "year":
+        return f"{day.year:04d}"
+    return day.isoformat()
+
+
+# 工作时间段序列化为 [["09:00", "12:00"], ...]
+def serialize_periods(periods):
+    return json.dumps([
+        [period["start_time"].strftime("%H:%M"), period["end_time"].strftime("%H:%M")]
+        for period in periods
+    ])
+
+
+def _month_end(day):
+    first_of_next = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return first_of_next - timedelta(days=1)
+
+
+def _quarter_end(day):
+    last_month = (day.month - 1) // 3 * 3 + 3
+    return _month_end(date(day.year, last_month, 1))
+
+
+# 日期所属汇总周期的第一天和最后一天
+def period_range(day, granularity):
+    if granularity == "month":
+        return day.replace(day=1), _month_end(day)
+    if granularity == "quarter":
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1), _quarter_end(day)
+    return date(day.year, 1, 1), date(day.year, 12, 31)
+
+
+# 汇总周期键（见 period_key）对应周期的第一天
+def _period_start(period):
+    year = int(period[:4])
+    if "-Q" in period:
+        return date(year, int(period[-1]) * 3 - 2, 1)
+    if len(period) > 4:
+        return date(year, int(period[5:7]), 1)
+    return date(year, 1, 1)
+
+
+# 从每日记录中重新找出某个汇总周期收入最高和最低的一天：收入相同时最佳日取较晚的一天、最差日取较早的一天
+def _refresh_extremes(connection, table, granularity, profile, period):
+    first, last = period_range(_period_start(period), granularity)
+    span = (profile, first.isoformat(), last.isoformat())
+    best = connection.execute(
+        "SELECT day, earned FROM days WHERE profile = ? AND day BETWEEN ? AND ? ORDER BY earned DESC, day DESC LIMIT 1", span
+    ).fetchone()
+    worst = connection.execute(
+        "SELECT day, earned FROM days WHERE profile = ? AND day BETWEEN ? AND ? ORDER BY earned, day LIMIT 1", span
+    ).fetchone()
+    if best is None:
+        return
+    connection.execute(
+        f"UPDATE {table} SET best_day = ?, best_earned = ?, worst_day = ?, worst_earned = ? WHERE profile = ? AND period = ?",
+        (best["day"], best["earned"], worst["day"], worst["earned"], profile, period),
+    )
+
+
+# 旧版本的汇总表没有最佳/最差日列：补上这些列，并为还没有最佳/最差日的汇总行从每日记录中补齐
+def _migrate_extremes(connection):
+    for granularity, table in ROLLUP_TABLES.items():
+        columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+        for name, kind in EXTREME_COLUMNS.items():
+            if name not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {kind}")
+        for row in connection.execute(f"SELECT profile, period FROM {table} WHERE best_day IS NULL").fetchall():
+            _refresh_extremes(connection, table, granularity, row["profile"], row["period"])
+
+
+class HistoryStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            _migrate_without_profile(self._connection)
+            self._connection.executescript(_SCHEMA)
+            _migrate_extremes(self._connection)
+
+    def close(self):
+        self._connection.close()
+
+    # 写入（或覆盖）某个档案某一天的记录，并把与旧值的差额累加到该档案的各汇总表
+    def record_day(self, day, timezone, daily_salary, work_periods, work_seconds, earned, profile=DEFAULT_PROFILE):
+        key = day.isoformat()
+        periods_json = work_periods if isinstance(work_periods, str) else serialize_periods(work_periods)
+        with self._lock, self._connection:
+            previous = self._connection.execute(
+                "SELECT work_seconds, earned FROM days WHERE profile = ? AND day = ?", (profile, key)
+            ).fetchone()
+            if previous is None:
+                delta = (1, work_seconds, earned)
+            else:
+                delta = (0, work_seconds - previous["work_seconds"], earned - previous["earned"])
+
+            self._connection.execute(
+                "INSERT INTO days (profile, day, timezone, daily_salary, work_periods, work_seconds, earned) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(profile, day) DO UPDATE SET timezone = excluded.timezone, "
+                "daily_salary = excluded.daily_salary, work_periods = excluded.work_periods, "
+                "work_seconds = excluded.work_seconds, earned = excluded.earned",
+                (profile, key, timezone, daily_salary, periods_json, work_seconds, earned),
+            )
+            for granularity, table in ROLLUP_TABLES.items():
+                period = period_key(day, granularity)
+                self._connection.execute(
+                    f"INSERT INTO {table} (profile, period, days, work_seconds, earned) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(profile, period) DO UPDATE SET days = days + excluded.days, "
+                    "work_seconds = work_seconds + excluded.work_seconds, "
+                    "earned = earned + excluded.earned",
+                    (profile, period, *delta),
+                )
+                self._update_extremes(table, granularity, profile, period, key, earned,
+                                      None if previous is None else previous["earned"])
+
+    # 增量维护汇总周期的最佳/最差日：新的收入只需与当前的最佳/最差日比较；
+    # 只有当前的最佳日收入变少或最差日收入变多时，才重新查找这个周期的每日记录
+    def _update_extremes(self, table, granularity, profile, period, key, earned, previous):
+        row = self._connection.execute(
+            f"SELECT best_day, best_earned, worst_day, worst_earned FROM {table} WHERE profile = ? AND period = ?",
+            (profile, period),
+        ).fetchone()
+        if row["best_day"] is None or (previous is not None and (
+            (row["best_day"] == key and earned < previous) or (row["worst_day"] == key and earned > previous)
+        )):
+            _refresh_extremes(self._connection, table, granularity, profile, period)
+            return
+        best = (earned, key) if (earned, key) > (row["best_earned"], row["best_day"]) else (row["best_earned"], row["best_day"])
+        worst = (earned, key) if (earned, key) < (row["worst_earned"], row["worst_day"]) else (row["worst_earned"], row["worst_day"])
+        if best != (row["best_earned"], row["best_day"]) or worst != (row["worst_earned"], row["worst_day"]):
+            self._connection.execute(
+                f"UPDATE {table} SET best_day = ?, best_earned = ?, worst_day = ?, worst_earned = ? "
+                "WHERE profile = ? AND period = ?",
+                (best[1], best[0], worst[1], worst[0], profile, period),
+            )
+
+    # 某个档案的数据指纹：记录天数和累计收入，任何写入都会改变它，用作统计缓存的键
+    def fingerprint(self, profile=DEFAULT_PROFILE):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COALESCE(SUM(days), 0) AS days, COALESCE(SUM(earned), 0) AS earned, "
+                "COALESCE(SUM(work_seconds), 0) AS work_seconds FROM yearly_rollups WHERE profile = ?",
+                (profile,),
+            ).fetchone()
+        return (row["days"], row["earned"], row["work_seconds"])
+
+    # 读取某个档案某一粒度的汇总行（含最佳/最差日），按周期排序
+    def rollups(self, granularity, profile=DEFAULT_PROFILE):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT period, days, work_seconds, earned, best_day, best_earned, worst_day, worst_earned "
+                f"FROM {ROLLUP_TABLES[granularity]} "
+                "WHERE profile = ? ORDER BY period",
+                (profile,),
+            ).fetchall()
+        return [dict(row) for row in rows]
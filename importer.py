@@ -0,0 +1,412 @@
+# 日程导入：从 CSV 或 iCalendar (.ics) 导出文件中逐行流式读取事件，换算为 UTC 纪元秒区间，
+# 分块排序并合并重叠后编译为跨多天的 EventSchedule，可按任意时间/日期范围计算工作时长和收入。
+# 内存只与合并后的区间数和一个分块的大小有关，与文件大小无关
+#
+#   python importer.py calendar.ics --timezone Asia/Shanghai --rate 50 --from 2025-01-01 --to 2025-03-31
+import argparse
+import csv
+import io
+import os
+import re
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+from clock import SECONDS_PER_DAY, get_timezone, local_epoch
+
+# 每累积这么多个事件就排序合并一次
+CHUNK_SIZE = 8192
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_DURATION_PATTERN = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+# 文件内容格式错误（带行号）
+class ImportFormatError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+# 导入过程的计数：读到的事件、跳过的事件（全天、已取消、缺少时间或时长为零）和合并后的区间数
+class ImportStats:
+    __slots__ = ("events", "skipped", "intervals")
+
+    def __init__(self):
+        self.events = 0
+        self.skipped = 0
+        self.intervals = 0
+
+    def as_dict(self):
+        return {"events": self.events, "skipped": self.skipped, "intervals": self.intervals}
+
+
+# 本地钟点换算为 Unix 时间；每天只用 local_epoch 换算一次午夜，当天没有夏令时切换时直接加上秒数
+class _LocalClock:
+    def __init__(self, tz):
+        self.tz = tz
+        self._days = {}
+
+    def epoch(self, day, seconds):
+        entry = self._days.get(day)
+        if entry is None:
+            midnight = local_epoch(self.tz, day)
+            uniform = local_epoch(self.tz, day + timedelta(days=1)) - midnight == SECONDS_PER_DAY
+            entry = self._days[day] = (midnight, uniform)
+        if entry[1]:
+            return entry[0] + seconds
+        return local_epoch(self.tz, day, seconds)
+
+
+# 把若干个（可能重叠、无序的）区间排序合并；首尾相接的区间也合并为一段
+def _merge_chunk(intervals):
+    intervals.sort()
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# 把已合并的区间数组和一个已合并的分块做一次归并，返回新的 (starts, ends)
+def _merge_into(starts, ends, chunk):
+    merged_starts = array("d")
+    merged_ends = array("d")
+    i = j = 0
+    count = len(starts)
+    while i < count or j < len(chunk):
+        if j >= len(chunk) or (i < count and starts[i] <= chunk[j][0]):
+            start, end = starts[i], ends[i]
+            i += 1
+        else:
+            start, end = chunk[j]
+            j += 1
+        if merged_ends and start <= merged_ends[-1]:
+            if end > merged_ends[-1]:
+                merged_ends[-1] = end
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return merged_starts, merged_ends
+
+
+# 分块合并任意顺序的 (start, end) 区间流，返回有序且互不重叠的 (starts, ends) 数组
+def merge_intervals(intervals, chunk_size=CHUNK_SIZE):
+    starts = array("d")
+    ends = array("d")
+    chunk = []
+    for interval in intervals:
+        chunk.append(interval)
+        if len(chunk) >= chunk_size:
+            starts, ends = _merge_into(starts, ends, _merge_chunk(chunk))
+            chunk = []
+    if chunk:
+        starts, ends = _merge_into(starts, ends, _merge_chunk(chunk))
+    return starts, ends
+
+
+# 解析 CSV 中的日期时间：ISO 8601，带 UTC 偏移时按偏移换算，否则为导入时区的本地时间
+def _csv_moment(text, clock):
+    moment = datetime.fromisoformat(text.strip())
+    if moment.tzinfo is not None:
+        return moment.timestamp()
+    return clock.epoch(moment.date(), moment.hour * 3600 + moment.minute * 60 + moment.second)
+
+
+# 逐行产出 CSV 记录；csv 模块自身的错误（例如字段超过长度上限）转为 ImportFormatError
+def _csv_rows(reader):
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            raise ImportFormatError(reader.line_num, f"malformed CSV ({error})")
+        yield row
+
+
+# 逐行读取 CSV 事件。表头（不区分大小写）需包含 start,end（日期时间），
+# 或 date,start_time,end_time（结束早于开始表示到次日结束，与侧边栏的时间段一致）
+def iter_csv_events(lines, timezone, stats=None):
+    clock = _LocalClock(get_timezone(timezone))
+    reader = csv.reader(lines)
+    rows = _csv_rows(reader)
+    header = [name.strip().lower() for name in next(rows, [])]
+    if {"start", "end"} <= set(header):
+        start_column, end_column = header.index("start"), header.index("end")
+        date_column = None
+    elif {"date", "start_time", "end_time"} <= set(header):
+        date_column = header.index("date")
+        start_column, end_column = header.index("start_time"), header.index("end_time")
+    else:
+        raise ImportFormatError(1, "CSV header needs start,end or date,start_time,end_time columns")
+
+    for row in rows:
+        if not row or not any(field.strip() for field in row):
+            continue
+        if stats is not None:
+            stats.events += 1
+        try:
+            if date_column is None:
+                start = _csv_moment(row[start_column], clock)
+                end = _csv_moment(row[end_column], clock)
+            else:
+                day = date.fromisoformat(row[date_column].strip())
+                start_time = datetime.strptime(row[start_column].strip(), "%H:%M").time()
+                end_time = datetime.strptime(row[end_column].strip(), "%H:%M").time()
+                start_seconds = start_time.hour * 3600 + start_time.minute * 60
+                end_seconds = end_time.hour * 3600 + end_time.minute * 60
+                start = clock.epoch(day, start_seconds)
+                if end_seconds <= start_seconds:
+                    end = clock.epoch(day + timedelta(days=1), end_seconds)
+                else:
+                    end = clock.epoch(day, end_seconds)
+        except (IndexError, ValueError) as error:
+            raise ImportFormatError(reader.line_num, f"invalid row {row!r} ({error})")
+        if end <= start:
+            if stats is not None:
+                stats.skipped += 1
+            continue
+        yield start, end
+
+
+# 展开 iCalendar 的折行（以空格或制表符开头的行接在上一行后面）
+def _unfold(lines):
+    pending = None
+    pending_number = 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_number, pending
+        pending, pending_number = line, number
+    if pending is not None:
+        yield pending_number, pending
+
+
+# 拆分一行属性：名称、参数字典和值
+def _property(line):
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(param.partition("=")[::2] for param in params), value
+
+
+# iCalendar 的日期时间：UTC（Z 结尾）、带 TZID 参数或浮动的本地时间；VALUE=DATE（全天）返回 None。
+# clocks 为 {TZID: _LocalClock}，"" 对应导入时区
+def _ics_moment(value, params, clocks, number):
+    try:
+        if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+            return None
+        day = date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        seconds = int(value[9:11]) * 3600 + int(value[11:13]) * 60 + int(value[13:15])
+    except (ValueError, IndexError):
+        raise ImportFormatError(number, f"invalid date-time {value!r}")
+    if value.endswith("Z"):
+        return (day.toordinal() - _EPOCH_ORDINAL) * SECONDS_PER_DAY + seconds
+    tzid = params.get("TZID", "").strip('"')
+    clock = clocks.get(tzid)
+    if clock is None:
+        try:
+            clock = clocks[tzid] = _LocalClock(get_timezone(tzid))
+        except KeyError:
+            # 导出程序自定义的时区名（如 Windows 时区）按导入时区处理
+            clock = clocks[tzid] = clocks[""]
+    return clock.epoch(day, seconds)
+
+
+def _ics_duration(value, number):
+    match = _DURATION_PATTERN.match(value.strip())
+    if match is None:
+        raise ImportFormatError(number, f"invalid duration {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    total = (int(weeks or 0) * 7 + int(days or 0)) * SECONDS_PER_DAY
+    total += int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+    return -total if sign == "-" else total
+
+
+# 逐行读取 iCalendar 中的 VEVENT。只取 DTSTART 与 DTEND（或 DURATION），
+# 全天事件、已取消事件和缺少时间的事件计为跳过；RRULE 重复规则不展开，只导入首次发生
+def iter_ics_events(lines, timezone, stats=None):
+    clocks = {"": _LocalClock(get_timezone(timezone))}
+    event = None
+    for number, line in _unfold(lines):
+        if event is None:
+            if line.upper() == "BEGIN:VEVENT":
+                event = {"number": number}
+            continue
+        if line.upper() == "END:VEVENT":
+            if stats is not None:
+                stats.events += 1
+            start = end = None
+            if "DTSTART" in event and not event.get("cancelled"):
+                value, params, start_number = event["DTSTART"]
+                start = _ics_moment(value, params, clocks, start_number)
+                if start is not None and "DTEND" in event:
+                    value, params, end_number = event["DTEND"]
+                    end = _ics_moment(value, params, clocks, end_number)
+                elif start is not None and "DURATION" in event:
+                    end = start + _ics_duration(*event["DURATION"])
+            event = None
+            if start is None or end is None or end <= start:
+                if stats is not None:
+                    stats.skipped += 1
+                continue
+            yield start, end
+            continue
+        name = line[:line.find(":")].split(";", 1)[0].upper()
+        if name in ("DTSTART", "DTEND"):
+            _, params, value = _property(line)
+            event[name] = (value.strip(), params, number)
+        elif name == "DURATION":
+            event[name] = (_property(line)[2], number)
+        elif name == "STATUS" and _property(line)[2].strip().upper() == "CANCELLED":
+            event["cancelled"] = True
+
+
+# 跨多天的导入日程：有序互不重叠的工作区间（Unix 秒）及每段开始前已累计的工作秒数，
+# 任意时刻的累计工作秒数都是一次二分查找。编译后不可变
+class EventSchedule:
+    __slots__ = ("starts", "ends", "cum_work", "total_seconds")
+
+    def __init__(self, starts, ends):
+        self.starts = starts
+        self.ends = ends
+        self.cum_work = array("d")
+        total = 0.0
+        for start, end in zip(starts, ends):
+            self.cum_work.append(total)
+            total += end - start
+        self.total_seconds = total
+
+    def __len__(self):
+        return len(self.starts)
+
+    # 第一段开始和最后一段结束的时刻（没有区间时为 None）
+    def span(self):
+        if not self.starts:
+            return None
+        return self.starts[0], self.ends[-1]
+
+    # 截至某一时刻已完成的工作秒数（从第一段开始算起）
+    def work_seconds_at(self, moment):
+        index = bisect_right(self.starts, moment) - 1
+        if index < 0:
+            return 0.0
+        return self.cum_work[index] + min(moment, self.ends[index]) - self.starts[index]
+
+    # 两个时刻之间的工作秒数
+    def work_seconds_between(self, start, end):
+        return self.work_seconds_at(end) - self.work_seconds_at(start)
+
+    # 两个时刻之间赚取的金额
+    def earned_between(self, start, end, money_per_second):
+        return self.work_seconds_between(start, end) * money_per_second
+
+    # 本地日期 first_day 到 last_day（含）之间的工作秒数，按各自午夜的实际 UTC 偏移划分
+    def work_seconds_between_dates(self, timezone, first_day, last_day):
+        tz = get_timezone(timezone)
+        return self.work_seconds_between(local_epoch(tz, first_day), local_epoch(tz, last_day + timedelta(days=1)))
+
+    # 本地日期 first_day 到 last_day（含）之间赚取的金额
+    def earned_between_dates(self, timezone, first_day, last_day, money_per_second):
+        return self.work_seconds_between_dates(timezone, first_day, last_day) * money_per_second
+
+    # 本地日期 first_day 到 last_day（含）之间的收入：每个时间段在计薪日历 calendar（需覆盖这些日期）上计算，
+    # 只计入与日历工作时间重叠的部分，基础时薪、倍率档位和节假日都按日历
+    def earned_on_calendar(self, calendar, first_day, last_day):
+        tz = get_timezone(calendar.timezone)
+        start, end = local_epoch(tz, first_day), local_epoch(tz, last_day + timedelta(days=1))
+        total = 0.0
+        index = bisect_right(self.ends, start)
+        while index < len(self.starts) and self.starts[index] < end:
+            total += calendar.earned_between(max(self.starts[index], start), min(self.ends[index], end))
+            index += 1
+        return total
+
+    # 逐日的 (日期, 工作秒数)，只包含有工作时间的日子
+    def daily_seconds(self, timezone, first_day, last_day):
+        tz = get_timezone(timezone)
+        day = first_day
+        previous = self.work_seconds_at(local_epoch(tz, day))
+        while day <= last_day:
+            following = self.work_seconds_at(local_epoch(tz, day + timedelta(days=1)))
+            if following > previous:
+                yield day, following - previous
+            previous = following
+            day += timedelta(days=1)
+
+
+# 按扩展名（.csv / .ics / .ical）选择解析器
+def detect_format(name):
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ics", ".ical", ".ifb"):
+        return "ics"
+    raise ValueError(f"unsupported file type {extension or name!r} (expected .csv or .ics)")
+
+
+# 从文本行流中导入日程，返回 (EventSchedule, ImportStats)
+def import_lines(lines, kind, timezone, chunk_size=CHUNK_SIZE):
+    stats = ImportStats()
+    events = iter_csv_events(lines, timezone, stats) if kind == "csv" else iter_ics_events(lines, timezone, stats)
+    starts, ends = merge_intervals(events, chunk_size)
+    stats.intervals = len(starts)
+    return EventSchedule(starts, ends), stats
+
+
+# 从二进制文件对象（如上传的文件）导入：按 UTF-8 逐行解码，不整体读入字符串
+def import_file(binary, name, timezone, chunk_size=CHUNK_SIZE):
+    lines = io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+    try:
+        return import_lines(lines, detect_format(name), timezone, chunk_size)
+    finally:
+        lines.detach()
+
+
+# 从路径导入
+def import_path(path, timezone, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as binary:
+        return import_file(binary, path, timezone, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a CSV or iCalendar schedule and total its hours and earnings")
+    parser.add_argument("path")
+    parser.add_argument("--timezone", default="Asia/Shanghai", help="timezone for local times without an offset")
+    parser.add_argument("--rate", type=float, default=0.0, help="hourly rate used for earnings")
+    parser.add_argument("--from", dest="first_day", type=date.fromisoformat, help="first local date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="last_day", type=date.fromisoformat, help="last local date, inclusive")
+    parser.add_argument("--daily", action="store_true", help="also print per-day hours")
+    args = parser.parse_args()
+
+    try:
+        get_timezone(args.timezone)
+    except KeyError:
+        parser.error(f"unknown timezone {args.timezone!r}")
+    try:
+        schedule, stats = import_path(args.path, args.timezone)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    print(f"{stats.events} events, {stats.skipped} skipped, {stats.intervals} merged intervals")
+    span = schedule.span()
+    if span is None:
+        return
+    tz = get_timezone(args.timezone)
+    first_day = args.first_day or datetime.fromtimestamp(span[0], tz).date()
+    last_day = args.last_day or datetime.fromtimestamp(span[1], tz).date()
+    seconds = schedule.work_seconds_between_dates(args.timezone, first_day, last_day)
+    print(f"{first_day} .. {last_day}: {seconds / 3600:.2f} h, ${seconds * args.rate / 3600:.2f}")
+    if args.daily:
+        for day, day_seconds in schedule.daily_seconds(args.timezone, first_day, last_day):
+            print(f"  {day}  {day_seconds / 3600:6.2f} h  ${day_seconds * args.rate / 3600:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# 里程碑提醒：从编译日历直接反查每个里程碑的触发时刻（每赚 step 美元、赚到日薪的一定比例、进入/离开工作时段），
+# 每个日历窗口的事件表按周排班、时区和日期在会话间共享。每个会话只保存一个按触发时刻排序的小顶堆，
+# 每次刷新只需查看堆顶是否到期，不再在每次重跑时拿当前收入和所有阈值逐一比较
+from bisect import bisect_left
+from heapq import heappop
+from math import floor
+
+from lru import LRUCache
+from weekly import get_calendar
+
+# 赚到日薪的这些比例时提醒
+MILESTONE_FRACTIONS = (0.5,)
+# 超过这么久（秒）才处理的事件不再提醒，避免会话长时间未刷新后一次弹出大量通知
+MAX_LATENESS = 600
+MILESTONE_CACHE_SIZE = 256
+# 每个会话的堆里最多同时放这么多个事件
+HEAP_CHUNK = 32
+
+# 事件类型：每赚 step 美元、赚到日薪的比例、进入工作时段、离开工作时段
+AMOUNT = "amount"
+FRACTION = "fraction"
+START = "start"
+END = "end"
+
+
+# 一个日历窗口 [window_start, window_end) 内的全部事件 (时刻, 类型, 数值)，按时刻排序。
+# 金额里程碑按工作日计算：在每个工作日起算点之间，用累计收入反查每个阈值首次达到的时刻
+def compile_milestones(calendar, daily_salary, step, fractions=MILESTONE_FRACTIONS):
+    window_start, window_end = calendar.window_start, calendar.window_end
+    events = []
+
+    # 相邻分段首尾相接只是倍率变化，不算进出工作时段
+    starts, ends = calendar.starts, calendar.ends
+    for index, (start, end) in enumerate(zip(starts, ends)):
+        if (index == 0 or ends[index - 1] != start) and window_start <= start < window_end:
+            events.append((start, START, None))
+        if (index + 1 == len(starts) or starts[index + 1] != end) and window_start <= end < window_end:
+            events.append((end, END, None))
+
+    anchors = calendar.anchor_points()
+    for (moment, base), (next_moment, _) in zip(anchors, anchors[1:]):
+        earned_before = calendar.pay_at(moment) - base
+        earned_after = calendar.pay_at(next_moment) - base
+        if earned_after <= earned_before:
+            continue
+        levels = [(AMOUNT, multiple * step) for multiple in range(floor(earned_before / step) + 1, floor(earned_after / step) + 1)]
+        levels += [(FRACTION, fraction) for fraction in fractions if earned_before < fraction * daily_salary <= earned_after]
+        for kind, value in levels:
+            amount = value * daily_salary if kind == FRACTION else value
+            reached = calendar.moment_of_pay(base + amount)
+            if reached is not None and moment <= reached < next_moment:
+                events.append((reached, kind, value))
+
+    # 按整个元组排序（同一时刻按类型），与堆的比较方式一致，排序后的切片才是合法的堆
+    events.sort()
+    return tuple(events)
+
+
+# 一个日历窗口的事件表和对应的时刻数组（用于二分查找起点）
+class MilestoneTable:
+    __slots__ = ("window_end", "events", "moments")
+
+    def __init__(self, calendar, daily_salary, step):
+        self.window_end = calendar.window_end
+        self.events = compile_milestones(calendar, daily_salary, step)
+        self.moments = [event[0] for event in self.events]
+
+
+_milestone_cache = LRUCache(MILESTONE_CACHE_SIZE)
+
+
+# 覆盖 moment 的日历窗口的事件表，在会话间共享
+def get_milestones(weekly, timezone, moment, step):
+    calendar = get_calendar(weekly, timezone, moment)
+    return _milestone_cache.get_or_create(
+        (weekly.key(), timezone, calendar.first_day, step),
+        lambda: MilestoneTable(calendar, weekly.daily_salary, step),
+    )
+
+
+# 一个会话的待触发事件：小顶堆里是共享事件表中接下来的至多 HEAP_CHUNK 个事件，取完后从游标处接着装入，
+# 当前窗口取完且越过窗口末尾后再装入下一个窗口。每个会话只占用一个小堆，事件本身在会话间共享
+class MilestoneQueue:
+    __slots__ = ("weekly", "timezone", "step", "table", "cursor", "heap", "loaded_until")
+
+    def __init__(self, weekly, timezone, step, now):
+        self.weekly = weekly
+        self.timezone = timezone
+        self.step = step
+        self.heap = []
+        self._load(now)
+
+    # 装入覆盖 moment 的窗口，游标指向第一个不早于 moment 的事件
+    # （窗口是左闭右开的，恰好落在窗口交界处的事件属于后一个窗口）
+    def _load(self, moment):
+        self.table = get_milestones(self.weekly, self.timezone, moment, self.step)
+        self.cursor = bisect_left(self.table.moments, moment)
+        self.loaded_until = self.table.window_end
+        self._refill()
+
+    # 事件表已按时刻排序，接下来的一段切片本身就是合法的堆
+    def _refill(self):
+        self.heap = list(self.table.events[self.cursor:self.cursor + HEAP_CHUNK])
+        self.cursor += len(self.heap)
+
+    # 到 now 为止触发的事件（按时刻排序）；没有事件到期时只看一眼堆顶
+    def due(self, now):
+        fired = []
+        while True:
+            heap = self.heap
+            while heap and heap[0][0] <= now:
+                event = heappop(heap)
+                if now - event[0] <= MAX_LATENESS:
+                    fired.append(event)
+            if heap:
+                return fired
+            if self.cursor < len(self.table.events):
+                self._refill()
+            elif now >= self.loaded_until:
+                self._load(self.loaded_until)
+            else:
+                return fired
+
+    # 下一个待触发事件的时刻；当前窗口已没有事件时为 None
+    def next_moment(self):
+        return self.heap[0][0] if self.heap else None
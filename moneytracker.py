@@ -1,12 +1,23 @@
+import math
 import streamlit as st
-import time
-from datetime import datetime, timedelta, time as dt_time
-import pandas as pd
-import numpy as np
-import altair as alt
-import plotly.graph_objects as go
-from streamlit_autorefresh import st_autorefresh
-import pytz
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from datetime import date, datetime, timedelta, time as dt_time
+from breaks import BREAK_CATEGORIES
+from clock import TIMEZONE_OPTIONS, get_timezone, take_snapshot
+from engine import compile_schedule
+from history import DEFAULT_PROFILE, HistoryStore
+from importer import ImportFormatError, import_file
+from milestones import AMOUNT, FRACTION, START, MilestoneQueue
+from presets import DEFAULT_WORK_PERIODS, PRESET_PERIODS, WORK_TIME_PRESETS
+from profiler import METRICS_PATH, PROFILE_ENABLED, begin_run, end_run, metrics, section
+from rates import WEEKEND_DAYS, make_tier, normalize_tiers
+from streams import IncomeStream, combined_goal_eta, format_periods, get_combined_calendar, parse_periods
+from texts import TEXTS
+from ticker import money_ticker
+from timeline import get_timeline_html
+from tracking import TrackingState
+from weekly import ALL_WEEKDAYS, CompiledCalendar, WeeklySchedule, get_calendar, goal_eta
+from workdays import get_workday_calendar, list_holiday_files, load_holidays
 
 # 设置页面配置
 st.set_page_config(
@@ -109,27 +120,49 @@ st.markdown("""
 if 'daily_salary' not in st.session_state:
     st.session_state.daily_salary = 300.0
 
+# 工作时间段为不可变的元组，默认值和预设在所有会话间共享；修改时整体替换（见 update_work_period）
 if 'work_periods' not in st.session_state:
-    # 默认工作时间段：上午9:00-12:00，下午14:00-18:00
-    st.session_state.work_periods = [
-        {"start_time": dt_time(9, 0), "end_time": dt_time(12, 0)},
-        {"start_time": dt_time(14, 0), "end_time": dt_time(18, 0)}
-    ]
+    st.session_state.work_periods = DEFAULT_WORK_PERIODS
+
+# 按星期几单独设置的工作时间段 {星期几: 时间段元组}，未设置的工作日使用 work_periods；修改时整体替换
+if 'weekday_periods' not in st.session_state:
+    st.session_state.weekday_periods = {}
+
+# 计薪倍率档位（见 rates.py），由侧边栏的倍率设置生成
+if 'rate_tiers' not in st.session_state:
+    st.session_state.rate_tiers = ()
+
+# 选中的节假日文件名（节假日目录中的文件，见 workdays.py）
+if 'holiday_files' not in st.session_state:
+    st.session_state.holiday_files = ()
+
+# 里程碑提醒：是否开启和金额间隔
+if 'milestones_on' not in st.session_state:
+    st.session_state.milestones_on = True
+if 'milestone_step' not in st.session_state:
+    st.session_state.milestone_step = 100.0
 
-if 'is_running' not in st.session_state:
-    st.session_state.is_running = False
+# 收入目标：(名称, 金额) 的不可变元组，修改时整体替换（见 add_goal）
+if 'goals' not in st.session_state:
+    st.session_state.goals = ()
 
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = None
+# 其他收入来源的定义：{"name", "daily_salary", "timezone", "periods", "workdays"} 的不可变元组，修改时整体替换（见 add_stream）
+if 'income_streams' not in st.session_state:
+    st.session_state.income_streams = ()
 
-if 'money_per_second' not in st.session_state:
-    st.session_state.money_per_second = 0
+# 历史记录档案：默认使用固定的 DEFAULT_PROFILE，新标签页和收藏的页面都能看到同一份历史；
+# 需要分开记录的用户在侧边栏选择自己的档案，档案名保存在页面地址的 profile 参数中
+if 'profile' not in st.session_state:
+    st.session_state.profile = st.query_params.get("profile") or DEFAULT_PROFILE
+    st.session_state.profile_name = st.session_state.profile
 
-if 'seconds_per_dollar' not in st.session_state:
-    st.session_state.seconds_per_dollar = 0
+# 追踪状态（TrackingState），未开始追踪时为 None
+if 'tracking' not in st.session_state:
+    st.session_state.tracking = None
 
-if 'total_work_seconds' not in st.session_state:
-    st.session_state.total_work_seconds = 0
+# 工作日（0 为星期一）
+if 'workdays' not in st.session_state:
+    st.session_state.workdays = list(range(7))
 
 # 添加时区设置
 if 'timezone' not in st.session_state:
@@ -139,162 +172,24 @@ if 'timezone' not in st.session_state:
 if 'language' not in st.session_state:
     st.session_state.language = "zh"
 
-# 预设工作时间模板
-WORK_TIME_PRESETS = {
-    "zh": {
-        "标准工作日 (9-18)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(18, 0))],
-        "早班 (8-17)": [(dt_time(8, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(17, 0))],
-        "晚班 (10-19)": [(dt_time(10, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(19, 0))],
-        "弹性工作 (9-17)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(14, 0), dt_time(17, 0))],
-        "连续工作 (9-18)": [(dt_time(9, 0), dt_time(18, 0))],
-        "半天工作 (9-13)": [(dt_time(9, 0), dt_time(13, 0))],
-        "自定义": []
-    },
-    "en": {
-        "Standard (9-18)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(18, 0))],
-        "Early Shift (8-17)": [(dt_time(8, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(17, 0))],
-        "Late Shift (10-19)": [(dt_time(10, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(19, 0))],
-        "Flexible (9-17)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(14, 0), dt_time(17, 0))],
-        "Continuous (9-18)": [(dt_time(9, 0), dt_time(18, 0))],
-        "Half Day (9-13)": [(dt_time(9, 0), dt_time(13, 0))],
-        "Custom": []
-    }
-}
-
-# 语言文本字典
-text = {
-    "zh": {
-        "title": "💰 Money Tracker",
-        "subtitle": "实时追踪你的工作收入",
-        "settings": "⚙️ 设置",
-        "timezone_setting": "🌍 时区设置",
-        "daily_salary": "日薪 ($)",
-        "work_time_settings": "📅 工作时间设置",
-        "work_time_desc": "选择预设模板或自定义工作时间段",
-        "preset_templates": "📋 预设模板",
-        "custom_periods": "🛠️ 自定义时间段",
-        "period": "时间段",
-        "start_time": "开始时间",
-        "end_time": "结束时间",
-        "add_period": "➕ 添加时间段",
-        "delete_period": "🗑️ 删除",
-        "start_tracking": "🚀 开始追踪",
-        "reset": "🔄 重置",
-        "current_time": "📌 当前时间",
-        "work_periods_today": "📊 今日工作时间段",
-        "work_time": "工作时间",
-        "non_work_time": "非工作时间",
-        "status": "状态",
-        "income_progress": "💰 今日收入进度",
-        "progress": "收入进度",
-        "detailed_stats": "📈 详细统计",
-        "earned_amount": "已赚取金额",
-        "time_per_dollar": "每赚$1所需时间",
-        "progress_today": "今日进度",
-        "minutes": "分钟",
-        "seconds": "秒",
-        "hours": "小时",
-        "setup_prompt": "👈 请在左侧设置您的时区、日薪和工作时间，然后点击'开始追踪'按钮开始记录您的收入。",
-        "work_periods_preview": "📋 工作时间段预览",
-        "total_work_time": "总工作时间",
-        "realtime_info": "⏱️ 实时信息",
-        "is_work_time": "✅ 当前是工作时间",
-        "not_work_time": "⚠️ 当前不是工作时间",
-        "work_time_details": "🗓️ 工作时间详情",
-        "salary_info": "💵 薪资信息",
-        "daily_salary_info": "日薪",
-        "hourly_salary": "小时薪资",
-        "minute_salary": "分钟薪资",
-        "app_description": "📝 应用说明",
-        "app_intro": "**Money Tracker** 帮助您实时追踪工作收入，让您更直观地了解自己的收入进度。",
-        "features": "**特点**:",
-        "feature_1": "- 支持预设工作时间模板，一键设置",
-        "feature_2": "- 直观的时间输入和可视化时间轴",
-        "feature_3": "- 实时计算已赚取金额（自动刷新）",
-        "feature_4": "- 可视化显示收入进度",
-        "feature_5": "- 详细统计信息",
-        "feature_6": "- 支持时区设置",
-        "how_to_use": "**使用方法**:",
-        "step_1": "1. 选择预设工作时间模板或自定义",
-        "step_2": "2. 设置您的时区和日薪",
-        "step_3": "3. 点击开始追踪按钮",
-        "step_4": "4. 实时查看您的收入进度",
-        "language": "🌐 语言",
-        "time_format_error": "⚠️ 时间格式错误，请使用 HH:MM 格式（如：09:30）",
-        "time_range_error": "⚠️ 结束时间必须晚于开始时间",
-        "visual_timeline": "📊 可视化时间轴"
-    },
-    "en": {
-        "title": "💰 Money Tracker",
-        "subtitle": "Track your work income in real-time",
-        "settings": "⚙️ Settings",
-        "timezone_setting": "🌍 Timezone Settings",
-        "daily_salary": "Daily Salary ($)",
-        "work_time_settings": "📅 Work Time Settings",
-        "work_time_desc": "Choose preset templates or customize work periods",
-        "preset_templates": "📋 Preset Templates",
-        "custom_periods": "🛠️ Custom Periods",
-        "period": "Period",
-        "start_time": "Start Time",
-        "end_time": "End Time",
-        "add_period": "➕ Add Period",
-        "delete_period": "🗑️ Delete",
-        "start_tracking": "🚀 Start Tracking",
-        "reset": "🔄 Reset",
-        "current_time": "📌 Current Time",
-        "work_periods_today": "📊 Today's Work Periods",
-        "work_time": "Work Time",
-        "non_work_time": "Non-Work Time",
-        "status": "Status",
-        "income_progress": "💰 Today's Income Progress",
-        "progress": "Progress",
-        "detailed_stats": "📈 Detailed Statistics",
-        "earned_amount": "Earned Amount",
-        "time_per_dollar": "Time per $1",
-        "progress_today": "Today's Progress",
-        "minutes": "min",
-        "seconds": "sec",
-        "hours": "hours",
-        "setup_prompt": "👈 Please set your timezone, daily salary and work periods on the left, then click 'Start Tracking' to begin recording your income.",
-        "work_periods_preview": "📋 Work Periods Preview",
-        "total_work_time": "Total Work Time",
-        "realtime_info": "⏱️ Real-time Information",
-        "is_work_time": "✅ Currently in Work Time",
-        "not_work_time": "⚠️ Currently Not in Work Time",
-        "work_time_details": "🗓️ Work Time Details",
-        "salary_info": "💵 Salary Information",
-        "daily_salary_info": "Daily Salary",
-        "hourly_salary": "Hourly Rate",
-        "minute_salary": "Minute Rate",
-        "app_description": "📝 App Description",
-        "app_intro": "**Money Tracker** helps you track your work income in real-time, giving you a visual understanding of your earning progress.",
-        "features": "**Features**:",
-        "feature_1": "- Preset work time templates for quick setup",
-        "feature_2": "- Intuitive time input and visual timeline",
-        "feature_3": "- Real-time calculation of earned amount (auto-refresh)",
-        "feature_4": "- Visual display of income progress",
-        "feature_5": "- Detailed statistics",
-        "feature_6": "- Timezone support",
-        "how_to_use": "**How to Use**:",
-        "step_1": "1. Choose preset work time template or customize",
-        "step_2": "2. Set your timezone and daily salary",
-        "step_3": "3. Click the 'Start Tracking' button",
-        "step_4": "4. View your income progress in real-time",
-        "language": "🌐 Language",
-        "time_format_error": "⚠️ Invalid time format, please use HH:MM format (e.g., 09:30)",
-        "time_range_error": "⚠️ End time must be later than start time",
-        "visual_timeline": "📊 Visual Timeline"
-    }
-}
-
 # 获取当前语言的文本
 def get_text(key):
-    return text[st.session_state.language][key]
+    return TEXTS[st.session_state.language][key]
+
+# 是否正在追踪
+def is_running():
+    return st.session_state.tracking is not None
+
+# 取一次当前时间快照：每次运行（或片段重跑、回调）开始时调用一次，之后所有组件共享同一时刻
+def refresh_clock():
+    st.session_state.clock = take_snapshot(st.session_state.timezone)
+    return st.session_state.clock
 
-# 获取当前时区的时间
+# 获取当前时区的时间：返回本次运行的快照，不再重复读取系统时间
 def get_current_time():
-    tz = pytz.timezone(st.session_state.timezone)
-    return datetime.now(tz)
+    if 'clock' not in st.session_state:
+        refresh_clock()
+    return st.session_state.clock.local
 
 # 时间对象转换为分钟数
 def time_to_minutes(time_obj):
@@ -310,79 +205,277 @@ def minutes_to_time_str(minutes):
 
 # 计算工作总秒数
 def calculate_work_seconds(periods):
-    total_seconds = 0
-    for period in periods:
-        start_minutes = time_to_minutes(period["start_time"])
-        end_minutes = time_to_minutes(period["end_time"])
-        if start_minutes is not None and end_minutes is not None:
-            total_seconds += (end_minutes - start_minutes) * 60
-    return total_seconds
-
-# 计算已赚取的金额
+    return compile_schedule(periods).total_seconds
+
+# 覆盖某一时刻的编译日历（按周排班、时区和日期在所有会话间共享）
+def current_calendar(now):
+    return get_calendar(st.session_state.tracking.weekly, st.session_state.timezone, now.timestamp())
+
+# 计算已赚取的金额：从当前工作日的起点（跨午夜班次为班次开始时刻）算起
 def calculate_earned_money():
-    if not st.session_state.is_running:
+    if not is_running():
         return 0.0
     
     now = get_current_time()
-    elapsed_work_seconds = 0
-    
-    for period in st.session_state.work_periods:
-        start_minutes = time_to_minutes(period["start_time"])
-        end_minutes = time_to_minutes(period["end_time"])
-        
-        if start_minutes is None or end_minutes is None:
-            continue
-            
-        start_hour, start_minute = start_minutes // 60, start_minutes % 60
-        end_hour, end_minute = end_minutes // 60, end_minutes % 60
-        
-        period_start = now.replace(hour=start_hour, minute=start_minute, second=0, microsecond=0)
-        period_end = now.replace(hour=end_hour, minute=end_minute, second=0, microsecond=0)
-        
-        if now < period_start:
-            continue
-        
-        if period_start <= now < period_end:
-            elapsed_work_seconds += (now - period_start).total_seconds()
-        elif now >= period_end:
-            elapsed_work_seconds += (period_end - period_start).total_seconds()
-    
-    return elapsed_work_seconds * st.session_state.money_per_second
+    return current_calendar(now).day_totals(now.timestamp())[2]
+
+# 选中的节假日文件合并后的节假日定义（按文件修改时间在会话间缓存）；没有选择或文件有误时为 None
+def current_holidays():
+    files = list_holiday_files()
+    paths = [files[name] for name in st.session_state.holiday_files if name in files]
+    if not paths:
+        return None
+    try:
+        return load_holidays(paths)
+    except (OSError, ImportFormatError) as error:
+        st.error(f"{get_text('holiday_error')}: {error}")
+        return None
+
+# 选中的工作日中单独设置了时间段的 {星期几: 时间段}
+def current_overrides():
+    return {weekday: periods for weekday, periods in st.session_state.weekday_periods.items()
+            if weekday in st.session_state.workdays}
+
+# 当前设置（未追踪时）或正在追踪的周排班
+def current_weekly():
+    if is_running():
+        return st.session_state.tracking.weekly
+    return WeeklySchedule.from_periods(
+        st.session_state.work_periods,
+        st.session_state.workdays,
+        st.session_state.daily_salary,
+        st.session_state.rate_tiers,
+        current_holidays(),
+        current_overrides(),
+    )
+
+# 某一天所在的月、季度和年的 (标签, 第一天, 最后一天)
+def period_bounds(day):
+    quarter_month = (day.month - 1) // 3 * 3 + 1
+    month_first = day.replace(day=1)
+    quarter_first = day.replace(month=quarter_month, day=1)
+    year_first = day.replace(month=1, day=1)
+    return [
+        (get_text("this_month"), month_first, (month_first + timedelta(days=32)).replace(day=1) - timedelta(days=1)),
+        (get_text("this_quarter"), quarter_first, (quarter_first + timedelta(days=93)).replace(day=1) - timedelta(days=1)),
+        (get_text("this_year"), year_first, date(day.year, 12, 31)),
+    ]
 
 # 开始追踪
 def start_tracking():
-    st.session_state.is_running = True
-    current_time = get_current_time()
-    st.session_state.start_time = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    st.session_state.tracking = TrackingState.start(
+        st.session_state.work_periods,
+        st.session_state.workdays,
+        st.session_state.daily_salary,
+        st.session_state.rate_tiers,
+        current_holidays(),
+        st.session_state.income_streams,
+        current_overrides(),
+    )
+
+# 主工作（名称随界面语言）和其他收入来源
+def all_streams(tracking):
+    return (IncomeStream(get_text("primary_stream"), tracking.weekly, st.session_state.timezone), *tracking.streams)
+
+# 有其他收入来源时，覆盖 epoch 的合计收入曲线（各来源的日历按堆归并，在会话间共享）；没有时为 None
+def current_combined(tracking, epoch):
+    if not tracking.streams:
+        return None
+    return get_combined_calendar(all_streams(tracking), epoch)
+
+# 所有收入来源的日薪之和
+def total_daily_salary(tracking):
+    return tracking.daily_salary + sum(stream.weekly.daily_salary for stream in tracking.streams)
+
+# 历史记录的最短写入间隔（秒）
+HISTORY_WRITE_INTERVAL = 60
+
+# 进程内共享的历史记录存储
+@st.cache_resource
+def get_history_store():
+    return HistoryStore()
+
+# 把今天截至此刻的收入写入历史记录；非强制写入时按 HISTORY_WRITE_INTERVAL 节流
+def save_today(now, force=False):
+    last_saved = st.session_state.get("history_saved_at")
+    if not force and last_saved is not None and (now - last_saved).total_seconds() < HISTORY_WRITE_INTERVAL:
+        return
     
-    st.session_state.total_work_seconds = calculate_work_seconds(st.session_state.work_periods)
+    # 跨午夜的班次记在其开始的那一天
+    day, work_seconds, earned = current_calendar(now).day_totals(now.timestamp())
+    get_history_store().record_day(
+        day,
+        st.session_state.timezone,
+        st.session_state.daily_salary,
+        st.session_state.work_periods,
+        work_seconds,
+        earned,
+        st.session_state.profile,
+    )
+    st.session_state.history_saved_at = now
+
+# 按粒度汇总的历史统计：直接取写入时增量维护的汇总表（每个周期一行），不再读取全部每日记录；
+# 以存储的数据指纹为缓存键，数据不变时直接复用
+@st.cache_data(max_entries=16)
+def load_period_stats(profile, fingerprint, granularity):
+    from stats import summarize_rollups
     
-    if st.session_state.total_work_seconds > 0:
-        st.session_state.money_per_second = st.session_state.daily_salary / st.session_state.total_work_seconds
-        st.session_state.seconds_per_dollar = 1 / st.session_state.money_per_second
+    return summarize_rollups(get_history_store().rollups(granularity, profile))
+
+# 导入上传的日程文件；按（文件, 时区）在本会话内缓存，重跑时不重复解析。
+# 返回 (EventSchedule, ImportStats) 或 (None, 错误信息)
+def load_imported_schedule(upload):
+    key = (upload.file_id, st.session_state.timezone)
+    cached = st.session_state.get("imported_schedule")
+    if cached is None or cached[0] != key:
+        upload.seek(0)
+        try:
+            result = import_file(upload, upload.name, st.session_state.timezone)
+        except ValueError as error:
+            result = (None, str(error))
+        cached = st.session_state.imported_schedule = (key, result)
+    return cached[1]
 
 # 重置追踪
 def reset_tracking():
-    st.session_state.is_running = False
-    st.session_state.start_time = None
+    if is_running():
+        save_today(get_current_time(), force=True)
+    st.session_state.tracking = None
 
 # 应用预设模板
 def apply_preset_template(template_name):
-    presets = WORK_TIME_PRESETS[st.session_state.language]
-    if template_name in presets and presets[template_name]:
-        st.session_state.work_periods = [
-            {"start_time": start, "end_time": end} 
-            for start, end in presets[template_name]
-        ]
+    if PRESET_PERIODS.get(template_name):
+        st.session_state.work_periods = PRESET_PERIODS[template_name]
+
+# 修改某个工作时间段：生成新的元组，共享的默认值和预设不会被改动
+def update_work_period(index, start_time, end_time):
+    periods = list(st.session_state.work_periods)
+    periods[index] = {"start_time": start_time, "end_time": end_time}
+    st.session_state.work_periods = tuple(periods)
 
 # 添加工作时间段
 def add_work_period():
-    st.session_state.work_periods.append({"start_time": dt_time(9, 0), "end_time": dt_time(18, 0)})
+    st.session_state.work_periods = (*st.session_state.work_periods, {"start_time": dt_time(9, 0), "end_time": dt_time(18, 0)})
 
 # 删除工作时间段
 def remove_work_period(index):
-    if len(st.session_state.work_periods) > 1:
-        st.session_state.work_periods.pop(index)
+    periods = st.session_state.work_periods
+    if len(periods) > 1:
+        st.session_state.work_periods = periods[:index] + periods[index + 1:]
+
+# 添加收入目标，名称留空时用金额代替
+def add_goal(name, amount):
+    st.session_state.goals = (*st.session_state.goals, (name.strip() or f"${amount:.2f}", amount))
+
+# 设置某个星期几单独的工作时间段；periods 为空时恢复使用默认时间段
+def set_weekday_periods(weekday, periods):
+    weekday_periods = dict(st.session_state.weekday_periods)
+    if periods:
+        weekday_periods[weekday] = periods
+    else:
+        weekday_periods.pop(weekday, None)
+    st.session_state.weekday_periods = weekday_periods
+
+# 切换历史记录档案：默认档案不写入页面地址，其他档案名保存在 profile 参数中；清空输入时恢复原档案名
+def change_profile():
+    profile = st.session_state.profile_name.strip()
+    if not profile:
+        st.session_state.profile_name = st.session_state.profile
+        return
+    st.session_state.profile = st.session_state.profile_name = profile
+    if profile == DEFAULT_PROFILE:
+        st.query_params.pop("profile", None)
+    else:
+        st.query_params["profile"] = profile
+
+# 删除收入目标
+def remove_goal(index):
+    goals = st.session_state.goals
+    st.session_state.goals = goals[:index] + goals[index + 1:]
+
+# 添加收入来源，名称留空时用序号代替
+def add_stream(name, daily_salary, periods, workdays, timezone):
+    index = len(st.session_state.income_streams) + 1
+    definition = {
+        "name": name.strip() or f"#{index}",
+        "daily_salary": daily_salary,
+        "timezone": timezone,
+        "periods": periods,
+        "workdays": tuple(sorted(workdays)),
+    }
+    st.session_state.income_streams = (*st.session_state.income_streams, definition)
+
+# 删除收入来源
+def remove_stream(index):
+    streams = st.session_state.income_streams
+    st.session_state.income_streams = streams[:index] + streams[index + 1:]
+
+# 秒数显示为“X天Y小时Z分钟”，省略前面为零的单位
+def format_duration(seconds):
+    minutes = math.ceil(seconds / 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    text = f"{minutes}{get_text('minutes')}"
+    if hours or days:
+        text = f"{hours}{get_text('hours')}{text}"
+    if days:
+        text = f"{days}{get_text('days')}{text}"
+    return text
+
+# 各个收入目标的状态文本：已达成、预计达成时刻和剩余时间，或一年内无法达成
+def goal_statuses(tracking, clock):
+    tz = get_timezone(st.session_state.timezone)
+    statuses = []
+    for name, amount in st.session_state.goals:
+        if tracking.streams:
+            reached, moment = combined_goal_eta(all_streams(tracking), clock.epoch, amount)
+        else:
+            reached, moment = goal_eta(tracking.weekly, st.session_state.timezone, clock.epoch, amount)
+        if reached:
+            status = get_text("goal_reached")
+        elif moment is None:
+            status = get_text("goal_unreachable")
+        else:
+            eta = datetime.fromtimestamp(moment, tz)
+            time_format = "%H:%M:%S" if eta.date() == clock.local.date() else "%Y-%m-%d %H:%M"
+            status = get_text("goal_eta").format(time=eta.strftime(time_format), left=format_duration(moment - clock.epoch))
+        statuses.append((name, amount, status))
+    return statuses
+
+# 每次刷新最多弹出的里程碑提醒数
+MAX_MILESTONE_TOASTS = 3
+
+# 当前追踪的里程碑队列：提醒关闭时为 None，提醒间隔改变时从当前时刻重新建立
+def milestone_queue(clock):
+    tracking = st.session_state.tracking
+    if not st.session_state.milestones_on:
+        tracking.milestones = None
+        return None
+    step = st.session_state.milestone_step
+    if tracking.milestones is None or tracking.milestones.step != step:
+        tracking.milestones = MilestoneQueue(tracking.weekly, st.session_state.timezone, step, clock.epoch)
+    return tracking.milestones
+
+# 里程碑事件的 (图标, 提醒文本)
+def milestone_text(event):
+    _, kind, value = event
+    if kind == AMOUNT:
+        return "💵", get_text("milestone_amount").format(amount=value)
+    if kind == FRACTION:
+        return "🎯", get_text("milestone_fraction").format(percent=value * 100)
+    if kind == START:
+        return "🟢", get_text("milestone_start")
+    return "🔴", get_text("milestone_end")
+
+# 开始或结束某一类带薪休息
+def toggle_break(category):
+    # 回调在脚本重跑之前执行，需要自己取一次快照
+    now = refresh_clock().local
+    break_log = st.session_state.tracking.break_log
+    if break_log.is_open(category):
+        break_log.stop(category, now.timestamp(), current_calendar(now))
+    else:
+        break_log.start(category, now.timestamp())
 
 # 切换语言
 def switch_language():
@@ -391,32 +484,41 @@ def switch_language():
     else:
         st.session_state.language = "zh"
 
-# 生成可视化时间轴
-def generate_timeline_html():
-    html = '<div class="timeline-container">'
-    html += f'<h4>{get_text("visual_timeline")}</h4>'
-    html += '<div style="display: flex; flex-wrap: wrap; gap: 2px;">'
-    
-    # 创建24小时的时间块
-    for hour in range(24):
-        is_work_hour = False
-        for period in st.session_state.work_periods:
-            start_minutes = time_to_minutes(period["start_time"])
-            end_minutes = time_to_minutes(period["end_time"])
-            if start_minutes is not None and end_minutes is not None:
-                if start_minutes <= hour * 60 < end_minutes:
-                    is_work_hour = True
-                    break
-        
-        css_class = "timeline-work" if is_work_hour else "timeline-break"
-        html += f'<div class="timeline-hour {css_class}" title="{hour:02d}:00">{hour:02d}</div>'
-    
-    html += '</div></div>'
-    return html
+# 生成可视化时间轴（按工作区间和语言在所有会话间缓存）
+def generate_timeline_html(schedule):
+    return get_timeline_html(schedule, st.session_state.language)
+
+# 当前会话的 ID（用于按会话统计运行次数）
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "bare"
+
+# 本次运行是否只重跑片段（而不是整页重跑中内联执行片段）
+def is_fragment_rerun():
+    ctx = get_script_run_ctx()
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
 
-# 自动刷新设置
-if st.session_state.is_running:
-    count = st_autorefresh(interval=5000, limit=None, key="money_tracker_refresh")
+# 性能分析浮层：本次运行各区域的耗时、进程内累计统计和本会话的运行次数（仅在开启分析时显示）
+def render_profiler_overlay(run):
+    with st.sidebar.expander("🔧 Profiler"):
+        if run is None:
+            return
+        summary = metrics.as_dict()
+        rows = ["| section | this run | mean | max | count |", "|---|---:|---:|---:|---:|"]
+        for name, stats in summary["sections"].items():
+            this_run = run.sections.get(name)
+            rows.append(
+                f"| {name} | {'-' if this_run is None else f'{this_run * 1000:.1f} ms'} "
+                f"| {stats['mean_seconds'] * 1000:.1f} ms | {stats['max_seconds'] * 1000:.1f} ms | {stats['count']} |"
+            )
+        st.markdown("\n".join(rows))
+        session = summary["sessions"].get(run.session_id, {"runs": {}, "state_bytes": 0})
+        runs = ", ".join(f"{kind} {count}" for kind, count in session["runs"].items())
+        st.caption(f"runs this session: {runs} · session_state ≈ {session['state_bytes'] / 1024:.1f} KB")
+        st.caption(f"metrics: {METRICS_PATH}")
+
+# 开始记录本次整页运行（未开启性能分析时不做任何事）
+begin_run(current_session_id(), "script")
 
 # 语言选择器
 col_lang, col_title = st.columns([1, 10])
@@ -430,30 +532,25 @@ with col_title:
     st.markdown(f"### {get_text('subtitle')}")
 
 # 侧边栏设置
-with st.sidebar:
+with st.sidebar, section("sidebar"):
     st.header(get_text("settings"))
     
     # 时区设置
     st.markdown(f"### {get_text('timezone_setting')}")
-    timezone_options = {
-        'Asia/Shanghai': '🇨🇳 中国标准时间 (UTC+8)',
-        'America/New_York': '🇺🇸 美国东部时间 (UTC-5/-4)',
-        'America/Los_Angeles': '🇺🇸 美国西部时间 (UTC-8/-7)',
-        'Europe/London': '🇬🇧 英国时间 (UTC+0/+1)',
-        'Europe/Paris': '🇫🇷 欧洲中部时间 (UTC+1/+2)',
-        'Asia/Tokyo': '🇯🇵 日本标准时间 (UTC+9)',
-        'Australia/Sydney': '🇦🇺 澳大利亚东部时间 (UTC+10/+11)'
-    }
+    timezone_options = TIMEZONE_OPTIONS
     
     selected_timezone = st.selectbox(
         "选择时区 / Select Timezone",
         options=list(timezone_options.keys()),
         index=list(timezone_options.keys()).index(st.session_state.timezone),
         format_func=lambda x: timezone_options[x],
-        disabled=st.session_state.is_running
+        disabled=is_running()
     )
     st.session_state.timezone = selected_timezone
     
+    # 时区确定后取本次运行的时间快照
+    refresh_clock()
+    
     # 日薪设置
     st.session_state.daily_salary = st.number_input(
         get_text("daily_salary"),
@@ -462,14 +559,14 @@ with st.sidebar:
         value=st.session_state.daily_salary,
         step=10.0,
         format="%.2f",
-        disabled=st.session_state.is_running
+        disabled=is_running()
     )
     
     st.markdown(f"### {get_text('work_time_settings')}")
     st.markdown(get_text("work_time_desc"))
     
     # 预设模板选择
-    if not st.session_state.is_running:
+    if not is_running():
         st.markdown(f"#### {get_text('preset_templates')}")
         presets = WORK_TIME_PRESETS[st.session_state.language]
         
@@ -484,9 +581,82 @@ with st.sidebar:
     # 自定义时间段设置
     st.markdown(f"#### {get_text('custom_periods')}")
     
+    # 工作日选择：所有选中的日子使用同一组工作时间段
+    weekday_names = get_text("weekday_names")
+    st.session_state.workdays = st.multiselect(
+        get_text("workdays"),
+        options=list(range(7)),
+        default=st.session_state.workdays,
+        format_func=lambda weekday: weekday_names[weekday],
+        disabled=is_running(),
+    )
+    
+    # 按星期几单独设置工作时间段（例如周六只上半天），留空的工作日使用下面的默认时间段
+    with st.expander(get_text("weekday_periods")):
+        st.caption(get_text("weekday_periods_desc"))
+        for weekday in sorted(st.session_state.workdays):
+            # 输入框带固定的 key：以当前设置作为 value 时，每次修改后控件 ID 都会变化，下一次输入会丢失
+            key = f"weekday_periods_{weekday}"
+            if key not in st.session_state:
+                st.session_state[key] = format_periods(st.session_state.weekday_periods.get(weekday, ()))
+            text = st.text_input(
+                weekday_names[weekday],
+                key=key,
+                placeholder=get_text("weekday_periods_default"),
+                help=get_text("stream_periods_help"),
+                disabled=is_running(),
+            ).strip()
+            try:
+                periods = parse_periods(text) if text else ()
+            except ValueError:
+                st.error(get_text("stream_error"))
+            else:
+                if periods != st.session_state.weekday_periods.get(weekday, ()):
+                    set_weekday_periods(weekday, periods)
+    
+    # 节假日、调休和请假：从节假日目录的文件中选择，放假和请假的日子不计薪
+    holiday_files = list_holiday_files()
+    if holiday_files:
+        st.session_state.holiday_files = tuple(st.multiselect(
+            get_text("holiday_files"),
+            options=list(holiday_files),
+            default=[name for name in st.session_state.holiday_files if name in holiday_files],
+            help=get_text("holiday_files_help"),
+            disabled=is_running(),
+        ))
+    
+    # 计薪倍率档位：加班（每天某时刻之后）、夜班（可跨午夜）和周末（整天）
+    with st.expander(get_text("rate_tiers")):
+        st.caption(get_text("rate_tiers_desc"))
+        tiers = []
+        if st.checkbox(get_text("overtime_tier"), key="overtime_on", disabled=is_running()):
+            time_col, multiplier_col = st.columns(2)
+            overtime_after = time_col.time_input(get_text("overtime_after"), value=dt_time(18, 0), key="overtime_after",
+                                                 step=timedelta(minutes=15), disabled=is_running())
+            overtime_multiplier = multiplier_col.number_input(get_text("multiplier"), min_value=0.1, max_value=10.0, value=1.5,
+                                                              step=0.1, key="overtime_multiplier", disabled=is_running())
+            tiers.append(make_tier(ALL_WEEKDAYS, overtime_after, dt_time(0, 0), overtime_multiplier))
+        if st.checkbox(get_text("night_tier"), key="night_on", disabled=is_running()):
+            start_col, end_col, multiplier_col = st.columns(3)
+            night_start = start_col.time_input(get_text("night_start"), value=dt_time(22, 0), key="night_start",
+                                               step=timedelta(minutes=15), disabled=is_running())
+            night_end = end_col.time_input(get_text("night_end"), value=dt_time(6, 0), key="night_end",
+                                           step=timedelta(minutes=15), disabled=is_running())
+            night_multiplier = multiplier_col.number_input(get_text("multiplier"), min_value=0.1, max_value=10.0, value=1.2,
+                                                           step=0.1, key="night_multiplier", disabled=is_running())
+            tiers.append(make_tier(ALL_WEEKDAYS, night_start, night_end, night_multiplier))
+        if st.checkbox(get_text("weekend_tier"), key="weekend_on", disabled=is_running()):
+            weekend_multiplier = st.number_input(get_text("multiplier"), min_value=0.1, max_value=10.0, value=2.0,
+                                                 step=0.1, key="weekend_multiplier", disabled=is_running())
+            tiers.append(make_tier(WEEKEND_DAYS, dt_time(0, 0), dt_time(0, 0), weekend_multiplier))
+        st.session_state.rate_tiers = normalize_tiers(tiers)
+    
+    # 当前配置的编译日程：侧边栏时间轴、预览和运行视图共用同一个对象
+    current_schedule = compile_schedule(st.session_state.work_periods)
+    
     # 显示当前工作时间段的可视化
     if st.session_state.work_periods:
-        st.markdown(generate_timeline_html(), unsafe_allow_html=True)
+        st.markdown(generate_timeline_html(current_schedule), unsafe_allow_html=True)
     
     # 时间段输入 - 使用st.time_input替换文本输入
     for i, period in enumerate(st.session_state.work_periods):
@@ -500,7 +670,7 @@ with st.sidebar:
                 start_time = st.time_input(
                     get_text("start_time"),
                     value=period["start_time"],
-                    disabled=st.session_state.is_running,
+                    disabled=is_running(),
                     key=f"start_time_{i}",
                     step=timedelta(minutes=15)  # 15分钟间隔
                 )
@@ -510,49 +680,83 @@ with st.sidebar:
                 end_time = st.time_input(
                     get_text("end_time"),
                     value=period["end_time"],
-                    disabled=st.session_state.is_running,
+                    disabled=is_running(),
                     key=f"end_time_{i}",
                     step=timedelta(minutes=15)  # 15分钟间隔
                 )
             
             with col3:
-                if not st.session_state.is_running and len(st.session_state.work_periods) > 1:
+                if not is_running() and len(st.session_state.work_periods) > 1:
                     if st.button("🗑️", key=f"remove_{i}", help=get_text("delete_period")):
                         remove_work_period(i)
                         st.rerun()
             
-            # 验证时间范围
-            if start_time >= end_time:
+            # 验证时间范围：结束早于开始表示跨越午夜，到次日结束
+            if start_time == end_time:
                 st.error(get_text("time_range_error"))
             else:
-                # 更新时间段
-                st.session_state.work_periods[i]["start_time"] = start_time
-                st.session_state.work_periods[i]["end_time"] = end_time
+                # 更新时间段（只在改动时替换）
+                if start_time != period["start_time"] or end_time != period["end_time"]:
+                    update_work_period(i, start_time, end_time)
                 
                 # 显示时间段信息
                 start_minutes = time_to_minutes(start_time)
                 end_minutes = time_to_minutes(end_time)
-                duration_minutes = end_minutes - start_minutes
+                duration_minutes = (end_minutes - start_minutes) % (24 * 60)
                 duration_hours = duration_minutes // 60
                 duration_mins = duration_minutes % 60
+                next_day = f" ({get_text('next_day')})" if end_minutes < start_minutes else ""
                 
-                st.success(f"🕒 {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')} ({duration_hours}{get_text('hours')}{duration_mins}{get_text('minutes')})")
+                st.success(f"🕒 {start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}{next_day} ({duration_hours}{get_text('hours')}{duration_mins}{get_text('minutes')})")
         
         st.markdown("---")
     
     # 添加时间段按钮
-    if not st.session_state.is_running:
+    if not is_running():
         if st.button(get_text("add_period"), use_container_width=True):
             add_work_period()
             st.rerun()
     
+    # 其他收入来源：每个来源有自己的日薪、工作时间段、工作日和时区，开始追踪时一并编译
+    with st.expander(get_text("income_streams")):
+        st.caption(get_text("income_streams_desc"))
+        if not is_running():
+            with st.form("stream_form", clear_on_submit=True):
+                stream_name = st.text_input(get_text("stream_name"), key="stream_name")
+                stream_salary = st.number_input(get_text("stream_salary"), min_value=1.0, max_value=10000.0, value=100.0,
+                                                step=10.0, format="%.2f", key="stream_salary")
+                stream_periods = st.text_input(get_text("stream_periods"), value="19:00-21:00",
+                                               help=get_text("stream_periods_help"), key="stream_periods")
+                stream_workdays = st.multiselect(get_text("workdays"), options=list(range(7)), default=list(range(5)),
+                                                 format_func=lambda weekday: weekday_names[weekday], key="stream_workdays")
+                stream_timezone = st.selectbox(
+                    get_text("timezone_setting"),
+                    options=list(timezone_options.keys()),
+                    index=list(timezone_options.keys()).index(st.session_state.timezone),
+                    format_func=lambda x: timezone_options[x],
+                    key="stream_timezone",
+                )
+                if st.form_submit_button(get_text("add_stream"), use_container_width=True):
+                    try:
+                        add_stream(stream_name, stream_salary, parse_periods(stream_periods), stream_workdays, stream_timezone)
+                    except ValueError:
+                        st.error(get_text("stream_error"))
+        for i, definition in enumerate(st.session_state.income_streams):
+            name_col, remove_col = st.columns([5, 1])
+            periods_text = format_periods(definition["periods"])
+            workdays_text = ", ".join(weekday_names[weekday] for weekday in definition["workdays"])
+            name_col.markdown(f"**{definition['name']}** · ${definition['daily_salary']:.2f}  \n"
+                              f"{periods_text} · {workdays_text} · {timezone_options[definition['timezone']]}")
+            if not is_running():
+                remove_col.button("🗑️", key=f"remove_stream_{i}", help=get_text("delete_stream"), on_click=remove_stream, args=(i,))
+    
     # 开始/重置按钮
-    if not st.session_state.is_running:
+    if not is_running():
         if st.button(get_text("start_tracking"), use_container_width=True, type="primary"):
             # 验证所有时间段
             valid = True
             for period in st.session_state.work_periods:
-                if period["start_time"] >= period["end_time"]:
+                if period["start_time"] == period["end_time"]:
                     valid = False
                     break
             
@@ -565,134 +769,215 @@ with st.sidebar:
         if st.button(get_text("reset"), use_container_width=True):
             reset_tracking()
             st.rerun()
+    
+    # 里程碑提醒：事件时刻在编译日历上预先算好，运行中也可以调整
+    st.markdown(f"### {get_text('milestones')}")
+    st.session_state.milestones_on = st.toggle(get_text("milestones_on"), value=st.session_state.milestones_on,
+                                               help=get_text("milestones_help"))
+    if st.session_state.milestones_on:
+        st.session_state.milestone_step = st.number_input(
+            get_text("milestone_step"),
+            min_value=1.0,
+            max_value=100000.0,
+            value=st.session_state.milestone_step,
+            step=10.0,
+            format="%.2f",
+        )
+    
+    # 收入目标：运行中也可以增删，实时区域下一次刷新即显示
+    st.markdown(f"### {get_text('goals')}")
+    st.caption(get_text("goals_desc"))
+    with st.form("goal_form", clear_on_submit=True):
+        goal_name = st.text_input(get_text("goal_name"))
+        goal_amount = st.number_input(get_text("goal_amount"), min_value=0.01, max_value=1e9, value=100.0, step=10.0, format="%.2f")
+        if st.form_submit_button(get_text("add_goal"), use_container_width=True):
+            add_goal(goal_name, goal_amount)
+    for i, (name, amount) in enumerate(st.session_state.goals):
+        name_col, remove_col = st.columns([5, 1])
+        name_col.markdown(f"{name} · ${amount:.2f}")
+        remove_col.button("🗑️", key=f"remove_goal_{i}", help=get_text("delete_goal"), on_click=remove_goal, args=(i,))
+    
+    # 从日历导出文件导入多天的日程，按当前设置的计薪日历计算任意日期范围的收入
+    st.markdown(f"### {get_text('import_schedule')}")
+    upload = st.file_uploader(get_text("import_file"), type=["csv", "ics"], help=get_text("import_help"))
+    if upload is None:
+        st.session_state.pop("imported_schedule", None)
+    else:
+        imported, stats = load_imported_schedule(upload)
+        if imported is None:
+            st.error(f"{get_text('import_error')}: {stats}")
+        elif not len(imported):
+            st.warning(get_text("import_empty"))
+        else:
+            st.caption(get_text("import_summary").format(**stats.as_dict()))
+            tz = get_timezone(st.session_state.timezone)
+            first, last = (datetime.fromtimestamp(moment, tz).date() for moment in imported.span())
+            date_range = st.date_input(get_text("import_range"), value=(first, last), key="import_range")
+            if len(date_range) == 2:
+                first_day, last_day = date_range
+                seconds = imported.work_seconds_between_dates(st.session_state.timezone, first_day, last_day)
+                calendar = CompiledCalendar(current_weekly(), st.session_state.timezone, first_day,
+                                            days=(last_day - first_day).days + 1)
+                earned = imported.earned_on_calendar(calendar, first_day, last_day)
+                st.success(get_text("import_total").format(hours=seconds / 3600, earned=earned))
+    
+    # 历史记录档案：改为其他档案名即可查看并继续写入那一份历史
+    st.markdown(f"### {get_text('history_profile')}")
+    st.text_input(get_text("history_profile_name"), key="profile_name", on_change=change_profile,
+                  help=get_text("history_profile_help"))
 
-# 主内容区
-col1, col2 = st.columns([2, 1])
+# 实时区域：运行时只有这一部分按定时器重新执行，侧边栏和静态详情不再随刷新重跑
+LIVE_REFRESH_INTERVAL = timedelta(seconds=5)
 
-with col1:
-    # 当前时间和工作状态
-    current_time = get_current_time().strftime("%Y-%m-%d %H:%M:%S")
-    st.markdown(f"### {get_text('current_time')}: {current_time}")
+@st.fragment(run_every=LIVE_REFRESH_INTERVAL)
+def render_live_panel():
+    # 图表库只在运行视图中需要，延迟到这里再导入以缩短首次加载时间
+    from charts import get_timeline_charts
     
-    if st.session_state.is_running:
-        st.markdown(f"### {get_text('work_periods_today')}")
-        
-        # 创建更详细的时间轴可视化
-        minutes_in_day = list(range(0, 24 * 60, 15))  # 每15分钟一个点
-        is_work_minute = [False] * len(minutes_in_day)
-        
-        for period in st.session_state.work_periods:
-            start_minutes = time_to_minutes(period["start_time"])
-            end_minutes = time_to_minutes(period["end_time"])
-            if start_minutes is not None and end_minutes is not None:
-                for i, minute in enumerate(minutes_in_day):
-                    if start_minutes <= minute < end_minutes:
-                        is_work_minute[i] = True
-        
-        df = pd.DataFrame({
-            "minute": minutes_in_day,
-            "hour": [m / 60 for m in minutes_in_day],
-            "is_work": is_work_minute,
-            "status": [get_text("work_time") if w else get_text("non_work_time") for w in is_work_minute]
-        })
+    # 片段单独重跑时单独记录一次运行；在整页重跑中内联执行时计入整页运行
+    owns_run = is_fragment_rerun()
+    if owns_run:
+        begin_run(current_session_id(), "fragment")
+    
+    live_col, status_col = st.columns([2, 1])
+    
+    # 片段单独重跑时不经过主脚本，在这里取本次刷新的快照
+    clock = refresh_clock()
+    tracking = st.session_state.tracking
+    
+    # 里程碑提醒：只取出堆顶已到期的事件
+    with section("milestones"):
+        queue = milestone_queue(clock)
+        if queue is not None:
+            for event in queue.due(clock.epoch)[-MAX_MILESTONE_TOASTS:]:
+                icon, text = milestone_text(event)
+                st.toast(text, icon=icon)
+    
+    with live_col:
+        current_time_obj = clock.local
+        st.markdown(f"### {get_text('current_time')}: {current_time_obj.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        current_time_obj = get_current_time()
-        current_minute = current_time_obj.hour * 60 + current_time_obj.minute
-        current_hour_decimal = current_minute / 60
+        st.markdown(f"### {get_text('work_periods_today')}")
         
-        chart = alt.Chart(df).mark_bar().encode(
-            x=alt.X('hour:Q', title=get_text('hours'), axis=alt.Axis(labelAngle=0)),
-            y=alt.Y('count():Q', title=None, axis=None),
-            color=alt.Color('status:N', 
-                          scale=alt.Scale(domain=[get_text('work_time'), get_text('non_work_time')],
-                                         range=['#4361ee', '#e9ecef']),
-                          legend=alt.Legend(title=get_text("status"))),
-            tooltip=['hour:Q', 'status:N']
-        ).properties(
-            width=600,
-            height=100
-        )
+        # 时间轴和仪表盘按日程配置缓存，每次刷新只更新当前时间红线和进度数值
+        with section("timeline_chart"):
+            charts = get_timeline_charts(
+                tracking.schedule_on(clock.local.date()),
+                st.session_state.language,
+                st.session_state.timezone,
+                TEXTS[st.session_state.language],
+            )
+            
+            current_hour_decimal = clock.minute_of_day() / 60
+            
+            st.vega_lite_chart(charts.timeline_spec_at(current_hour_decimal), use_container_width=True)
         
-        current_time_indicator = alt.Chart(pd.DataFrame({'hour': [current_hour_decimal]})).mark_rule(
-            color='red',
-            strokeWidth=2
-        ).encode(
-            x='hour:Q'
-        )
+        # 有其他收入来源时，仪表盘、计数器、目标和工作状态都按所有来源合并后的收入曲线计算
+        combined = current_combined(tracking, clock.epoch)
+        daily_salary = total_daily_salary(tracking)
         
-        st.altair_chart(chart + current_time_indicator, use_container_width=True)
+        with section("gauge"):
+            # 计算已赚取的金额
+            earned_money = combined.day_earned(clock.epoch) if combined is not None else calculate_earned_money()
+            progress = (earned_money / daily_salary) * 100 if daily_salary > 0 else 0
+            
+            # 收入进度显示
+            st.markdown(f"### {get_text('income_progress')}")
+            
+            charts.render_gauge(progress, lambda fig: st.plotly_chart(fig, use_container_width=True))
         
-        # 计算已赚取的金额
-        earned_money = calculate_earned_money()
-        progress = (earned_money / st.session_state.daily_salary) * 100 if st.session_state.daily_salary > 0 else 0
+        save_today(current_time_obj)
         
-        # 收入进度显示
-        st.markdown(f"### {get_text('income_progress')}")
+        # 统计信息：由浏览器端组件按显示帧率实时更新，服务端只在配置变化时重新发送参数
+        with section("stat_cards"):
+            st.markdown(f"### {get_text('detailed_stats')}")
+            calendar = current_calendar(current_time_obj)
+            money_ticker(
+                calendar if combined is None else combined,
+                daily_salary,
+                {
+                    "earned_amount": get_text("earned_amount"),
+                    "time_per_dollar": get_text("time_per_dollar"),
+                    "minutes": get_text("minutes"),
+                    "seconds": get_text("seconds"),
+                    "hours": get_text("hours"),
+                    "off_duty": get_text("off_duty"),
+                    "progress_today": get_text("progress_today"),
+                },
+            )
         
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=progress,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': get_text("progress"), 'font': {'size': 24}},
-            delta={'reference': 0, 'increasing': {'color': "#4361ee"}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': "#FFD700"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [0, 25], 'color': '#f8f9fa'},
-                    {'range': [25, 50], 'color': '#e9ecef'},
-                    {'range': [50, 75], 'color': '#dee2e6'},
-                    {'range': [75, 100], 'color': '#ced4da'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 100
-                }
-            }
-        ))
+        # 各来源今天的收入、工时和当前时薪：每个来源在自己的日历上各查一次
+        if combined is not None:
+            with section("stream_breakdown"):
+                st.markdown(f"#### {get_text('stream_breakdown')}")
+                rows = [
+                    f"| {get_text('stream_col')} | {get_text('stream_earned')} | {get_text('stream_hours')} | {get_text('stream_rate')} |",
+                    "|---|---:|---:|---:|",
+                ]
+                for stream, (_, work_seconds, earned, rate) in zip(all_streams(tracking), combined.breakdown(clock.epoch)):
+                    name = stream.name.replace("|", "\\|")
+                    rows.append(f"| {name} | ${earned:.2f} | {work_seconds / 3600:.2f} | ${rate * 3600:.2f}/{get_text('hours')} |")
+                rows.append(f"| **{get_text('combined_total')}** | **${earned_money:.2f}** | | "
+                            f"**${combined.rate_at(clock.epoch) * 3600:.2f}/{get_text('hours')}** |")
+                st.markdown("\n".join(rows))
         
-        fig.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=50, b=20),
-        )
+        # 收入目标：在编译日历的累计收入上反查达成时刻，随实时区域一起刷新
+        if st.session_state.goals:
+            with section("goals"):
+                st.markdown(f"#### {get_text('goals')}")
+                for name, amount, status in goal_statuses(tracking, clock):
+                    st.markdown(f"**{name}** · ${amount:.2f} — {status}")
+    
+    with status_col, section("status_panel"):
+        st.markdown(f"### {get_text('realtime_info')}")
         
-        st.plotly_chart(fig, use_container_width=True)
+        # 检查当前是否在工作时间
+        is_currently_working = (calendar if combined is None else combined).is_working_at(clock.epoch)
         
-        # 统计信息
-        st.markdown(f"### {get_text('detailed_stats')}")
-        stats_cols = st.columns(3)
+        if is_currently_working:
+            st.success(get_text("is_work_time"))
+        else:
+            st.warning(get_text("not_work_time"))
         
-        with stats_cols[0]:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-label">{get_text('earned_amount')}</div>
-                <div class="stat-value" style="color: #FF5722;">$%.2f</div>
-            </div>
-            """ % earned_money, unsafe_allow_html=True)
+        if queue is not None and queue.next_moment() is not None:
+            next_alert = datetime.fromtimestamp(queue.next_moment(), get_timezone(st.session_state.timezone))
+            time_format = "%H:%M:%S" if next_alert.date() == clock.local.date() else "%Y-%m-%d %H:%M"
+            st.caption(get_text("next_milestone").format(time=next_alert.strftime(time_format)))
         
-        with stats_cols[1]:
-            if st.session_state.seconds_per_dollar > 0:
-                minutes = int(st.session_state.seconds_per_dollar // 60)
-                seconds = int(st.session_state.seconds_per_dollar % 60)
-                st.markdown(f"""
-                <div class="stat-card">
-                    <div class="stat-label">{get_text('time_per_dollar')}</div>
-                    <div class="stat-value" style="color: #2196F3;">{minutes}{get_text('minutes')}{seconds}{get_text('seconds')}</div>
-                </div>
-                """, unsafe_allow_html=True)
+        # 带薪休息：按钮只触发本区域的重跑
+        st.markdown(f"### {get_text('paid_breaks')}")
+        break_log = tracking.break_log
+        # 只计算当前工作日（与收入计数器相同的起算点）内的休息
+        break_earnings = break_log.earned_by_category(calendar.day_anchor(clock.epoch)[0], clock.epoch, calendar)
+        for category in BREAK_CATEGORIES:
+            is_open = break_log.is_open(category)
+            break_col, amount_col = st.columns([3, 2])
+            break_col.button(
+                f"{get_text('break_' + category)} · {get_text('stop_break' if is_open else 'start_break')}",
+                key=f"break_{category}",
+                type="primary" if is_open else "secondary",
+                on_click=toggle_break,
+                args=(category,),
+                use_container_width=True,
+            )
+            amount_col.markdown(f"**${break_earnings[category]:.2f}**")
+        st.markdown(f"{get_text('break_total')}: **${sum(break_earnings.values()):.2f}**")
+    
+    if owns_run:
+        end_run(st.session_state)
+
+# 主内容区
+if is_running():
+    render_live_panel()
+
+col1, col2 = st.columns([2, 1])
+
+with col1, section("setup_panel"):
+    if not is_running():
+        # 当前时间
+        current_time = get_current_time().strftime("%Y-%m-%d %H:%M:%S")
+        st.markdown(f"### {get_text('current_time')}: {current_time}")
         
-        with stats_cols[2]:
-            st.markdown(f"""
-            <div class="stat-card">
-                <div class="stat-label">{get_text('progress_today')}</div>
-                <div class="stat-value" style="color: #4CAF50;">%.2f%%</div>
-            </div>
-            """ % progress, unsafe_allow_html=True)
-    else:
         st.info(get_text("setup_prompt"))
         
         # 工作时间段预览
@@ -701,7 +986,7 @@ with col1:
             start_minutes = time_to_minutes(period["start_time"])
             end_minutes = time_to_minutes(period["end_time"])
             if start_minutes is not None and end_minutes is not None:
-                duration_minutes = end_minutes - start_minutes
+                duration_minutes = (end_minutes - start_minutes) % (24 * 60)
                 duration_hours = duration_minutes // 60
                 duration_mins = duration_minutes % 60
                 
@@ -712,45 +997,27 @@ with col1:
                 </div>
                 """, unsafe_allow_html=True)
         
-        # 计算总工作时间
-        total_minutes = sum(
-            time_to_minutes(period["end_time"]) - time_to_minutes(period["start_time"])
-            for period in st.session_state.work_periods
-            if time_to_minutes(period["start_time"]) is not None and time_to_minutes(period["end_time"]) is not None
-        )
+        # 计算总工作时间（重叠的时间段只计算一次）
+        total_minutes = compile_schedule(st.session_state.work_periods).total_seconds // 60
         total_hours = total_minutes // 60
         total_mins = total_minutes % 60
         st.markdown(f"**{get_text('total_work_time')}**: {total_hours}{get_text('hours')}{total_mins}{get_text('minutes')}")
-
-with col2:
-    if st.session_state.is_running:
-        st.markdown(f"### {get_text('realtime_info')}")
-        
-        # 检查当前是否在工作时间
-        now = get_current_time()
-        current_minute = now.hour * 60 + now.minute
-        is_currently_working = False
-        
-        for period in st.session_state.work_periods:
-            start_minutes = time_to_minutes(period["start_time"])
-            end_minutes = time_to_minutes(period["end_time"])
-            if start_minutes is not None and end_minutes is not None:
-                if start_minutes <= current_minute < end_minutes:
-                    is_currently_working = True
-                    break
         
-        if is_currently_working:
-            st.success(get_text("is_work_time"))
-        else:
-            st.warning(get_text("not_work_time"))
-        
-        # 显示工作时间详情
+        # 单独设置了时间段的星期几
+        for weekday, periods in sorted(current_overrides().items()):
+            st.markdown(f"**{get_text('weekday_names')[weekday]}**: {format_periods(periods)}")
+
+with col2, section("detail_panel"):
+    if is_running():
+        # 显示工作时间详情；今天是休息日（或节假日、请假）时先注明，与时间轴和计薪一致
         st.markdown(f"### {get_text('work_time_details')}")
+        if not st.session_state.tracking.schedule_on(get_current_time().date()).total_seconds:
+            st.info(get_text("rest_day_today"))
         for i, period in enumerate(st.session_state.work_periods):
             start_minutes = time_to_minutes(period["start_time"])
             end_minutes = time_to_minutes(period["end_time"])
             if start_minutes is not None and end_minutes is not None:
-                duration_minutes = end_minutes - start_minutes
+                duration_minutes = (end_minutes - start_minutes) % (24 * 60)
                 duration_hours = duration_minutes // 60
                 duration_mins = duration_minutes % 60
                 
@@ -761,18 +1028,19 @@ with col2:
                 </div>
                 """, unsafe_allow_html=True)
         
+        # 单独设置了时间段的星期几
+        for weekday, periods in sorted(st.session_state.tracking.overrides.items()):
+            st.markdown(f"**{get_text('weekday_names')[weekday]}**: {format_periods(periods)}")
+        
         # 显示薪资信息
         st.markdown(f"### {get_text('salary_info')}")
-        total_minutes = sum(
-            time_to_minutes(period["end_time"]) - time_to_minutes(period["start_time"])
-            for period in st.session_state.work_periods
-            if time_to_minutes(period["start_time"]) is not None and time_to_minutes(period["end_time"]) is not None
-        )
+        # 当天的基础时薪（不含倍率档位），当天不上班时不显示
+        base_rate = st.session_state.tracking.weekly.base_rate(get_current_time().date())
         
         st.markdown(f"**{get_text('daily_salary_info')}**: ${st.session_state.daily_salary:.2f}")
-        if total_minutes > 0:
-            st.markdown(f"**{get_text('hourly_salary')}**: ${st.session_state.daily_salary / (total_minutes / 60):.2f}/{get_text('hours')}")
-            st.markdown(f"**{get_text('minute_salary')}**: ${st.session_state.daily_salary / total_minutes:.4f}/{get_text('minutes')}")
+        if base_rate > 0:
+            st.markdown(f"**{get_text('hourly_salary')}**: ${base_rate * 3600:.2f}/{get_text('hours')}")
+            st.markdown(f"**{get_text('minute_salary')}**: ${base_rate * 60:.4f}/{get_text('minutes')}")
     else:
         st.markdown(f"### {get_text('app_description')}")
         st.markdown(f"""
@@ -791,4 +1059,79 @@ with col2:
         {get_text('step_2')}
         {get_text('step_3')}
         {get_text('step_4')}
-        """)
\ No newline at end of file
+        """)
+# 月度/季度/年度统计（打开开关后才加载 pandas 并读取历史）
+st.markdown(f"### {get_text('period_stats')}")
+if st.toggle(get_text("show_period_stats"), key="show_period_stats"):
+    fingerprint = get_history_store().fingerprint(st.session_state.profile)
+    if fingerprint[0] == 0:
+        st.info(get_text("no_history"))
+    else:
+        granularity = st.radio(
+            get_text("granularity"),
+            options=["month", "quarter", "year"],
+            format_func=lambda g: get_text(f"granularity_{g}"),
+            horizontal=True,
+        )
+        summary = load_period_stats(st.session_state.profile, fingerprint, granularity)
+        latest = summary.iloc[-1]
+        
+        metric_cols = st.columns(4)
+        metric_cols[0].metric(get_text("total_earned"), f"${latest['earned']:.2f}",
+                              None if math.isnan(latest["change_pct"]) else f"{latest['change_pct']:.1f}%")
+        metric_cols[1].metric(get_text("hours_worked"), f"{latest['hours']:.1f}")
+        metric_cols[2].metric(get_text("effective_hourly_rate"),
+                              "-" if math.isnan(latest["hourly_rate"]) else f"${latest['hourly_rate']:.2f}")
+        metric_cols[3].metric(get_text("days_tracked"), int(latest["days"]))
+        
+        st.markdown(f"#### {get_text('earnings_trend')}")
+        st.line_chart(summary["earned"].rename(get_text("total_earned")))
+        
+        table = summary.rename(columns={
+            "days": get_text("days_tracked"),
+            "earned": get_text("total_earned"),
+            "hours": get_text("hours_worked"),
+            "hourly_rate": get_text("effective_hourly_rate"),
+            "best_day": get_text("best_day"),
+            "best_earned": get_text("best_earned"),
+            "worst_day": get_text("worst_day"),
+            "worst_earned": get_text("worst_earned"),
+            "change_pct": get_text("change_pct"),
+        })
+        table.index.name = get_text("period_col")
+        st.dataframe(table.iloc[::-1], use_container_width=True)
+
+# 工作日历：按当前设置（含节假日、调休和请假）预计本月/本季度/本年及任意日期范围的工作日、工时和收入
+st.markdown(f"### {get_text('work_calendar')}")
+if st.toggle(get_text("show_work_calendar"), key="show_work_calendar"):
+    workday_calendar = get_workday_calendar(current_weekly())
+    today = get_current_time().date()
+    
+    for column, (label, first, last) in zip(st.columns(3), period_bounds(today)):
+        days, seconds, earned = workday_calendar.expected_between(first, last)
+        column.metric(label, f"${earned:,.2f}")
+        column.caption(f"{days} {get_text('workday_count')} · {seconds / 3600:.1f} {get_text('hours')}")
+    
+    month_first, month_last = period_bounds(today)[0][1:]
+    date_range = st.date_input(get_text("calendar_range"), value=(month_first, month_last), key="calendar_range")
+    if len(date_range) == 2:
+        first, last = date_range
+        days, seconds, earned = workday_calendar.expected_between(first, last)
+        metric_cols = st.columns(3)
+        metric_cols[0].metric(get_text("workday_count"), days)
+        metric_cols[1].metric(get_text("expected_hours"), f"{seconds / 3600:.1f}")
+        metric_cols[2].metric(get_text("expected_earnings"), f"${earned:,.2f}")
+        
+        # 范围内的节假日、请假和调休上班日
+        holidays = workday_calendar.weekly.holidays
+        if holidays is not None:
+            special_days = holidays.between(first, last)
+            for kind in ("holiday", "leave", "makeup"):
+                labels = [f"{day:%m-%d} {name}".rstrip() for day, day_kind, name in special_days if day_kind == kind]
+                if labels:
+                    st.markdown(f"**{get_text('holiday_kind_' + kind)}**: " + ", ".join(labels))
+
+# 结束本次运行的性能记录，开启分析时在侧边栏显示浮层
+profiler_run = end_run(st.session_state)
+if PROFILE_ENABLED:
+    render_profiler_overlay(profiler_run)
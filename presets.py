@@ -0,0 +1,46 @@
+# 预设工作时间模板：网页界面和终端模式共用，不依赖 Streamlit
+from datetime import time as dt_time
+
+WORK_TIME_PRESETS = {
+    "zh": {
+        "标准工作日 (9-18)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(18, 0))],
+        "早班 (8-17)": [(dt_time(8, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(17, 0))],
+        "晚班 (10-19)": [(dt_time(10, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(19, 0))],
+        "弹性工作 (9-17)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(14, 0), dt_time(17, 0))],
+        "连续工作 (9-18)": [(dt_time(9, 0), dt_time(18, 0))],
+        "半天工作 (9-13)": [(dt_time(9, 0), dt_time(13, 0))],
+        "自定义": []
+    },
+    "en": {
+        "Standard (9-18)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(18, 0))],
+        "Early Shift (8-17)": [(dt_time(8, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(17, 0))],
+        "Late Shift (10-19)": [(dt_time(10, 0), dt_time(12, 0)), (dt_time(13, 0), dt_time(19, 0))],
+        "Flexible (9-17)": [(dt_time(9, 0), dt_time(12, 0)), (dt_time(14, 0), dt_time(17, 0))],
+        "Continuous (9-18)": [(dt_time(9, 0), dt_time(18, 0))],
+        "Half Day (9-13)": [(dt_time(9, 0), dt_time(13, 0))],
+        "Custom": []
+    }
+}
+
+
+# 每个预设的工作时间段（字典组成的元组）：导入时构建一次，所有会话和调用方共享同一份，不得原地修改
+PRESET_PERIODS = {
+    template_name: tuple({"start_time": start, "end_time": end} for start, end in periods)
+    for presets in WORK_TIME_PRESETS.values()
+    for template_name, periods in presets.items()
+}
+
+# 新会话的默认工作时间段：上午9:00-12:00，下午14:00-18:00
+DEFAULT_WORK_PERIODS = (
+    {"start_time": dt_time(9, 0), "end_time": dt_time(12, 0)},
+    {"start_time": dt_time(14, 0), "end_time": dt_time(18, 0)},
+)
+
+
+# 按名称查找预设（任意语言的名称均可，不区分大小写），返回共享的工作时间段元组；找不到或为“自定义”时返回 None
+def find_preset(name):
+    wanted = name.strip().lower()
+    for template_name, periods in PRESET_PERIODS.items():
+        if template_name.lower() == wanted and periods:
+            return periods
+    return None
@@ -0,0 +1,233 @@
+# 渲染性能分析（默认关闭，设置环境变量 MONEYTRACKER_PROFILE=1 开启）：
+# 按区域记录每次运行的耗时、每个会话的运行次数和 session_state 大小，
+# 并定期导出为 Prometheus 文本格式和 JSON 文件。关闭时 section() 只返回一个共享的空上下文
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+PROFILE_ENABLED = os.environ.get("MONEYTRACKER_PROFILE", "") not in ("", "0")
+METRICS_PATH = os.environ.get(
+    "MONEYTRACKER_METRICS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "moneytracker_metrics.prom"),
+)
+
+# 直方图桶上限（秒）
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+METRICS_WRITE_INTERVAL = 5
+MAX_TRACKED_SESSIONS = 1000
+
+_NULL_SECTION = contextlib.nullcontext()
+_local = threading.local()
+
+
+# 一个区域（或一类运行）的耗时统计
+class TimingStats:
+    __slots__ = ("count", "total", "max", "last", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.buckets = [0] * len(SECONDS_BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        for index, bound in enumerate(SECONDS_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+            "last_seconds": self.last,
+        }
+
+
+class _Section:
+    __slots__ = ("run", "name", "started")
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.run.sections[self.name] = self.run.sections.get(self.name, 0.0) + elapsed
+        return False
+
+
+# 一次运行（整页重跑或片段重跑）内各区域的耗时
+class RunRecorder:
+    __slots__ = ("session_id", "kind", "started", "sections")
+
+    def __init__(self, session_id, kind):
+        self.session_id = session_id
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.sections = {}
+
+    def section(self, name):
+        return _Section(self, name)
+
+
+# 近似估算对象占用的内存：递归累加容器和 __slots__ 对象的 sys.getsizeof，共享对象只计一次
+def estimate_size(obj, seen=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif not isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        for name in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, name):
+                size += estimate_size(getattr(obj, name), seen)
+        if hasattr(obj, "__dict__"):
+            size += estimate_size(vars(obj), seen)
+    return size
+
+
+# 进程内汇总的指标
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sections = {}
+        self.runs = {}
+        self.sessions = OrderedDict()
+        self._write_lock = threading.Lock()
+        self._last_written = 0.0
+
+    def record_run(self, run, total_seconds, state_bytes):
+        with self._lock:
+            for name, seconds in run.sections.items():
+                self.sections.setdefault(name, TimingStats()).observe(seconds)
+            self.runs.setdefault(run.kind, TimingStats()).observe(total_seconds)
+            session = self.sessions.pop(run.session_id, None) or {"runs": {}, "state_bytes": 0}
+            session["runs"][run.kind] = session["runs"].get(run.kind, 0) + 1
+            session["state_bytes"] = state_bytes
+            self.sessions[run.session_id] = session
+            while len(self.sessions) > MAX_TRACKED_SESSIONS:
+                self.sessions.popitem(last=False)
+
+    def session(self, session_id):
+        with self._lock:
+            session = self.sessions.get(session_id)
+            return {"runs": dict(session["runs"]), "state_bytes": session["state_bytes"]} if session else None
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "sections": {name: stats.as_dict() for name, stats in self.sections.items()},
+                "runs": {kind: stats.as_dict() for kind, stats in self.runs.items()},
+                "sessions": {
+                    session_id: {"runs": dict(session["runs"]), "state_bytes": session["state_bytes"]}
+                    for session_id, session in self.sessions.items()
+                },
+            }
+
+    def prometheus_text(self):
+        lines = []
+        with self._lock:
+            for metric, label, table, help_text in (
+                ("moneytracker_section_seconds", "section", self.sections, "Time spent rendering each section"),
+                ("moneytracker_run_seconds", "kind", self.runs, "Total time of a script or fragment run"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, stats in table.items():
+                    for bound, count in zip(SECONDS_BUCKETS, stats.buckets):
+                        lines.append(f'{metric}_bucket{{{label}="{name}",le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{label}="{name}",le="+Inf"}} {stats.count}')
+                    lines.append(f'{metric}_sum{{{label}="{name}"}} {stats.total}')
+                    lines.append(f'{metric}_count{{{label}="{name}"}} {stats.count}')
+
+            lines.append("# HELP moneytracker_sessions Sessions tracked by this process")
+            lines.append("# TYPE moneytracker_sessions gauge")
+            lines.append(f"moneytracker_sessions {len(self.sessions)}")
+            lines.append("# HELP moneytracker_session_runs_total Script and fragment runs per session")
+            lines.append("# TYPE moneytracker_session_runs_total counter")
+            for session_id, session in self.sessions.items():
+                for kind, count in session["runs"].items():
+                    lines.append(f'moneytracker_session_runs_total{{session="{session_id}",kind="{kind}"}} {count}')
+            lines.append("# HELP moneytracker_session_state_bytes Approximate session_state size after the last run")
+            lines.append("# TYPE moneytracker_session_state_bytes gauge")
+            for session_id, session in self.sessions.items():
+                lines.append(f'moneytracker_session_state_bytes{{session="{session_id}"}} {session["state_bytes"]}')
+        return "\n".join(lines) + "\n"
+
+    # 写出 Prometheus 文本和同名 .json 文件（先写临时文件再替换，抓取方不会读到半个文件）；
+    # 按间隔节流，其他会话正在写出时直接跳过
+    def write(self, path=METRICS_PATH, force=False):
+        if not self._write_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            if not force and now - self._last_written < METRICS_WRITE_INTERVAL:
+                return
+            self._last_written = now
+            for target, content in (
+                (path, self.prometheus_text()),
+                (os.path.splitext(path)[0] + ".json", json.dumps(self.as_dict(), indent=2)),
+            ):
+                temporary = target + ".tmp"
+                with open(temporary, "w") as output:
+                    output.write(content)
+                os.replace(temporary, target)
+        finally:
+            self._write_lock.release()
+
+
+metrics = Metrics()
+
+# 进程退出时补写最后一次（节流间隔内的）数据
+if PROFILE_ENABLED:
+    atexit.register(metrics.write, METRICS_PATH, True)
+
+
+# 开始记录一次运行；上一次运行若被 st.rerun() 等中断而未结束，直接丢弃
+def begin_run(session_id, kind):
+    if PROFILE_ENABLED:
+        _local.run = RunRecorder(session_id, kind)
+
+
+# 计时一个区域；未开启或不在运行中时返回共享的空上下文
+def section(name):
+    if not PROFILE_ENABLED:
+        return _NULL_SECTION
+    run = getattr(_local, "run", None)
+    if run is None:
+        return _NULL_SECTION
+    return run.section(name)
+
+
+# 结束当前运行：汇总耗时和 session_state 大小并按间隔导出，返回本次运行的记录
+def end_run(session_state):
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    total = time.perf_counter() - run.started
+    metrics.record_run(run, total, estimate_size(dict(session_state)))
+    metrics.write()
+    return run
@@ -0,0 +1,62 @@
+# 计薪倍率档位（加班、夜班、周末等）：每个档位是某些星期几的一个本地时间窗口和相对基础时薪的倍数。
+# 档位在周排班里预先切分到每个星期几的班次上，编译日历时每一段只带一个固定的每秒收入，
+# 累计收入仍是分段线性的前缀积分，任意时刻的查询依然是一次二分查找加一次插值
+from engine import SECONDS_PER_DAY, time_to_seconds
+
+WEEKEND_DAYS = (5, 6)
+
+
+# 一个档位：(生效的星期几, 开始秒, 结束秒, 倍数)。星期几指窗口开始的那天；
+# 结束不晚于开始表示跨越午夜到次日结束，两者相等表示整天
+def make_tier(weekdays, start_time, end_time, multiplier):
+    if multiplier <= 0:
+        raise ValueError("rate multiplier must be positive")
+    return (tuple(sorted(set(weekdays))), time_to_seconds(start_time), time_to_seconds(end_time), float(multiplier))
+
+
+# 档位排序去重并去掉倍数为 1 的档位，作为周排班缓存键的一部分
+def normalize_tiers(tiers):
+    return tuple(sorted(set(tier for tier in tiers if tier[3] != 1.0 and tier[0])))
+
+
+# 档位在以 day 为 0 点的本地秒数坐标下覆盖的窗口；day_weekday 为 day 是星期几。
+# 班次最多延续到次日，因此看前一天（跨午夜的窗口）、当天和次日
+def _tier_windows(day_weekday, tiers):
+    windows = []
+    for weekdays, start, end, multiplier in tiers:
+        length = (end - start) % SECONDS_PER_DAY or SECONDS_PER_DAY
+        for offset in (-1, 0, 1):
+            if (day_weekday + offset) % 7 in weekdays:
+                window_start = offset * SECONDS_PER_DAY + start
+                windows.append((window_start, window_start + length, multiplier))
+    return windows
+
+
+# 计算基础时薪所用的工作秒数：pieces 中不在任何档位内（倍数为 1）的部分；
+# 整天都落在档位内时（如周末全天加倍），以全部工作秒数为准
+def base_seconds(pieces):
+    seconds = sum(end - start for start, end, multiplier in pieces if multiplier == 1.0)
+    return seconds or sum(end - start for start, end, _ in pieces)
+
+
+# 按档位切分某个星期几的班次，返回 (开始秒, 结束秒, 倍数) 列表；多个档位重叠时取最大的倍数
+def price_shifts(day_weekday, shifts, tiers):
+    if not tiers:
+        return tuple((start, end, 1.0) for start, end in shifts)
+    windows = _tier_windows(day_weekday, tiers)
+    pieces = []
+    for start, end in shifts:
+        cuts = sorted({start, end} | {
+            edge for window_start, window_end, _ in windows
+            for edge in (window_start, window_end) if start < edge < end
+        })
+        for piece_start, piece_end in zip(cuts, cuts[1:]):
+            multiplier = max(
+                (m for window_start, window_end, m in windows if window_start <= piece_start and piece_end <= window_end),
+                default=1.0,
+            )
+            if pieces and pieces[-1][1] == piece_start and pieces[-1][2] == multiplier:
+                pieces[-1] = (pieces[-1][0], piece_end, multiplier)
+            else:
+                pieces.append((piece_start, piece_end, multiplier))
+    return tuple(pieces)
@@ -0,0 +1,19 @@
+# 月度/季度/年度统计：直接由历史存储增量维护的汇总行组成统计表，不读取每日记录
+import pandas as pd
+
+
+# 历史存储的汇总行（HistoryStore.rollups，含各周期的最佳/最差日）组成统计表：
+# 天数、总收入、工时、实际时薪、最佳/最差日以及环比变化
+def summarize_rollups(rollups):
+    summary = pd.DataFrame.from_records(rollups, columns=[
+        "period", "days", "earned", "work_seconds", "best_day", "best_earned", "worst_day", "worst_earned",
+    ]).set_index("period")
+    summary["hours"] = summary["work_seconds"] / 3600
+    summary["hourly_rate"] = summary["earned"] / summary["hours"].where(summary["hours"] > 0)
+    summary = summary[["days", "earned", "work_seconds", "hours", "hourly_rate",
+                       "best_day", "best_earned", "worst_day", "worst_earned"]]
+    for column in ("best_day", "worst_day"):
+        summary[column] = pd.to_datetime(summary[column])
+
+    summary["change_pct"] = summary["earned"].pct_change() * 100
+    return summary.drop(columns="work_seconds")
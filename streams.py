@@ -0,0 +1,111 @@
+# 多个收入来源（例如正职加兼职）：每个来源有自己的日薪、工作时间段、工作日和时区，各自编译为日历。
+# 各日历的分段边界都已按时刻排序，用堆做 k 路归并后扫描一遍即得到合计的累计收入曲线；
+# 合计收入、当前合计时薪和目标反查都是在合并曲线上的一次二分查找，各来源的明细则是在各自日历上各查一次
+import heapq
+from datetime import datetime
+from operator import itemgetter
+
+from lru import LRUCache
+from weekly import PayCurve, WeeklySchedule, earn_across_windows, get_calendar
+
+COMBINED_CACHE_SIZE = 128
+
+
+# "09:00-12:00, 13:00-18:00" 解析为工作时间段元组；结束早于开始表示到次日结束，格式不对时抛出 ValueError
+def parse_periods(text):
+    periods = []
+    for part in text.replace("，", ",").split(","):
+        if not part.strip():
+            continue
+        start, end = (datetime.strptime(value.strip(), "%H:%M").time() for value in part.split("-"))
+        if start == end:
+            raise ValueError(f"empty period {part.strip()!r}")
+        periods.append({"start_time": start, "end_time": end})
+    if not periods:
+        raise ValueError("no work periods")
+    return tuple(periods)
+
+
+# 工作时间段格式化为 "09:00-12:00, 13:00-18:00"（parse_periods 的逆操作）
+def format_periods(periods):
+    return ", ".join(f"{period['start_time']:%H:%M}-{period['end_time']:%H:%M}" for period in periods)
+
+
+# 一个收入来源：名称、周排班和时区
+class IncomeStream:
+    __slots__ = ("name", "weekly", "timezone")
+
+    def __init__(self, name, weekly, timezone):
+        self.name = name
+        self.weekly = weekly
+        self.timezone = timezone
+
+    # 从侧边栏保存的定义创建：{"name", "daily_salary", "timezone", "periods", "workdays"}
+    @classmethod
+    def from_definition(cls, definition):
+        weekly = WeeklySchedule.from_periods(definition["periods"], definition["workdays"], definition["daily_salary"])
+        return cls(definition["name"], weekly, definition["timezone"])
+
+    def key(self):
+        return (self.weekly.key(), self.timezone)
+
+
+# 一个日历的分段边界 (时刻, 每秒收入变化, 进行中的分段数变化)：各分段互不重叠，依次产出即按时刻有序
+def _boundaries(calendar):
+    for start, end, slope in zip(calendar.starts, calendar.ends, calendar.slopes):
+        yield start, slope, 1
+        yield end, -slope, -1
+
+
+# 多个来源的合计收入曲线。calendars 与来源一一对应，均覆盖同一时刻；合并曲线只在各日历窗口的交集
+# [window_start, window_end) 内完整。各日历的累计收入都从自己的第一个分段起算，合并曲线同样从 0 起算，
+# 因此任意时刻的合计累计收入正好是各日历累计收入之和
+class CombinedCalendar(PayCurve):
+    __slots__ = ("calendars", "window_start", "window_end")
+
+    def __init__(self, calendars):
+        self.calendars = calendars
+        self.window_start = max(calendar.window_start for calendar in calendars)
+        self.window_end = min(calendar.window_end for calendar in calendars)
+        self._sweep(heapq.merge(*(_boundaries(calendar) for calendar in calendars), key=itemgetter(0)))
+
+    # 各来源在 moment 所属工作日的 (日期, 已工作秒数, 已赚取金额, 当前每秒收入)，顺序与来源一致
+    def breakdown(self, moment):
+        return [(*calendar.day_totals(moment), calendar.rate_at(moment)) for calendar in self.calendars]
+
+    # 各来源当前工作日的收入之和
+    def day_earned(self, moment):
+        return sum(calendar.day_totals(moment)[2] for calendar in self.calendars)
+
+    # 任一来源的工作日起算点变化的时刻及此时各来源起算点累计收入之和，供浏览器端计数器按合计收入归零
+    def anchor_points(self):
+        moments = heapq.merge(*([moment for moment, _ in calendar.anchor_points()] for calendar in self.calendars))
+        points = []
+        for moment in moments:
+            if not self.window_start <= moment <= self.window_end or (points and points[-1][0] == moment):
+                continue
+            points.append((moment, sum(calendar.pay_at(calendar.day_anchor(moment)[0]) for calendar in self.calendars)))
+        if not points or points[0][0] > self.window_start:
+            start = self.window_start
+            points.insert(0, (start, sum(calendar.pay_at(calendar.day_anchor(start)[0]) for calendar in self.calendars)))
+        return points
+
+
+_combined_cache = LRUCache(COMBINED_CACHE_SIZE)
+
+
+# 覆盖 moment 的合计收入曲线：按各来源的排班、时区和日历窗口在会话间共享（来源名称不影响曲线）
+def get_combined_calendar(streams, moment):
+    calendars = tuple(get_calendar(stream.weekly, stream.timezone, moment) for stream in streams)
+    key = tuple((stream.key(), calendar.first_day) for stream, calendar in zip(streams, calendars))
+    return _combined_cache.get_or_create(key, lambda: CombinedCalendar(calendars))
+
+
+# 各来源当前工作日的收入之和达到 amount 的时刻；已经达到时返回 (True, 当前时刻)，一年内达不到时时刻为 None
+def combined_goal_eta(streams, moment, amount):
+    earned = get_combined_calendar(streams, moment).day_earned(moment)
+    if earned >= amount:
+        return True, moment
+    if not any(stream.weekly.daily_salary > 0 and stream.weekly.regular for stream in streams):
+        return False, None
+    return False, earn_across_windows(lambda at: get_combined_calendar(streams, at), moment, amount - earned)
@@ -0,0 +1,211 @@
+# 终端/守护进程模式：不启动 Streamlit 服务，直接用同一套收入日历在终端里实时显示收入。
+# 只依赖 clock / weekly / presets（不导入 Streamlit、pandas 和图表库），常驻内存很小
+#
+#   python terminal.py --timezone America/New_York --salary 300 --preset "Standard (9-18)"
+#   python terminal.py --period 22:00-06:00 --workdays 0-4 --once --json
+#   python terminal.py --workdays 0-4 --day 5=10:00-14:00 --day 2=09:00-12:00,13:00-15:00
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from clock import TIMEZONE_OPTIONS, get_timezone
+from presets import WORK_TIME_PRESETS, find_preset
+from rates import make_tier
+from weekly import ALL_WEEKDAYS, WeeklySchedule, status_at
+
+DEFAULT_REFRESH_INTERVAL = 0.2
+PROGRESS_BAR_WIDTH = 30
+
+
+# "HH:MM-HH:MM" 解析为工作时间段；结束早于开始表示到次日结束
+def parse_period(value):
+    try:
+        start, end = value.split("-")
+        return {
+            "start_time": datetime.strptime(start.strip(), "%H:%M").time(),
+            "end_time": datetime.strptime(end.strip(), "%H:%M").time(),
+        }
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid period {value!r}, expected HH:MM-HH:MM")
+
+
+# "0-4" 或 "0,2,4" 解析为工作日（0 为星期一）
+def parse_workdays(value):
+    days = set()
+    try:
+        for part in value.split(","):
+            if "-" in part:
+                first, last = part.split("-")
+                days.update(range(int(first), int(last) + 1))
+            else:
+                days.add(int(part))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid workdays {value!r}, expected e.g. 0-4 or 0,2,4")
+    if not days <= set(ALL_WEEKDAYS):
+        raise argparse.ArgumentTypeError("workdays must be between 0 (Monday) and 6 (Sunday)")
+    return tuple(sorted(days))
+
+
+# "星期几=HH:MM-HH:MM[,HH:MM-HH:MM...]" 解析为 (星期几元组, 时间段元组)，这些星期几改用各自的时间段；
+# 时间段写 off 表示当天休息，例如 5=10:00-14:00（周六只上半天）、2=off
+def parse_day(value):
+    days, _, periods = value.partition("=")
+    try:
+        weekdays = parse_workdays(days)
+        if periods.strip().lower() == "off":
+            return weekdays, ()
+        return weekdays, tuple(parse_period(period) for period in periods.split(","))
+    except argparse.ArgumentTypeError:
+        raise argparse.ArgumentTypeError(f"invalid day {value!r}, expected DAYS=HH:MM-HH:MM[,HH:MM-HH:MM...] or DAYS=off")
+
+
+# "[星期几@]HH:MM-HH:MM=倍数" 解析为计薪倍率档位，例如 18:00-00:00=1.5（每天 18 点后 1.5 倍）、
+# 5-6@00:00-00:00=2（周末整天 2 倍）
+def parse_tier(value):
+    days, _, window = value.rpartition("@")
+    try:
+        weekdays = parse_workdays(days) if days else ALL_WEEKDAYS
+        period, multiplier = window.split("=")
+        period = parse_period(period)
+        return make_tier(weekdays, period["start_time"], period["end_time"], float(multiplier))
+    except (ValueError, argparse.ArgumentTypeError):
+        raise argparse.ArgumentTypeError(f"invalid tier {value!r}, expected [DAYS@]HH:MM-HH:MM=MULTIPLIER")
+
+
+# 状态渲染为一行终端文本
+def render_line(status):
+    filled = int(min(status["progress"], 100) / 100 * PROGRESS_BAR_WIDTH)
+    bar = "█" * filled + "░" * (PROGRESS_BAR_WIDTH - filled)
+    state = "working" if status["working"] else "off"
+    return (
+        f"{status['time'][11:19]}  ${status['earned']:,.4f} / ${status['daily_salary']:,.2f}  "
+        f"[{bar}] {status['progress']:6.2f}%  {state}"
+    )
+
+
+# 里程碑事件渲染为一行提醒文本
+def render_milestone(event, timezone):
+    moment, kind, value = event
+    clock_text = datetime.fromtimestamp(moment, get_timezone(timezone)).strftime("%H:%M:%S")
+    if kind == "amount":
+        text = f"earned ${value:,.2f} today"
+    elif kind == "fraction":
+        text = f"{value * 100:.0f}% of today's salary earned"
+    elif kind == "start":
+        text = "work period started"
+    else:
+        text = "work period ended"
+    return f"{clock_text}  * {text}"
+
+
+# 持续刷新：终端上原地重绘一行，输出被重定向（守护进程/日志）时逐行追加。
+# milestones 为 MilestoneQueue 时，到期的里程碑单独输出一行（终端上附带响铃）
+def run_live(weekly, timezone, interval, stream=sys.stdout, milestones=None):
+    interactive = stream.isatty()
+    try:
+        while True:
+            started = time.time()
+            line = render_line(status_at(weekly, timezone, started))
+            for event in milestones.due(started) if milestones is not None else ():
+                notice = render_milestone(event, timezone)
+                stream.write("\r\x1b[2K" + notice + "\a\n" if interactive else notice + "\n")
+            if interactive:
+                stream.write("\r\x1b[2K" + line)
+            else:
+                stream.write(line + "\n")
+            stream.flush()
+            # 对齐到刷新间隔的整数倍，避免累积漂移
+            time.sleep(max(0.0, interval - (time.time() % interval)))
+    except KeyboardInterrupt:
+        if interactive:
+            stream.write("\n")
+
+
+def build_parser():
+    preset_names = [name for presets in WORK_TIME_PRESETS.values() for name, periods in presets.items() if periods]
+    parser = argparse.ArgumentParser(description="Money Tracker in the terminal (no Streamlit server)")
+    parser.add_argument("--timezone", default="Asia/Shanghai",
+                        help=f"IANA timezone, e.g. {', '.join(TIMEZONE_OPTIONS)}")
+    parser.add_argument("--salary", type=float, default=200.0, help="daily salary")
+    parser.add_argument("--preset", help="work time preset: " + "; ".join(preset_names))
+    parser.add_argument("--period", type=parse_period, action="append", default=[],
+                        help="custom work period HH:MM-HH:MM, repeatable (overrides --preset)")
+    parser.add_argument("--workdays", type=parse_workdays, default=ALL_WEEKDAYS,
+                        help="workdays, 0=Monday, e.g. 0-4 (default: every day)")
+    parser.add_argument("--day", type=parse_day, action="append", default=[],
+                        help="work periods for specific weekdays DAYS=HH:MM-HH:MM[,HH:MM-HH:MM...] or DAYS=off, "
+                             "repeatable, e.g. 5=10:00-14:00 (overrides --period/--preset and --workdays on those days)")
+    parser.add_argument("--tier", type=parse_tier, action="append", default=[],
+                        help="pay multiplier window [DAYS@]HH:MM-HH:MM=MULTIPLIER, repeatable, "
+                             "e.g. 18:00-00:00=1.5 or 5-6@00:00-00:00=2")
+    parser.add_argument("--holidays", action="append", default=[], metavar="FILE",
+                        help="holiday/leave file (see workdays.py), repeatable; holidays and leave days are unpaid")
+    parser.add_argument("--milestones", type=float, metavar="STEP",
+                        help="print an alert for every STEP earned, at 50%% of the daily salary "
+                             "and when a work period starts or ends")
+    parser.add_argument("--interval", type=float, default=DEFAULT_REFRESH_INTERVAL, help="refresh interval in seconds")
+    parser.add_argument("--once", action="store_true", help="print the current status once and exit")
+    parser.add_argument("--json", action="store_true", help="with --once, print the status as JSON")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        get_timezone(args.timezone)
+    except KeyError:
+        parser.error(f"unknown timezone {args.timezone!r}")
+    if args.salary <= 0:
+        parser.error("--salary must be positive")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    if args.milestones is not None and args.milestones <= 0:
+        parser.error("--milestones must be positive")
+
+    if args.period:
+        periods = args.period
+    elif args.preset:
+        periods = find_preset(args.preset)
+        if periods is None:
+            parser.error(f"unknown preset {args.preset!r}")
+    else:
+        periods = find_preset(next(iter(WORK_TIME_PRESETS["en"])))
+    overrides = {weekday: day_periods for weekdays, day_periods in args.day for weekday in weekdays}
+    day_periods = [period for weekday_periods in overrides.values() for period in weekday_periods]
+    if any(period["start_time"] == period["end_time"] for period in (*periods, *day_periods)):
+        parser.error("period end time must differ from start time")
+
+    holidays = None
+    if args.holidays:
+        # 只在需要时导入，保持默认启动的依赖最少
+        from workdays import load_holidays
+        try:
+            holidays = load_holidays(args.holidays)
+        except (OSError, ValueError) as error:
+            parser.error(f"--holidays: {error}")
+    weekly = WeeklySchedule.from_periods(periods, args.workdays, args.salary, args.tier, holidays, overrides)
+    try:
+        if args.once:
+            status = status_at(weekly, args.timezone, time.time())
+            print(json.dumps(status, ensure_ascii=False) if args.json else render_line(status))
+            sys.stdout.flush()
+            return 0
+        milestones = None
+        if args.milestones is not None:
+            from milestones import MilestoneQueue
+            milestones = MilestoneQueue(weekly, args.timezone, args.milestones, time.time())
+        run_live(weekly, args.timezone, args.interval, milestones=milestones)
+    except BrokenPipeError:
+        # 输出被管道的下游（如 head）提前关闭：安静退出，并把标准输出指向 devnull，
+        # 避免解释器退出时刷新缓冲再次报错
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
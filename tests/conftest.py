@@ -0,0 +1,5 @@
+# 测试使用临时的历史数据库，不写入仓库目录下的 moneytracker_history.db（history 模块导入时读取该环境变量）
+import os
+import tempfile
+
+os.environ["MONEYTRACKER_DB"] = os.path.join(tempfile.mkdtemp(prefix="moneytracker-tests-"), "history.db")
@@ -0,0 +1,111 @@
+# HTTP 接口的输入校验：不合法的数值、时区、时间段和工作日都回复 400，批量查询中每一项单独报错
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from api import MAX_DAILY_SALARY, MAX_MOMENT, MAX_MULTIPLIER, ApiError, dispatch, handle_connection
+
+SCHEDULE = {"daily_salary": 300, "preset": "Standard (9-18)"}
+# 2025-03-08 05:00 UTC（上海周六 13:00）
+SATURDAY = 1741410000
+
+BAD_EARNINGS = {
+    "huge at": {"schedule": SCHEDULE, "at": 1e20},
+    "nan at": {"schedule": SCHEDULE, "at": float("nan")},
+    "negative at": {"schedule": SCHEDULE, "at": -5},
+    "int at too large for a float": {"schedule": SCHEDULE, "at": 10 ** 400},
+    "boolean at": {"schedule": SCHEDULE, "at": True},
+    "numeric timezone": {"schedule": {**SCHEDULE, "timezone": 5}},
+    "list timezone": {"schedule": {**SCHEDULE, "timezone": ["x"]}},
+    "empty timezone": {"schedule": {**SCHEDULE, "timezone": ""}},
+    "infinite salary": {"schedule": {**SCHEDULE, "daily_salary": float("inf")}},
+    "nan salary": {"schedule": {**SCHEDULE, "daily_salary": float("nan")}},
+    "salary over the limit": {"schedule": {**SCHEDULE, "daily_salary": MAX_DAILY_SALARY * 2}},
+    "infinite multiplier": {"schedule": {**SCHEDULE, "tiers": [
+        {"start": "18:00", "end": "00:00", "multiplier": float("inf")},
+    ]}},
+    "numeric period end": {"schedule": {**SCHEDULE, "periods": [["09:00", 5]]}},
+    "nested workdays": {"schedule": {**SCHEDULE, "workdays": [[1]]}},
+    "weekday 7": {"schedule": {**SCHEDULE, "weekday_periods": {"7": []}}},
+    "weekday name": {"schedule": {**SCHEDULE, "weekday_periods": {"x": []}}},
+    "weekday_periods list": {"schedule": {**SCHEDULE, "weekday_periods": [1]}},
+    "weekday period without end": {"schedule": {**SCHEDULE, "weekday_periods": {"1": [["9:00"]]}}},
+    "weekday period string": {"schedule": {**SCHEDULE, "weekday_periods": {"1": "09:00-10:00"}}},
+}
+
+
+def post(path, payload):
+    return dispatch("POST", path, json.dumps(payload).encode())
+
+
+@pytest.mark.parametrize("case", list(BAD_EARNINGS))
+def test_bad_earnings_queries_are_rejected(case):
+    with pytest.raises(ApiError) as error:
+        post("/earnings", BAD_EARNINGS[case])
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize("amount", [float("nan"), float("inf"), 1e13, 0, "50"])
+def test_bad_goal_amounts_are_rejected(amount):
+    with pytest.raises(ApiError) as error:
+        post("/goal", {"schedule": SCHEDULE, "amount": amount, "at": SATURDAY})
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+def test_limits_are_accepted():
+    schedule = {**SCHEDULE, "daily_salary": MAX_DAILY_SALARY, "tiers": [
+        {"start": "17:00", "end": "00:00", "multiplier": MAX_MULTIPLIER},
+    ]}
+    status, payload = post("/earnings", {"schedule": schedule, "at": MAX_MOMENT})
+    assert status == HTTPStatus.OK
+    assert payload["at"] == MAX_MOMENT
+    status, payload = post("/earnings", {"schedule": SCHEDULE, "at": 0})
+    assert status == HTTPStatus.OK
+    assert payload["earned"] == 0
+
+
+def test_weekday_periods_override_the_default_periods():
+    schedule = {**SCHEDULE, "workdays": [0, 1, 2, 3, 4], "weekday_periods": {"5": [["10:00", "14:00"]]}}
+    status, payload = post("/earnings", {"schedule": schedule, "at": SATURDAY})
+    assert status == HTTPStatus.OK
+    assert (payload["work_day"], payload["work_seconds"]) == ("2025-03-08", 3 * 3600)
+
+
+def test_batch_reports_each_bad_query_separately():
+    status, payload = post("/batch", {"queries": [
+        {"kind": "earnings", "schedule": SCHEDULE, "at": 1e20},
+        {"kind": "earnings", "schedule": {**SCHEDULE, "timezone": ["x"]}},
+        {"kind": "goal", "schedule": SCHEDULE, "amount": float("nan")},
+        {"kind": "unknown"},
+        {"kind": "earnings", "schedule": SCHEDULE, "at": SATURDAY},
+    ]})
+    assert status == HTTPStatus.OK
+    results = payload["results"]
+    assert [("error" in result) for result in results] == [True, True, True, True, False]
+    assert results[0]["error"].startswith("at must be")
+    assert results[1]["error"].startswith("timezone must be a string")
+    assert results[4]["work_day"] == "2025-03-08"
+
+
+# 经过真实连接发送的 NaN/Infinity 字面量（Python 的 json 模块会接受它们）同样回复 400
+@pytest.mark.parametrize("body", [
+    b'{"schedule": {"daily_salary": 300, "preset": "Standard (9-18)"}, "at": NaN}',
+    b'{"schedule": {"daily_salary": Infinity, "preset": "Standard (9-18)"}}',
+    b'not json',
+])
+def test_server_answers_bad_bodies_with_400(body):
+    async def request():
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /earnings HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = asyncio.run(request())
+    assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
@@ -0,0 +1,94 @@
+# 网页界面的主要流程（Streamlit AppTest）：选择预设、编辑/添加/删除时间段、开始追踪、带薪休息和重置
+import os
+from datetime import time as dt_time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from engine import compile_schedule
+from history import DEFAULT_PROFILE
+from presets import PRESET_PERIODS
+from texts import TEXTS
+from tracking import TrackingState
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "moneytracker.py")
+PRESET = "早班 (8-17)"
+
+
+def button(app, label):
+    return next(widget for widget in app.button if widget.label == label)
+
+
+# 运行脚本（target 为 AppTest 或刚操作过的控件），并确认没有异常
+def run(target):
+    app = target.run()
+    assert not app.exception, app.exception
+    return app
+
+
+@pytest.fixture
+def app():
+    return run(AppTest.from_file(APP_PATH, default_timeout=60))
+
+
+def test_edit_periods_without_touching_shared_presets(app):
+    before = [dict(period) for period in PRESET_PERIODS[PRESET]]
+    run(button(app, PRESET).click())
+    assert app.session_state.work_periods == PRESET_PERIODS[PRESET]
+
+    run(app.time_input(key="start_time_0").set_value(dt_time(7, 30)))
+    assert app.session_state.work_periods[0]["start_time"] == dt_time(7, 30)
+    assert isinstance(app.session_state.work_periods, tuple)
+    assert [dict(period) for period in PRESET_PERIODS[PRESET]] == before
+
+    run(button(app, TEXTS["zh"]["add_period"]).click())
+    assert len(app.session_state.work_periods) == 3
+    run(app.button(key="remove_0").click())
+    assert len(app.session_state.work_periods) == 2
+    assert app.session_state.work_periods[0]["start_time"] == dt_time(13)
+
+
+def test_start_break_and_reset(app):
+    run(button(app, TEXTS["zh"]["start_tracking"]).click())
+    tracking = app.session_state.tracking
+    assert isinstance(tracking, TrackingState)
+    assert tracking.total_work_seconds == 7 * 3600
+
+    run(app.button(key="break_gym").click())
+    assert app.session_state.tracking.break_log.is_open("gym")
+    run(app.button(key="break_gym").click())
+    assert not app.session_state.tracking.break_log.is_open("gym")
+
+    run(button(app, TEXTS["zh"]["reset"]).click())
+    assert app.session_state.tracking is None
+
+
+def test_default_profile_is_stable_and_named_profiles_are_opt_in(app):
+    assert app.session_state.profile == DEFAULT_PROFILE
+    assert "profile" not in app.query_params
+    # 另一个没有 profile 参数的新会话看到同一份历史
+    assert run(AppTest.from_file(APP_PATH, default_timeout=60)).session_state.profile == DEFAULT_PROFILE
+
+    profile_input = next(widget for widget in app.text_input if widget.label == TEXTS["zh"]["history_profile_name"])
+    run(profile_input.input("alice"))
+    assert app.session_state.profile == "alice"
+    assert app.query_params["profile"] == ["alice"]
+
+    named = AppTest.from_file(APP_PATH, default_timeout=60)
+    named.query_params["profile"] = "alice"
+    assert run(named).session_state.profile == "alice"
+
+    profile_input = next(widget for widget in app.text_input if widget.label == TEXTS["zh"]["history_profile_name"])
+    run(profile_input.input(DEFAULT_PROFILE))
+    assert app.session_state.profile == DEFAULT_PROFILE
+    assert "profile" not in app.query_params
+
+
+def test_weekday_periods_can_be_edited_repeatedly(app):
+    saturday = TEXTS["zh"]["weekday_names"][5]
+    app.session_state.workdays = [0, 1, 2, 3, 4, 5]
+    run(app)
+    for text, hours in (("10:00-14:00", 4), ("10:00-12:00", 2), ("", None)):
+        run(next(widget for widget in app.text_input if widget.label == saturday).input(text))
+        periods = app.session_state.weekday_periods.get(5)
+        assert (None if periods is None else compile_schedule(periods).total_seconds // 3600) == hours
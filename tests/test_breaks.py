@@ -0,0 +1,123 @@
+# 带薪休息：每个类别的收入等于当前工作日内休息区间（合并重叠后）在日历上的收入，倍率档位按日历计入
+import random
+from datetime import datetime, time as dt_time
+
+import pytest
+
+from breaks import BREAK_CATEGORIES, BreakLog
+from clock import get_timezone
+from presets import DEFAULT_WORK_PERIODS
+from rates import make_tier
+from weekly import ALL_WEEKDAYS, CompiledCalendar, WeeklySchedule
+
+TIMEZONE = "Asia/Shanghai"
+TZ = get_timezone(TIMEZONE)
+# 每天 18:00 以后 1.5 倍的加班档位
+OVERTIME = make_tier(ALL_WEEKDAYS, dt_time(18), dt_time(0), 1.5)
+
+
+def local(day, hour, minute=0):
+    return TZ.localize(datetime(2025, 3, day, hour, minute)).timestamp()
+
+
+def make_calendar(periods=DEFAULT_WORK_PERIODS, tiers=()):
+    weekly = WeeklySchedule.from_periods(periods, ALL_WEEKDAYS, 280.0, tiers)
+    return CompiledCalendar(weekly, TIMEZONE, datetime(2025, 3, 1).date(), days=10)
+
+
+# 参考值：把区间合并后裁剪到 [since, now]，逐段在日历上求收入
+def union_earned(intervals, since, now, calendar):
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted((max(start, since), min(end, now)) for start, end in intervals):
+        if end <= start:
+            continue
+        if current_end is not None and start <= current_end:
+            current_end = max(current_end, end)
+            continue
+        if current_end is not None:
+            total += calendar.earned_between(current_start, current_end)
+        current_start, current_end = start, end
+    if current_end is not None:
+        total += calendar.earned_between(current_start, current_end)
+    return total
+
+
+def test_breaks_match_interval_union_on_the_calendar():
+    calendar = make_calendar(tiers=(OVERTIME,))
+    rng = random.Random(3)
+    log = BreakLog()
+    recorded = {category: [] for category in BREAK_CATEGORIES}
+    first, last = local(2, 0), local(8, 0)
+    for _ in range(400):
+        category = rng.choice(BREAK_CATEGORIES)
+        start = rng.uniform(first, last)
+        end = start + rng.uniform(60, 3 * 3600)
+        log.add(category, start, end, calendar)
+        recorded[category].append((start, end))
+    for _ in range(50):
+        now = rng.uniform(first, last + 3 * 3600)
+        since = calendar.day_anchor(now)[0]
+        for category in BREAK_CATEGORIES:
+            assert log.earned(category, since, now, calendar) == pytest.approx(
+                union_earned(recorded[category], since, now, calendar), abs=1e-9)
+
+
+def test_only_the_current_work_day_counts():
+    calendar = make_calendar()
+    log = BreakLog()
+    # 星期一 10:00-11:00 健身，星期二 9:30-10:00 健身
+    log.add("gym", local(3, 10), local(3, 11), calendar)
+    log.add("gym", local(4, 9, 30), local(4, 10), calendar)
+    hourly = 280.0 / 7
+
+    monday_evening = local(3, 20)
+    assert log.earned_by_category(calendar.day_anchor(monday_evening)[0], monday_evening, calendar)["gym"] == (
+        pytest.approx(hourly))
+    # 过了午夜，星期一的休息不再计入当天
+    after_midnight = local(4, 0, 30)
+    assert log.earned("gym", calendar.day_anchor(after_midnight)[0], after_midnight, calendar) == 0
+    tuesday = local(4, 12)
+    assert log.earned("gym", calendar.day_anchor(tuesday)[0], tuesday, calendar) == pytest.approx(hourly / 2)
+
+
+def test_breaks_across_the_day_anchor_are_clipped():
+    # 夜班 22:00-06:00：工作日从班次开始时起算
+    calendar = make_calendar(({"start_time": dt_time(22), "end_time": dt_time(6)},))
+    hourly = 280.0 / 8
+    log = BreakLog()
+    log.add("meal", local(3, 21), local(4, 5), calendar)
+    log.start("water", local(4, 5))
+    # 星期二 22:30：新的工作日从 22:00 开始，此前的休息都不算
+    now = local(4, 22, 30)
+    since = calendar.day_anchor(now)[0]
+    assert since == local(4, 22)
+    assert log.earned("meal", since, now, calendar) == 0
+    assert log.earned("water", since, now, calendar) == pytest.approx(hourly / 2)
+    # 星期二 05:30：仍属于星期一 22:00 开始的工作日
+    now = local(4, 5, 30)
+    since = calendar.day_anchor(now)[0]
+    assert log.earned("meal", since, now, calendar) == pytest.approx(7 * hourly)
+    assert log.earned("water", since, now, calendar) == pytest.approx(hourly / 2)
+
+
+def test_open_break_is_not_counted_twice():
+    calendar = make_calendar()
+    log = BreakLog()
+    log.add("study", local(3, 10), local(3, 11), calendar)
+    log.start("study", local(3, 10, 30))
+    now = local(3, 11, 30)
+    assert log.earned("study", calendar.day_anchor(now)[0], now, calendar) == pytest.approx(1.5 * 280.0 / 7)
+    log.stop("study", now, calendar)
+    assert not log.is_open("study")
+    assert len(log.intervals["study"]) == 1
+
+
+def test_overtime_breaks_are_paid_at_the_tier_rate():
+    periods = ({"start_time": dt_time(9), "end_time": dt_time(12)}, {"start_time": dt_time(13), "end_time": dt_time(20)})
+    calendar = make_calendar(periods, (OVERTIME,))
+    log = BreakLog()
+    log.add("gym", local(3, 10), local(3, 20), calendar)
+    now = local(3, 21)
+    hourly = calendar.rate_at(local(3, 10)) * 3600
+    # 10:00-12:00、13:00-18:00 按基础时薪，18:00-20:00 按 1.5 倍
+    assert log.earned("gym", calendar.day_anchor(now)[0], now, calendar) == pytest.approx((7 + 2 * 1.5) * hourly)
@@ -0,0 +1,77 @@
+# 推送广播器：一个主题计算出错时只跳过该主题，其他订阅者照常收到推送，节拍循环继续运行
+import asyncio
+import logging
+
+import broadcast
+from broadcast import Broadcaster
+from presets import DEFAULT_WORK_PERIODS
+from weekly import WeeklySchedule
+
+WEEKLY = WeeklySchedule.from_periods(DEFAULT_WORK_PERIODS, (0, 1, 2, 3, 4), 300.0)
+BROKEN_TIMEZONE = "Europe/London"
+
+
+class FakeTransport:
+    def __init__(self):
+        self.events = []
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+    def write(self, data):
+        self.events.append(data)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+    def write(self, data):
+        self.transport.write(data)
+
+
+# 订阅两个主题后让其中一个在计算状态时出错
+def subscribe_with_broken_topic(broadcaster, monkeypatch):
+    healthy, broken = FakeWriter(), FakeWriter()
+    broadcaster.subscribe(WEEKLY, "Asia/Shanghai", healthy)
+    broadcaster.subscribe(WEEKLY, BROKEN_TIMEZONE, broken)
+    status_at = broadcast.status_at
+
+    def failing_status_at(weekly, timezone, moment):
+        if timezone == BROKEN_TIMEZONE:
+            raise RuntimeError("boom")
+        return status_at(weekly, timezone, moment)
+
+    monkeypatch.setattr(broadcast, "status_at", failing_status_at)
+    return healthy, broken
+
+
+def test_failing_topic_does_not_stop_the_others(monkeypatch, caplog):
+    broadcaster = Broadcaster()
+    healthy, broken = subscribe_with_broken_topic(broadcaster, monkeypatch)
+    with caplog.at_level(logging.ERROR, logger="broadcast"):
+        broadcaster.tick(1741410000.0)
+    assert len(healthy.transport.events) == 2
+    assert len(broken.transport.events) == 1
+    assert broadcaster.stats()["tick_errors"] == 1
+    assert broadcaster.stats()["ticks"] == 1
+    assert "boom" in caplog.text
+
+
+def test_tick_loop_survives_errors(monkeypatch):
+    broadcaster = Broadcaster(interval=0.02)
+    healthy, _ = subscribe_with_broken_topic(broadcaster, monkeypatch)
+
+    async def run():
+        broadcaster.start()
+        await asyncio.sleep(0.2)
+        assert not broadcaster._task.done()
+        await broadcaster.stop()
+
+    asyncio.run(run())
+    assert broadcaster.ticks >= 3
+    assert broadcaster.errors == broadcaster.ticks
+    assert len(healthy.transport.events) == broadcaster.ticks + 1
@@ -0,0 +1,103 @@
+# 夏令时切换日：每个可选时区在切换当天的午夜、当天长度、时间快照，以及白班/夜班的整班收入和下班前一秒的收入
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+import pytest
+
+from clock import TIMEZONE_OPTIONS, day_length, get_timezone, local_epoch, take_snapshot
+from weekly import ALL_WEEKDAYS, CompiledCalendar, WeeklySchedule
+
+DAILY_SALARY = 240.0
+YEARS = (2025, 2026)
+
+# 白班和跨午夜的夜班
+SHIFTS = {
+    "day": [{"start_time": dt_time(9, 0), "end_time": dt_time(12, 0)},
+            {"start_time": dt_time(14, 0), "end_time": dt_time(18, 0)}],
+    "night": [{"start_time": dt_time(22, 0), "end_time": dt_time(6, 0)}],
+}
+
+
+# 某年内 UTC 偏移发生变化的本地日期及方向：spring 为拨快（当天变短），fall 为拨慢
+def transition_days(timezone, year):
+    tz = get_timezone(timezone)
+    days = []
+    for moment in getattr(tz, "_utc_transition_times", []):
+        if moment.year != year:
+            continue
+        day = datetime.fromtimestamp(moment.replace(tzinfo=dt_timezone.utc).timestamp(), tz).date()
+        days.append((day, "spring" if day_length(tz, day) < 86400 else "fall"))
+    return days
+
+
+# (时区, 日期, 类型)：有夏令时的时区取每年的两个切换日，没有夏令时的时区取一个普通日子
+def cases():
+    result = []
+    for timezone in TIMEZONE_OPTIONS:
+        for year in YEARS:
+            days = transition_days(timezone, year)
+            result.extend((timezone, day, kind) for day, kind in days or [(date(year, 3, 15), "none")])
+    return result
+
+
+CASES = cases()
+
+
+@pytest.mark.parametrize("timezone", list(TIMEZONE_OPTIONS))
+def test_each_dst_zone_has_one_spring_and_one_fall_day_per_year(timezone):
+    for year in YEARS:
+        kinds = sorted(kind for _, kind in transition_days(timezone, year))
+        assert kinds in ([], ["fall", "spring"])
+
+
+@pytest.mark.parametrize("timezone,day,kind", CASES)
+def test_day_length_and_snapshots(timezone, day, kind):
+    tz = get_timezone(timezone)
+    midnight = local_epoch(tz, day)
+    next_midnight = local_epoch(tz, day + timedelta(days=1))
+    offset_change = (
+        datetime.fromtimestamp(next_midnight, tz).utcoffset() - datetime.fromtimestamp(midnight, tz).utcoffset()
+    ).total_seconds()
+    assert day_length(tz, day) == 86400 - offset_change
+    assert {"spring": offset_change > 0, "fall": offset_change < 0, "none": offset_change == 0}[kind]
+
+    # 当天每个整点取快照：本地日期、午夜和已过秒数必须一致
+    for hour in range(24):
+        snapshot = take_snapshot(timezone, midnight + hour * 3600)
+        if snapshot.local.date() != day:
+            continue
+        assert snapshot.midnight_epoch() == midnight
+        assert (snapshot.midnight().hour, snapshot.midnight().minute) == (0, 0)
+        assert snapshot.elapsed_today() == hour * 3600
+
+
+# 夜班从前一天晚上开始才会跨过凌晨的切换时刻，因此前一天和当天开始的班次都检查
+@pytest.mark.parametrize("shift", list(SHIFTS))
+@pytest.mark.parametrize("timezone,day,kind", CASES)
+def test_shift_pays_one_daily_salary(timezone, day, kind, shift):
+    tz = get_timezone(timezone)
+    weekly = WeeklySchedule.from_periods(SHIFTS[shift], ALL_WEEKDAYS, DAILY_SALARY)
+    calendar = CompiledCalendar(weekly, timezone, day - timedelta(days=2), days=4)
+    for start_day in (day - timedelta(days=1), day):
+        spans = [(local_epoch(tz, start_day, start), local_epoch(tz, start_day, end))
+                 for start, end in weekly.shifts[start_day.weekday()]]
+        shift_start, shift_end = spans[0][0], spans[-1][1]
+        worked = sum(end - start for start, end in spans)
+
+        assert calendar.earned_between(shift_start, shift_end) == pytest.approx(DAILY_SALARY)
+        work_day, seconds, earned = calendar.day_totals(shift_end)
+        assert (work_day, seconds) == (start_day, worked)
+        assert earned == pytest.approx(DAILY_SALARY)
+
+        # 下班前一秒：少赚的正好是一秒的收入（按当天实际工作秒数折算）
+        work_day, seconds, earned = calendar.day_totals(shift_end - 1)
+        assert (work_day, seconds) == (start_day, worked - 1)
+        assert earned == pytest.approx(DAILY_SALARY * (worked - 1) / worked)
+
+        before_day, _, before_earned = calendar.day_totals(shift_start - 1)
+        assert before_day != start_day or before_earned == 0
+
+    # 跨过切换时刻的夜班实际工作时长随之变化
+    if shift == "night" and kind != "none":
+        night_start = local_epoch(tz, day - timedelta(days=1), weekly.shifts[(day.weekday() - 1) % 7][0][0])
+        night_end = local_epoch(tz, day - timedelta(days=1), weekly.shifts[(day.weekday() - 1) % 7][-1][1])
+        assert night_end - night_start == 8 * 3600 + (-3600 if kind == "spring" else 3600)
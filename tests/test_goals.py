@@ -0,0 +1,68 @@
+# 收入目标反查：跨越多个共享日历窗口的 time_to_earn 与一个覆盖 600 天的参考日历上的直接反查一致
+import random
+from datetime import datetime, time as dt_time
+
+import pytest
+
+from clock import get_timezone
+from rates import make_tier
+from weekly import GOAL_HORIZON_DAYS, CompiledCalendar, WeeklySchedule, goal_eta, time_to_earn
+
+PAIRS = 300
+
+# (时区, 工作时间段, 工作日, 倍率档位)：跨午夜的夜班、带加班倍率的白班、只在周末上班
+CASES = {
+    "night": ("America/New_York", [(dt_time(22), dt_time(6))], (0, 1, 2, 3, 4), []),
+    "overtime": ("Asia/Shanghai", [(dt_time(9), dt_time(12)), (dt_time(13), dt_time(18))], (0, 1, 2, 3, 4),
+                 [make_tier(range(7), dt_time(17), dt_time(0), 1.5)]),
+    "weekend": ("Europe/London", [(dt_time(8), dt_time(16))], (5,), [make_tier((5, 6), dt_time(0), dt_time(0), 2)]),
+}
+
+
+def make_weekly(periods, workdays, tiers, daily_salary=200):
+    periods = [{"start_time": start, "end_time": end} for start, end in periods]
+    return WeeklySchedule.from_periods(periods, workdays, daily_salary, tiers)
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_time_to_earn_matches_reference_calendar(case):
+    timezone, periods, workdays, tiers = CASES[case]
+    weekly = make_weekly(periods, workdays, tiers)
+    tz = get_timezone(timezone)
+    start = tz.localize(datetime(2025, 1, 2, 10)).timestamp()
+    reference = CompiledCalendar(weekly, timezone, datetime.fromtimestamp(start, tz).date(), days=600)
+    rng = random.Random(case)
+    for _ in range(PAIRS):
+        moment = start + rng.uniform(0, 200 * 86400)
+        amount = rng.uniform(0.01, 30000)
+        expected = reference.moment_of_pay(reference.pay_at(moment) + amount)
+        if expected is not None and expected > moment + GOAL_HORIZON_DAYS * 86400:
+            expected = None
+        eta = time_to_earn(weekly, timezone, moment, amount)
+        if expected is None:
+            assert eta is None
+        else:
+            assert eta == pytest.approx(expected, abs=1e-3)
+            assert reference.earned_between(moment, eta) == pytest.approx(amount, abs=1e-6)
+
+
+def test_goal_eta_counts_from_the_start_of_the_work_day():
+    timezone, periods, workdays, tiers = CASES["overtime"]
+    weekly = make_weekly(periods, workdays, ())
+    tz = get_timezone(timezone)
+    # 周一 10:00 已工作 1 小时（日薪 200 / 8 小时，每小时 25）
+    moment = tz.localize(datetime(2025, 3, 3, 10)).timestamp()
+    assert goal_eta(weekly, timezone, moment, 20) == (True, moment)
+    reached, eta = goal_eta(weekly, timezone, moment, 100)
+    assert not reached
+    assert eta == pytest.approx(tz.localize(datetime(2025, 3, 3, 14)).timestamp())
+
+
+def test_unreachable_goals():
+    timezone, periods, workdays, tiers = CASES["weekend"]
+    moment = get_timezone(timezone).localize(datetime(2025, 3, 3, 10)).timestamp()
+    assert time_to_earn(make_weekly(periods, (), ()), timezone, moment, 10) is None
+    assert time_to_earn(make_weekly(periods, workdays, (), daily_salary=0), timezone, moment, 10) is None
+    # 一年只能赚约 52 × 200 × 2
+    assert time_to_earn(make_weekly(periods, workdays, tiers), timezone, moment, 30000) is None
+    assert time_to_earn(make_weekly(periods, workdays, tiers), timezone, moment, 0) == moment
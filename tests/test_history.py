@@ -0,0 +1,94 @@
+# 收入历史：按档案分开的记录和汇总、旧版本数据库的迁移，以及增量维护的最佳/最差日与从每日记录重新计算的结果一致
+import random
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from history import DEFAULT_PROFILE, ROLLUP_TABLES, HistoryStore, period_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+# 由每日收入 {日期: 收入} 直接计算各周期的 (天数, 收入, 最佳日, 最差日)；收入相同时最佳日取较晚的一天、最差日取较早的一天
+def expected_rollups(earnings, granularity):
+    periods = {}
+    for day, earned in sorted(earnings.items()):
+        periods.setdefault(period_key(day, granularity), []).append((earned, day.isoformat()))
+    return {
+        period: (len(values), sum(earned for earned, _ in values), max(values), min(values))
+        for period, values in periods.items()
+    }
+
+
+def assert_rollups(store, earnings, profile):
+    for granularity in ROLLUP_TABLES:
+        rows = {
+            row["period"]: (row["days"], row["earned"], (row["best_earned"], row["best_day"]),
+                            (row["worst_earned"], row["worst_day"]))
+            for row in store.rollups(granularity, profile)
+        }
+        assert rows == expected_rollups(earnings, granularity)
+
+
+def test_profiles_are_kept_apart(store):
+    store.record_day(date(2025, 1, 2), "UTC", 300, "[]", 3600, 100)
+    store.record_day(date(2025, 1, 2), "UTC", 300, "[]", 7200, 200, "alice")
+    store.record_day(date(2025, 1, 3), "UTC", 300, "[]", 7200, 250, "alice")
+    # 覆盖同一天只计入差额
+    store.record_day(date(2025, 1, 3), "UTC", 300, "[]", 7300, 260, "alice")
+    assert store.fingerprint() == (1, 100, 3600)
+    assert store.fingerprint(DEFAULT_PROFILE) == store.fingerprint()
+    assert store.fingerprint("alice") == (2, 460, 14500)
+    assert store.fingerprint("bob") == (0, 0, 0)
+    assert [row["earned"] for row in store.rollups("month", "alice")] == [460]
+
+
+def test_incremental_extremes_match_recomputed_values(store):
+    rng = random.Random(5)
+    earnings = {}
+    for index in range(3000):
+        day = date(2023, 1, 1) + timedelta(days=rng.randrange(800))
+        earned = float(rng.randrange(0, 20) * 10)
+        earnings[day] = earned
+        store.record_day(day, "UTC", 1, "[]", earned, earned, "p")
+        if index % 500 == 0:
+            assert_rollups(store, earnings, "p")
+    assert_rollups(store, earnings, "p")
+    assert store.rollups("year") == []
+
+
+def test_migrates_databases_without_profiles(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE days (day TEXT PRIMARY KEY, timezone TEXT NOT NULL, daily_salary REAL NOT NULL,
+                           work_periods TEXT NOT NULL, work_seconds REAL NOT NULL, earned REAL NOT NULL);
+        INSERT INTO days VALUES ('2025-01-02', 'UTC', 300, '[]', 3600, 100);
+        INSERT INTO days VALUES ('2025-02-03', 'UTC', 300, '[]', 3600, 40);
+    """ + "".join(f"""
+        CREATE TABLE {table} (period TEXT PRIMARY KEY, days INTEGER NOT NULL, work_seconds REAL NOT NULL,
+                              earned REAL NOT NULL);
+    """ for table in ROLLUP_TABLES.values()) + """
+        INSERT INTO monthly_rollups VALUES ('2025-01', 1, 3600, 100), ('2025-02', 1, 3600, 40);
+        INSERT INTO quarterly_rollups VALUES ('2025-Q1', 2, 7200, 140);
+        INSERT INTO yearly_rollups VALUES ('2025', 2, 7200, 140);
+    """)
+    connection.commit()
+    connection.close()
+
+    store = HistoryStore(path)
+    assert store.fingerprint(DEFAULT_PROFILE) == (2, 140, 7200)
+    assert_rollups(store, {date(2025, 1, 2): 100, date(2025, 2, 3): 40}, DEFAULT_PROFILE)
+    store.record_day(date(2025, 1, 2), "UTC", 300, "[]", 3600, 30)
+    assert_rollups(store, {date(2025, 1, 2): 30, date(2025, 2, 3): 40}, DEFAULT_PROFILE)
+    store.close()
+    # 再次打开不会重复迁移
+    store = HistoryStore(path)
+    assert store.fingerprint() == (2, 70, 7200)
+    store.close()
@@ -0,0 +1,121 @@
+# 里程碑提醒：MilestoneQueue 按 5 秒刷新取出的事件与逐秒模拟工作日收入得到的事件一致（40 天，跨越夏令时切换和多个日历窗口）
+from datetime import datetime, time as dt_time
+
+import pytest
+
+from clock import get_timezone
+from milestones import AMOUNT, END, FRACTION, MAX_LATENESS, START, MilestoneQueue, get_milestones
+from rates import make_tier
+from weekly import WeeklySchedule, get_calendar
+
+DAYS = 40
+REFRESH = 5
+
+# (时区, 工作时间段, 工作日, 倍率档位, 日薪, 每赚多少提醒一次)
+CASES = {
+    "overtime": ("Asia/Shanghai", [(dt_time(9), dt_time(12)), (dt_time(13), dt_time(18))], range(7),
+                 [make_tier(range(7), dt_time(17), dt_time(0), 1.5)], 300, 100),
+    "night": ("America/New_York", [(dt_time(22), dt_time(6))], (0, 1, 2, 3, 4), [], 250, 40),
+    "weekend": ("Europe/London", [(dt_time(8), dt_time(16)), (dt_time(16), dt_time(20))], (5, 6),
+                [make_tier((5, 6), dt_time(0), dt_time(0), 2)], 200, 75),
+}
+
+
+def make_weekly(case):
+    timezone, periods, workdays, tiers, daily_salary, step = CASES[case]
+    periods = [{"start_time": start, "end_time": end} for start, end in periods]
+    return WeeklySchedule.from_periods(periods, workdays, daily_salary, tiers), timezone, daily_salary, step
+
+
+# 逐秒模拟的收入状态：(工作日, 当天收入, 是否在工作)
+class Simulation:
+    def __init__(self, weekly, timezone):
+        self.weekly = weekly
+        self.timezone = timezone
+        self.calendar = None
+
+    def state(self, moment):
+        if self.calendar is None or not self.calendar.window_start <= moment < self.calendar.window_end:
+            self.calendar = get_calendar(self.weekly, self.timezone, moment)
+        day, _, earned = self.calendar.day_totals(moment)
+        return day, earned, self.calendar.is_working_at(moment)
+
+
+# 从 previous 到 current（相隔一秒）之间应触发的事件
+def events_between(moment, previous, current, daily_salary, step):
+    previous_day, previous_earned, previous_working = previous
+    day, earned, working = current
+    events = []
+    if working and not previous_working:
+        events.append((moment, START, None))
+    if previous_working and not working:
+        events.append((moment, END, None))
+    base = previous_earned if previous_day == day else 0.0
+    events.extend((moment, AMOUNT, level * step) for level in range(int(base // step) + 1, int(earned // step) + 1))
+    if base < 0.5 * daily_salary <= earned:
+        events.append((moment, FRACTION, 0.5))
+    return events
+
+
+# 逐秒模拟得到的事件：先按分钟取样，只在状态有变化的那一分钟内逐秒查找（班次和金额阈值都不会在一分钟内变化后又复原）
+def brute_force_events(weekly, timezone, daily_salary, step, start, end):
+    simulation = Simulation(weekly, timezone)
+
+    def summary(state):
+        day, earned, working = state
+        return day, int(earned // step), earned >= 0.5 * daily_salary, working
+
+    events = []
+    previous = simulation.state(start)
+    for minute in range(int(start), int(end), 60):
+        current = simulation.state(minute + 60)
+        if summary(current) != summary(previous):
+            state = previous
+            for second in range(minute + 1, minute + 61):
+                next_state = simulation.state(second)
+                events.extend(events_between(second, state, next_state, daily_salary, step))
+                state = next_state
+        previous = current
+    return events
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_queue_matches_brute_force(case):
+    weekly, timezone, daily_salary, step = make_weekly(case)
+    start = get_timezone(timezone).localize(datetime(2025, 3, 1, 0, 0, 7)).timestamp()
+    end = start + DAYS * 86400
+    expected = brute_force_events(weekly, timezone, daily_salary, step, start, end)
+
+    queue = MilestoneQueue(weekly, timezone, step, start)
+    fired = []
+    moment = start
+    while moment < end - 60:
+        moment += REFRESH
+        fired.extend(queue.due(moment))
+
+    assert [event[1:] for event in fired] == [event[1:] for event in expected[:len(fired)]]
+    assert len(expected) - len(fired) <= 1
+    for got, want in zip(fired, expected):
+        # 逐秒模拟在精确时刻之后的第一个整秒看到事件
+        assert want[0] - 1 <= got[0] <= want[0]
+    assert {event[1] for event in fired} == {START, END, AMOUNT, FRACTION}
+
+
+def test_idle_session_drops_late_events():
+    weekly, timezone, daily_salary, step = make_weekly("overtime")
+    tz = get_timezone(timezone)
+    start = tz.localize(datetime(2025, 3, 3, 8)).timestamp()
+    queue = MilestoneQueue(weekly, timezone, step, start)
+    # 整个上午没有刷新：到中午只提醒最近 MAX_LATENESS 秒内的事件
+    noon = tz.localize(datetime(2025, 3, 3, 12)).timestamp()
+    fired = queue.due(noon)
+    assert fired == [(noon, END, None)]
+    assert all(noon - event[0] <= MAX_LATENESS for event in fired)
+    assert queue.next_moment() == tz.localize(datetime(2025, 3, 3, 13)).timestamp()
+
+
+def test_event_tables_are_shared_across_sessions():
+    weekly, timezone, daily_salary, step = make_weekly("night")
+    moment = get_timezone(timezone).localize(datetime(2025, 3, 3, 8)).timestamp()
+    assert get_milestones(weekly, timezone, moment, step) is get_milestones(weekly, timezone, moment + 3600, step)
+    assert get_milestones(weekly, timezone, moment, step) is not get_milestones(weekly, timezone, moment, step * 2)
@@ -0,0 +1,129 @@
+# 计薪倍率档位：按档位切分班次，基础时薪只按不在档位内的工作时长计算（日薪之外另计档位收入），
+# 日历、按本地钟点的逐日汇总和导入日程的收入都按同样的规则
+from array import array
+from datetime import date, datetime, time as dt_time, timedelta
+
+import pytest
+
+from clock import get_timezone
+from importer import EventSchedule
+from rates import WEEKEND_DAYS, base_seconds, make_tier, normalize_tiers, price_shifts
+from weekly import ALL_WEEKDAYS, CompiledCalendar, WeeklySchedule
+from workdays import HolidaySet
+
+HOUR = 3600
+SALARY = 280.0
+WEEKDAYS = (0, 1, 2, 3, 4)
+# 工作日 9:00-12:00、13:00-20:00，18:00 以后 1.5 倍
+PERIODS = ({"start_time": dt_time(9), "end_time": dt_time(12)}, {"start_time": dt_time(13), "end_time": dt_time(20)})
+OVERTIME = make_tier(ALL_WEEKDAYS, dt_time(18), dt_time(0), 1.5)
+WEEKEND = make_tier(WEEKEND_DAYS, dt_time(0), dt_time(0), 2.0)
+NIGHT = make_tier(ALL_WEEKDAYS, dt_time(22), dt_time(6), 1.2)
+
+
+def pieces_in_hours(pieces):
+    return [(start / HOUR, end / HOUR, multiplier) for start, end, multiplier in pieces]
+
+
+# 从某天 0 点起到次日 until 点（夜班取次日中午）日历上的 (工作秒数, 收入)
+def calendar_day(weekly, timezone, day, until=dt_time(0)):
+    tz = get_timezone(timezone)
+    calendar = CompiledCalendar(weekly, timezone, day, days=2)
+    start = tz.localize(datetime.combine(day, dt_time(0))).timestamp()
+    end = tz.localize(datetime.combine(day + timedelta(days=1), until)).timestamp()
+    return calendar.work_seconds_at(end) - calendar.work_seconds_at(start), calendar.earned_between(start, end)
+
+
+def test_tiers_split_shifts_and_the_highest_multiplier_wins():
+    shifts = ((9 * HOUR, 12 * HOUR), (13 * HOUR, 20 * HOUR))
+    assert pieces_in_hours(price_shifts(0, shifts, normalize_tiers((OVERTIME,)))) == [
+        (9, 12, 1.0), (13, 18, 1.0), (18, 20, 1.5)]
+    late = make_tier((0,), dt_time(19), dt_time(21), 3.0)
+    assert pieces_in_hours(price_shifts(0, shifts, normalize_tiers((OVERTIME, late)))) == [
+        (9, 12, 1.0), (13, 18, 1.0), (18, 19, 1.5), (19, 20, 3.0)]
+    # 星期日 22:00 开始的夜班档位延续到星期一 6:00
+    night = make_tier((6,), dt_time(22), dt_time(6), 1.2)
+    assert pieces_in_hours(price_shifts(0, ((4 * HOUR, 8 * HOUR),), normalize_tiers((night,)))) == [
+        (4, 6, 1.2), (6, 8, 1.0)]
+    assert normalize_tiers((make_tier((0,), dt_time(9), dt_time(10), 1.0),)) == ()
+    with pytest.raises(ValueError):
+        make_tier((0,), dt_time(9), dt_time(10), 0)
+
+
+def test_base_seconds_exclude_tiered_time():
+    assert base_seconds(((0, 8 * HOUR, 1.0), (8 * HOUR, 10 * HOUR, 1.5))) == 8 * HOUR
+    assert base_seconds(((0, 8 * HOUR, 2.0),)) == 8 * HOUR
+    assert base_seconds(()) == 0
+
+
+def test_overtime_is_paid_on_top_of_the_daily_salary():
+    weekly = WeeklySchedule.from_periods(PERIODS, WEEKDAYS, SALARY, (OVERTIME,))
+    monday = date(2025, 3, 3)
+    hourly = SALARY / 8
+    assert weekly.base_rate(monday) * HOUR == pytest.approx(hourly)
+    assert weekly.day_totals(monday) == (10 * HOUR, pytest.approx(SALARY + 2 * 1.5 * hourly))
+    assert calendar_day(weekly, "Asia/Shanghai", monday) == (10 * HOUR, pytest.approx(SALARY + 2 * 1.5 * hourly))
+
+
+def test_days_without_tiers_pay_exactly_the_daily_salary():
+    weekly = WeeklySchedule.from_periods(PERIODS, WEEKDAYS, SALARY, (WEEKEND,))
+    monday = date(2025, 3, 3)
+    assert weekly.base_rate(monday) * HOUR == pytest.approx(SALARY / 10)
+    assert weekly.day_totals(monday)[1] == pytest.approx(SALARY)
+    assert calendar_day(weekly, "Europe/London", monday)[1] == pytest.approx(SALARY)
+    assert weekly.base_rate(date(2025, 3, 2)) == 0
+
+
+def test_days_entirely_inside_a_tier_use_all_their_hours():
+    # 周末全天 2 倍：基础时薪按全天工作时长，当天收入是两倍日薪
+    weekly = WeeklySchedule.from_periods(PERIODS, ALL_WEEKDAYS, SALARY, (WEEKEND,))
+    saturday = date(2025, 3, 8)
+    assert weekly.day_totals(saturday)[1] == pytest.approx(2 * SALARY)
+    assert calendar_day(weekly, "Europe/London", saturday)[1] == pytest.approx(2 * SALARY)
+    # 夜班 22:00-06:00 整段都在夜班档位内
+    night_shift = ({"start_time": dt_time(22), "end_time": dt_time(6)},)
+    weekly = WeeklySchedule.from_periods(night_shift, WEEKDAYS, SALARY, (NIGHT,))
+    assert weekly.day_totals(date(2025, 3, 3)) == (8 * HOUR, pytest.approx(1.2 * SALARY))
+    assert calendar_day(weekly, "America/New_York", date(2025, 3, 3), dt_time(12)) == (
+        8 * HOUR, pytest.approx(1.2 * SALARY))
+
+
+def test_makeup_days_are_priced_like_a_regular_workday():
+    holidays = HolidaySet(makeup=[date(2025, 3, 8)])
+    weekly = WeeklySchedule.from_periods(PERIODS, WEEKDAYS, SALARY, (OVERTIME, WEEKEND), holidays)
+    saturday, monday = date(2025, 3, 8), date(2025, 3, 3)
+    assert weekly.day_totals(saturday) == weekly.day_totals(monday)
+    assert calendar_day(weekly, "Asia/Shanghai", saturday)[1] == pytest.approx(weekly.day_totals(monday)[1])
+
+
+def test_base_rate_uses_real_seconds_on_dst_days():
+    # 纽约 2025-03-09 2:00 跳到 3:00：0:00-8:00 实际只有 7 小时，8:00-10:00 加倍
+    shift = ({"start_time": dt_time(0), "end_time": dt_time(10)},)
+    tier = make_tier(ALL_WEEKDAYS, dt_time(8), dt_time(10), 2.0)
+    weekly = WeeklySchedule.from_periods(shift, ALL_WEEKDAYS, SALARY, (tier,))
+    seconds, earned = calendar_day(weekly, "America/New_York", date(2025, 3, 9))
+    assert seconds == 9 * HOUR
+    assert earned == pytest.approx(SALARY + 2 * 2 * SALARY / 7)
+
+
+def test_imported_schedules_are_priced_on_the_calendar():
+    timezone = "Asia/Shanghai"
+    tz = get_timezone(timezone)
+
+    def local(day, hour):
+        return tz.localize(datetime(2025, 3, day, hour)).timestamp()
+
+    holidays = HolidaySet(holidays=[date(2025, 3, 4)])
+    weekly = WeeklySchedule.from_periods(PERIODS, WEEKDAYS, SALARY, (OVERTIME,), holidays)
+    hourly = SALARY / 8
+    imported = EventSchedule(
+        array("d", [local(3, 8), local(3, 19), local(4, 9), local(5, 19)]),
+        array("d", [local(3, 10), local(3, 21), local(4, 11), local(6, 10)]),
+    )
+    first_day, last_day = date(2025, 3, 3), date(2025, 3, 5)
+    calendar = CompiledCalendar(weekly, timezone, first_day, days=(last_day - first_day).days + 1)
+    # 星期一 8:00-10:00 只有 9:00 以后在班上，19:00-21:00 只有 19:00-20:00 在班上且为加班；
+    # 星期二是节假日；星期三 19:00 起的时间段截到范围末尾的午夜，只有 19:00-20:00 计薪
+    assert imported.earned_on_calendar(calendar, first_day, last_day) == pytest.approx(
+        hourly + 1.5 * hourly + 1.5 * hourly)
+    assert imported.earned_on_calendar(calendar, first_day, first_day) == pytest.approx(hourly + 1.5 * hourly)
@@ -0,0 +1,96 @@
+# 多个收入来源：合并后的收入曲线与各来源日历逐一查询再相加的结果一致（收入、时薪、工作状态、计数器起算点和目标时刻）
+import random
+from bisect import bisect_right
+from datetime import datetime, timedelta, time as dt_time
+
+import pytest
+
+from clock import get_timezone
+from presets import PRESET_PERIODS
+from streams import IncomeStream, combined_goal_eta, format_periods, get_combined_calendar, parse_periods
+from weekly import CompiledCalendar, WeeklySchedule, get_calendar
+
+MIXES = 300
+QUERIES = 20
+TIMEZONES = ("Asia/Shanghai", "America/New_York", "Europe/London", "UTC", "Asia/Tokyo")
+# 2025-03-03 00:00 UTC
+START = 1740960000.0
+PERIOD_CHOICES = [periods for periods in PRESET_PERIODS.values() if periods] + [
+    parse_periods("22:00-02:00"),
+    parse_periods("18:30-21:00, 21:30-23:00"),
+]
+
+
+def random_streams(rng):
+    return tuple(
+        IncomeStream(
+            f"stream {index}",
+            WeeklySchedule.from_periods(
+                rng.choice(PERIOD_CHOICES),
+                tuple(sorted(rng.sample(range(7), rng.randint(1, 7)))),
+                float(rng.randrange(50, 800)),
+            ),
+            rng.choice(TIMEZONES),
+        )
+        for index in range(rng.randint(1, 5))
+    )
+
+
+# 某个来源从 start 到 end 赚到的钱：在一个足够长的日历上直接相减，不经过窗口拼接
+def reference_earned(stream, start, end):
+    first_day = datetime.fromtimestamp(start, get_timezone(stream.timezone)).date() - timedelta(days=1)
+    calendar = CompiledCalendar(stream.weekly, stream.timezone, first_day, days=int((end - start) // 86400) + 3)
+    return calendar.earned_between(start, end)
+
+
+@pytest.mark.parametrize("seed", range(MIXES // 50))
+def test_combined_curve_matches_per_stream_sum(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        streams = random_streams(rng)
+        now = START + rng.uniform(0, 300 * 86400)
+        combined = get_combined_calendar(streams, now)
+        calendars = [get_calendar(stream.weekly, stream.timezone, now) for stream in streams]
+        for _ in range(QUERIES):
+            moment = rng.uniform(combined.window_start, combined.window_end)
+            assert combined.pay_at(moment) == pytest.approx(sum(calendar.pay_at(moment) for calendar in calendars))
+            assert combined.rate_at(moment) == pytest.approx(sum(calendar.rate_at(moment) for calendar in calendars),
+                                                             abs=1e-12)
+            assert combined.is_working_at(moment) == any(calendar.is_working_at(moment) for calendar in calendars)
+            assert combined.day_earned(moment) == pytest.approx(sum(row[2] for row in combined.breakdown(moment)))
+
+        # 浏览器计数器：当前累计收入减去最近一个起算点的累计收入，正好是各来源当天收入之和
+        anchors = combined.anchor_points()
+        anchor_moments = [moment for moment, _ in anchors]
+        for _ in range(QUERIES):
+            moment = rng.uniform(combined.window_start, combined.window_end - 1)
+            base = anchors[bisect_right(anchor_moments, moment) - 1][1]
+            assert combined.pay_at(moment) - base == pytest.approx(combined.day_earned(moment), abs=1e-6)
+
+        amount = rng.uniform(1, 3000)
+        reached, eta = combined_goal_eta(streams, now, amount)
+        if reached:
+            assert combined.day_earned(now) >= amount
+        elif eta is not None:
+            earned = combined.day_earned(now) + sum(reference_earned(stream, now, eta) for stream in streams)
+            assert earned == pytest.approx(amount, rel=1e-6)
+
+
+def test_combined_curves_are_shared_and_ignore_stream_names():
+    rng = random.Random(0)
+    streams = random_streams(rng)
+    renamed = tuple(IncomeStream(stream.name + " (renamed)", stream.weekly, stream.timezone) for stream in streams)
+    assert get_combined_calendar(streams, START) is get_combined_calendar(renamed, START)
+
+
+def test_parse_and_format_periods():
+    periods = parse_periods("09:00-12:00，13:00-18:00, ")
+    assert periods == (
+        {"start_time": dt_time(9), "end_time": dt_time(12)},
+        {"start_time": dt_time(13), "end_time": dt_time(18)},
+    )
+    assert format_periods(periods) == "09:00-12:00, 13:00-18:00"
+    assert parse_periods(format_periods(parse_periods("22:00-02:00"))) == parse_periods("22:00-02:00")
+    for text in ("", "09:00-09:00", "9-17", "09:00"):
+        with pytest.raises(ValueError):
+            parse_periods(text)
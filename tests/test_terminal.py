@@ -0,0 +1,20 @@
+# 终端模式：输出管道被下游（如 head）提前关闭时安静退出，不打印 BrokenPipeError 的回溯
+import os
+import subprocess
+import sys
+
+import pytest
+
+TERMINAL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "terminal.py")
+
+
+@pytest.mark.parametrize("options", [("--interval", "0.01"), ("--once",)])
+def test_closed_pipe_exits_quietly(options):
+    process = subprocess.Popen([sys.executable, TERMINAL_PATH, *options],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # 像 head -n 1 一样读到一行就关闭管道
+    assert process.stdout.readline()
+    process.stdout.close()
+    _, stderr = process.communicate(timeout=30)
+    assert process.returncode == 0
+    assert stderr == b""
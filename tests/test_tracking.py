@@ -0,0 +1,50 @@
+# 追踪状态：开始追踪时共享缓存中的编译日程和日历，只为本会话新建休息记录
+from datetime import date, time as dt_time
+
+import pytest
+
+from presets import DEFAULT_WORK_PERIODS, PRESET_PERIODS
+from tracking import TrackingState
+from weekly import get_calendar
+from workdays import HolidaySet
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+
+
+def test_start_shares_compiled_schedules_between_sessions():
+    first = TrackingState.start(DEFAULT_WORK_PERIODS, WEEKDAYS, 300.0)
+    second = TrackingState.start(DEFAULT_WORK_PERIODS, WEEKDAYS, 300.0)
+    assert first.schedule is second.schedule
+    moment = 1741410000.0
+    assert get_calendar(first.weekly, "UTC", moment) is get_calendar(second.weekly, "UTC", moment)
+    assert first.break_log is not second.break_log
+    assert first.milestones is None and first.streams == () and first.overrides == {}
+    assert first.total_work_seconds == 7 * 3600
+    assert first.daily_salary == 300.0
+
+
+def test_tracking_state_has_no_per_instance_dict():
+    tracking = TrackingState.start(DEFAULT_WORK_PERIODS, WEEKDAYS, 300.0)
+    with pytest.raises(AttributeError):
+        tracking.start_time = 0
+
+
+def test_start_does_not_modify_shared_presets():
+    preset = PRESET_PERIODS["早班 (8-17)"]
+    before = [dict(period) for period in preset]
+    TrackingState.start(preset, WEEKDAYS, 300.0, overrides={5: ({"start_time": dt_time(10), "end_time": dt_time(14)},)})
+    assert [dict(period) for period in preset] == before
+
+
+# 时间轴显示的当天日程与日历计薪一致：2025-03-03 是星期一
+def test_schedule_on_follows_the_pay_calendar():
+    saturday = ({"start_time": dt_time(10), "end_time": dt_time(14)},)
+    holidays = HolidaySet(holidays=[date(2025, 3, 4)], makeup=[date(2025, 3, 9)])
+    tracking = TrackingState.start(DEFAULT_WORK_PERIODS, WEEKDAYS + (5,), 300.0, holidays=holidays,
+                                   overrides={5: saturday})
+    assert tracking.schedule_on(date(2025, 3, 3)) is tracking.schedule
+    assert tracking.schedule_on(date(2025, 3, 4)).total_seconds == 0
+    assert tracking.schedule_on(date(2025, 3, 8)).total_seconds == 4 * 3600
+    # 星期日不上班，调休上班日按常规工作日（星期一）的时间段
+    assert tracking.schedule_on(date(2025, 3, 2)).total_seconds == 0
+    assert tracking.schedule_on(date(2025, 3, 9)) is tracking.schedule
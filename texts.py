@@ -0,0 +1,333 @@
+# 界面文本（中文/英文）：模块只导入一次，所有会话和每次重跑共用同一份字典
+TEXTS = {
+    "zh": {
+        "title": "💰 Money Tracker",
+        "subtitle": "实时追踪你的工作收入",
+        "settings": "⚙️ 设置",
+        "timezone_setting": "🌍 时区设置",
+        "daily_salary": "日薪 ($)",
+        "work_time_settings": "📅 工作时间设置",
+        "work_time_desc": "选择预设模板或自定义工作时间段",
+        "preset_templates": "📋 预设模板",
+        "custom_periods": "🛠️ 自定义时间段",
+        "period": "时间段",
+        "start_time": "开始时间",
+        "end_time": "结束时间",
+        "add_period": "➕ 添加时间段",
+        "delete_period": "🗑️ 删除",
+        "start_tracking": "🚀 开始追踪",
+        "reset": "🔄 重置",
+        "current_time": "📌 当前时间",
+        "work_periods_today": "📊 今日工作时间段",
+        "work_time": "工作时间",
+        "non_work_time": "非工作时间",
+        "status": "状态",
+        "income_progress": "💰 今日收入进度",
+        "progress": "收入进度",
+        "detailed_stats": "📈 详细统计",
+        "earned_amount": "已赚取金额",
+        "time_per_dollar": "当前每赚$1所需时间",
+        "progress_today": "今日进度",
+        "minutes": "分钟",
+        "seconds": "秒",
+        "hours": "小时",
+        "setup_prompt": "👈 请在左侧设置您的时区、日薪和工作时间，然后点击'开始追踪'按钮开始记录您的收入。",
+        "work_periods_preview": "📋 工作时间段预览",
+        "total_work_time": "总工作时间",
+        "realtime_info": "⏱️ 实时信息",
+        "is_work_time": "✅ 当前是工作时间",
+        "not_work_time": "⚠️ 当前不是工作时间",
+        "work_time_details": "🗓️ 工作时间详情",
+        "rest_day_today": "😴 今天休息，不计薪",
+        "salary_info": "💵 薪资信息",
+        "daily_salary_info": "日薪",
+        "hourly_salary": "小时薪资",
+        "minute_salary": "分钟薪资",
+        "app_description": "📝 应用说明",
+        "app_intro": "**Money Tracker** 帮助您实时追踪工作收入，让您更直观地了解自己的收入进度。",
+        "features": "**特点**:",
+        "feature_1": "- 支持预设工作时间模板，一键设置",
+        "feature_2": "- 直观的时间输入和可视化时间轴",
+        "feature_3": "- 实时计算已赚取金额（自动刷新）",
+        "feature_4": "- 可视化显示收入进度",
+        "feature_5": "- 详细统计信息",
+        "feature_6": "- 支持时区设置",
+        "how_to_use": "**使用方法**:",
+        "step_1": "1. 选择预设工作时间模板或自定义",
+        "step_2": "2. 设置您的时区和日薪",
+        "step_3": "3. 点击开始追踪按钮",
+        "step_4": "4. 实时查看您的收入进度",
+        "language": "🌐 语言",
+        "time_format_error": "⚠️ 时间格式错误，请使用 HH:MM 格式（如：09:30）",
+        "time_range_error": "⚠️ 结束时间不能与开始时间相同",
+        "next_day": "次日",
+        "workdays": "📆 工作日",
+        "weekday_names": ["周一", "周二", "周三", "周四", "周五", "周六", "周日"],
+        "visual_timeline": "📊 可视化时间轴",
+        "period_stats": "📅 月度/季度/年度统计",
+        "show_period_stats": "显示历史统计",
+        "granularity": "统计周期",
+        "granularity_month": "月度",
+        "granularity_quarter": "季度",
+        "granularity_year": "年度",
+        "no_history": "暂无历史记录，开始追踪后会自动保存每天的收入。",
+        "period_col": "周期",
+        "days_tracked": "记录天数",
+        "total_earned": "总收入",
+        "hours_worked": "工作时长(小时)",
+        "effective_hourly_rate": "实际时薪",
+        "best_day": "最佳日",
+        "best_earned": "最佳日收入",
+        "worst_day": "最差日",
+        "worst_earned": "最差日收入",
+        "change_pct": "环比(%)",
+        "earnings_trend": "收入趋势",
+        "paid_breaks": "☕ 带薪休息",
+        "break_gym": "🏋️ 健身",
+        "break_water": "💧 接水",
+        "break_meal": "🍱 吃饭",
+        "break_study": "📚 学习",
+        "start_break": "开始",
+        "stop_break": "结束",
+        "break_total": "带薪休息共赚取",
+        "import_schedule": "📥 导入日程",
+        "import_file": "CSV 或 iCalendar (.ics) 文件",
+        "import_help": "CSV 需包含 start,end 列（日期时间）或 date,start_time,end_time 列；没有时区的时间按所选时区解析；收入按当前设置的日程、倍率和节假日计算，只计入与工作时间重叠的部分",
+        "import_summary": "{events} 个事件，跳过 {skipped} 个，合并为 {intervals} 个时间段",
+        "import_range": "日期范围",
+        "import_total": "{hours:.2f} 小时 · ${earned:.2f}",
+        "import_error": "导入失败",
+        "import_empty": "文件中没有可用的工作时间段",
+        "rate_tiers": "💹 计薪倍率",
+        "rate_tiers_desc": "落在以下时间内的工作按基础时薪（日薪 ÷ 当天不在这些时间内的工作时长，整天都在其中时按全天工作时长）乘以倍数计薪，在日薪之外另计，多个倍率重叠时取最高",
+        "overtime_tier": "加班",
+        "overtime_after": "加班开始时间",
+        "night_tier": "夜班",
+        "night_start": "夜班开始",
+        "night_end": "夜班结束",
+        "weekend_tier": "周末",
+        "multiplier": "倍数",
+        "off_duty": "休息中",
+        "goals": "🎯 收入目标",
+        "goals_desc": "今天的收入（从当前工作日开始算起）达到目标金额的预计时刻；今天赚不够时接着累计之后工作日的收入",
+        "goal_name": "目标名称",
+        "goal_amount": "目标金额",
+        "add_goal": "➕ 添加目标",
+        "delete_goal": "删除目标",
+        "goal_reached": "✅ 已达成",
+        "goal_eta": "预计 {time}（还需 {left}）",
+        "goal_unreachable": "一年内无法达成",
+        "days": "天",
+        "holiday_files": "节假日/请假",
+        "holiday_files_help": "节假日目录中的文件：放假和请假的日子不计薪，调休上班日按常规工作日计薪",
+        "holiday_error": "节假日文件格式错误",
+        "work_calendar": "📆 工作日历",
+        "show_work_calendar": "显示预计收入",
+        "calendar_range": "日期范围",
+        "this_month": "本月",
+        "this_quarter": "本季度",
+        "this_year": "本年",
+        "workday_count": "工作日",
+        "expected_hours": "预计工时",
+        "expected_earnings": "预计收入",
+        "holiday_kind_holiday": "放假",
+        "holiday_kind_leave": "请假",
+        "holiday_kind_makeup": "调休上班",
+        "milestones": "🔔 里程碑提醒",
+        "milestones_on": "开启提醒",
+        "milestones_help": "每赚一定金额、赚到日薪的一半以及进入/离开工作时段时在页面上弹出提醒",
+        "milestone_step": "每赚多少提醒一次 ($)",
+        "milestone_amount": "今天已赚到 ${amount:,.0f}",
+        "milestone_fraction": "已赚到日薪的 {percent:.0f}%",
+        "milestone_start": "进入工作时段，开始计薪",
+        "milestone_end": "工作时段结束",
+        "next_milestone": "下一个提醒：{time}",
+        "income_streams": "💼 其他收入来源",
+        "income_streams_desc": "兼职、副业等：每个来源有自己的日薪、工作时间段、工作日和时区，与主工作的收入合并计算",
+        "stream_name": "名称",
+        "stream_salary": "日薪 ($)",
+        "stream_periods": "工作时间段",
+        "stream_periods_help": "例如 19:00-21:00, 21:30-23:00；结束早于开始表示到次日结束",
+        "add_stream": "添加收入来源",
+        "delete_stream": "删除该收入来源",
+        "stream_error": "⚠️ 工作时间段格式应为 HH:MM-HH:MM，多个时间段用逗号分隔",
+        "primary_stream": "主工作",
+        "stream_breakdown": "各来源收入",
+        "stream_col": "来源",
+        "stream_earned": "今日收入",
+        "stream_hours": "今日工时",
+        "stream_rate": "当前时薪",
+        "combined_total": "合计",
+        "history_profile": "🗂️ 历史档案",
+        "history_profile_name": "档案名",
+        "history_profile_help": "历史记录和统计按档案分开保存，默认使用 default 档案；改为其他档案名后，档案名会保存在页面地址中",
+        "weekday_periods": "📅 按星期几设置时间段",
+        "weekday_periods_desc": "为选中的工作日单独设置工作时间段（例如周六只上半天）；留空的工作日使用下面的默认时间段",
+        "weekday_periods_default": "使用默认时间段"
+    },
+    "en": {
+        "title": "💰 Money Tracker",
+        "subtitle": "Track your work income in real-time",
+        "settings": "⚙️ Settings",
+        "timezone_setting": "🌍 Timezone Settings",
+        "daily_salary": "Daily Salary ($)",
+        "work_time_settings": "📅 Work Time Settings",
+        "work_time_desc": "Choose preset templates or customize work periods",
+        "preset_templates": "📋 Preset Templates",
+        "custom_periods": "🛠️ Custom Periods",
+        "period": "Period",
+        "start_time": "Start Time",
+        "end_time": "End Time",
+        "add_period": "➕ Add Period",
+        "delete_period": "🗑️ Delete",
+        "start_tracking": "🚀 Start Tracking",
+        "reset": "🔄 Reset",
+        "current_time": "📌 Current Time",
+        "work_periods_today": "📊 Today's Work Periods",
+        "work_time": "Work Time",
+        "non_work_time": "Non-Work Time",
+        "status": "Status",
+        "income_progress": "💰 Today's Income Progress",
+        "progress": "Progress",
+        "detailed_stats": "📈 Detailed Statistics",
+        "earned_amount": "Earned Amount",
+        "time_per_dollar": "Time per $1 right now",
+        "progress_today": "Today's Progress",
+        "minutes": "min",
+        "seconds": "sec",
+        "hours": "hours",
+        "setup_prompt": "👈 Please set your timezone, daily salary and work periods on the left, then click 'Start Tracking' to begin recording your income.",
+        "work_periods_preview": "📋 Work Periods Preview",
+        "total_work_time": "Total Work Time",
+        "realtime_info": "⏱️ Real-time Information",
+        "is_work_time": "✅ Currently in Work Time",
+        "not_work_time": "⚠️ Currently Not in Work Time",
+        "work_time_details": "🗓️ Work Time Details",
+        "rest_day_today": "😴 Today is a day off, no pay",
+        "salary_info": "💵 Salary Information",
+        "daily_salary_info": "Daily Salary",
+        "hourly_salary": "Hourly Rate",
+        "minute_salary": "Minute Rate",
+        "app_description": "📝 App Description",
+        "app_intro": "**Money Tracker** helps you track your work income in real-time, giving you a visual understanding of your earning progress.",
+        "features": "**Features**:",
+        "feature_1": "- Preset work time templates for quick setup",
+        "feature_2": "- Intuitive time input and visual timeline",
+        "feature_3": "- Real-time calculation of earned amount (auto-refresh)",
+        "feature_4": "- Visual display of income progress",
+        "feature_5": "- Detailed statistics",
+        "feature_6": "- Timezone support",
+        "how_to_use": "**How to Use**:",
+        "step_1": "1. Choose preset work time template or customize",
+        "step_2": "2. Set your timezone and daily salary",
+        "step_3": "3. Click the 'Start Tracking' button",
+        "step_4": "4. View your income progress in real-time",
+        "language": "🌐 Language",
+        "time_format_error": "⚠️ Invalid time format, please use HH:MM format (e.g., 09:30)",
+        "time_range_error": "⚠️ End time must differ from start time",
+        "next_day": "next day",
+        "workdays": "📆 Workdays",
+        "weekday_names": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        "visual_timeline": "📊 Visual Timeline",
+        "period_stats": "📅 Monthly / Quarterly / Yearly Statistics",
+        "show_period_stats": "Show history statistics",
+        "granularity": "Period",
+        "granularity_month": "Monthly",
+        "granularity_quarter": "Quarterly",
+        "granularity_year": "Yearly",
+        "no_history": "No history yet. Each day's earnings are saved automatically while tracking.",
+        "period_col": "Period",
+        "days_tracked": "Days Tracked",
+        "total_earned": "Total Earned",
+        "hours_worked": "Hours Worked",
+        "effective_hourly_rate": "Effective Hourly Rate",
+        "best_day": "Best Day",
+        "best_earned": "Best Day Earned",
+        "worst_day": "Worst Day",
+        "worst_earned": "Worst Day Earned",
+        "change_pct": "Change (%)",
+        "earnings_trend": "Earnings Trend",
+        "paid_breaks": "☕ Paid Breaks",
+        "break_gym": "🏋️ Gym",
+        "break_water": "💧 Water",
+        "break_meal": "🍱 Meal",
+        "break_study": "📚 Study",
+        "start_break": "Start",
+        "stop_break": "Stop",
+        "break_total": "Earned on paid breaks",
+        "import_schedule": "📥 Import Schedule",
+        "import_file": "CSV or iCalendar (.ics) file",
+        "import_help": "CSV needs start,end columns (date-times) or date,start_time,end_time; times without an offset use the selected timezone; earnings follow the current schedule, rate tiers and holidays and only count time that overlaps working hours",
+        "import_summary": "{events} events, {skipped} skipped, merged into {intervals} periods",
+        "import_range": "Date range",
+        "import_total": "{hours:.2f} hours · ${earned:.2f}",
+        "import_error": "Import failed",
+        "import_empty": "The file has no usable work periods",
+        "rate_tiers": "💹 Rate Multipliers",
+        "rate_tiers_desc": "Work inside these windows is paid at the base rate (daily salary ÷ that day's hours outside the windows, or all of its hours when the whole day is inside them) times the multiplier, on top of the daily salary; overlapping windows use the highest",
+        "overtime_tier": "Overtime",
+        "overtime_after": "Overtime starts at",
+        "night_tier": "Night shift",
+        "night_start": "Night starts",
+        "night_end": "Night ends",
+        "weekend_tier": "Weekend",
+        "multiplier": "Multiplier",
+        "off_duty": "Off duty",
+        "goals": "🎯 Earnings Goals",
+        "goals_desc": "When today's earnings (counted from the start of the current work day) reach each amount; goals beyond today keep adding the following work days",
+        "goal_name": "Goal name",
+        "goal_amount": "Goal amount",
+        "add_goal": "➕ Add Goal",
+        "delete_goal": "Delete goal",
+        "goal_reached": "✅ Reached",
+        "goal_eta": "ETA {time} ({left} to go)",
+        "goal_unreachable": "Not reachable within a year",
+        "days": "d",
+        "holiday_files": "Holidays / Leave",
+        "holiday_files_help": "Files in the holidays directory: holidays and leave days are unpaid, make-up workdays are paid like a regular workday",
+        "holiday_error": "Invalid holiday file",
+        "work_calendar": "📆 Work Calendar",
+        "show_work_calendar": "Show expected earnings",
+        "calendar_range": "Date range",
+        "this_month": "This month",
+        "this_quarter": "This quarter",
+        "this_year": "This year",
+        "workday_count": "Workdays",
+        "expected_hours": "Expected hours",
+        "expected_earnings": "Expected earnings",
+        "holiday_kind_holiday": "Holiday",
+        "holiday_kind_leave": "Leave",
+        "holiday_kind_makeup": "Make-up workday",
+        "milestones": "🔔 Milestone Alerts",
+        "milestones_on": "Enable alerts",
+        "milestones_help": "Pop up a notice on the page for every amount earned, at half of the daily salary and when a work period starts or ends",
+        "milestone_step": "Alert every ($)",
+        "milestone_amount": "You've earned ${amount:,.0f} today",
+        "milestone_fraction": "{percent:.0f}% of today's salary earned",
+        "milestone_start": "Work period started, earning now",
+        "milestone_end": "Work period ended",
+        "next_milestone": "Next alert: {time}",
+        "income_streams": "💼 Other Income Streams",
+        "income_streams_desc": "Side jobs and gigs: each stream has its own daily salary, work periods, workdays and timezone, and is added to the main job's earnings",
+        "stream_name": "Name",
+        "stream_salary": "Daily Salary ($)",
+        "stream_periods": "Work periods",
+        "stream_periods_help": "e.g. 19:00-21:00, 21:30-23:00; an end before the start means the next day",
+        "add_stream": "Add income stream",
+        "delete_stream": "Delete this income stream",
+        "stream_error": "⚠️ Work periods must look like HH:MM-HH:MM, separated by commas",
+        "primary_stream": "Main job",
+        "stream_breakdown": "Earnings by Stream",
+        "stream_col": "Stream",
+        "stream_earned": "Today",
+        "stream_hours": "Hours today",
+        "stream_rate": "Current rate",
+        "combined_total": "Total",
+        "history_profile": "🗂️ History Profile",
+        "history_profile_name": "Profile name",
+        "history_profile_help": "History and stats are kept per profile; the default profile is used unless you enter another name, which is then kept in the page URL",
+        "weekday_periods": "📅 Periods by Weekday",
+        "weekday_periods_desc": "Give selected workdays their own work periods (e.g. a half day on Saturday); workdays left empty use the default periods below",
+        "weekday_periods_default": "Use default periods"
+    }
+}
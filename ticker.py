@@ -0,0 +1,22 @@
+# 浏览器端实时跳动的收入计数器组件：参数只在配置变化（或日历窗口滚动）时由服务端发送一次
+import os
+
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ticker_frontend")
+_money_ticker = components.declare_component("money_ticker", path=_FRONTEND_DIR)
+
+
+# 渲染收入计数器；calendar 为 weekly.CompiledCalendar，分段边界均为 Unix 秒，浏览器端无需知道时区
+def money_ticker(calendar, daily_salary, labels, key="money_ticker"):
+    return _money_ticker(
+        starts=calendar.starts,
+        ends=calendar.ends,
+        slopes=calendar.slopes,
+        cum_pay=calendar.cum_pay,
+        anchors=calendar.anchor_points(),
+        daily_salary=daily_salary,
+        labels=labels,
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,29 @@
+# 侧边栏时间轴 HTML 缓存：只取决于工作区间和语言，所有会话共享同一份字符串
+from lru import LRUCache
+from texts import TEXTS
+
+TIMELINE_CACHE_SIZE = 64
+
+_timeline_cache = LRUCache(TIMELINE_CACHE_SIZE)
+
+
+def _build_timeline_html(schedule, title):
+    html = '<div class="timeline-container">'
+    html += f'<h4>{title}</h4>'
+    html += '<div style="display: flex; flex-wrap: wrap; gap: 2px;">'
+    
+    # 创建24小时的时间块
+    for hour in range(24):
+        css_class = "timeline-work" if schedule.is_working_minute(hour * 60) else "timeline-break"
+        html += f'<div class="timeline-hour {css_class}" title="{hour:02d}:00">{hour:02d}</div>'
+    
+    html += '</div></div>'
+    return html
+
+
+# 按（规范化后的工作时间段, 语言）取出缓存的时间轴 HTML
+def get_timeline_html(schedule, language):
+    return _timeline_cache.get_or_create(
+        (schedule.intervals, language),
+        lambda: _build_timeline_html(schedule, TEXTS[language]["visual_timeline"]),
+    )
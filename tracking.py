@@ -0,0 +1,53 @@
+# 一次追踪的会话状态：点击“开始追踪”时创建，重置时整体丢弃。
+# 编译日程来自进程内缓存，周排班编译出的日历按排班在会话间共享，这里只保存引用和本会话的休息记录；
+# 每秒收入等派生数值按需计算，不再作为零散的 session_state 键逐个保存
+from breaks import BreakLog
+from engine import compile_schedule
+from streams import IncomeStream
+from weekly import WeeklySchedule
+
+
+class TrackingState:
+    __slots__ = ("schedule", "weekly", "break_log", "milestones", "streams", "overrides")
+
+    def __init__(self, schedule, weekly, break_log, streams=(), overrides=None):
+        self.schedule = schedule
+        self.weekly = weekly
+        self.break_log = break_log
+        # 按星期几单独设置的工作时间段 {星期几: 时间段}，其余工作日使用 schedule
+        self.overrides = overrides or {}
+        # 主工作以外的收入来源（IncomeStream 元组），与主工作的收入合并显示
+        self.streams = streams
+        # 里程碑提醒的待触发队列（MilestoneQueue），在实时区域第一次刷新时创建
+        self.milestones = None
+
+    # 按当前设置开始追踪：tiers 为计薪倍率档位，holidays 为节假日定义，
+    # streams 为其他收入来源的定义（见 streams.IncomeStream.from_definition），overrides 为按星期几单独设置的时间段
+    @classmethod
+    def start(cls, periods, workdays, daily_salary, tiers=(), holidays=None, streams=(), overrides=None):
+        return cls(
+            compile_schedule(periods),
+            WeeklySchedule.from_periods(periods, workdays, daily_salary, tiers, holidays, overrides),
+            BreakLog(),
+            tuple(IncomeStream.from_definition(definition) for definition in streams),
+            overrides,
+        )
+
+    # 某一天的编译日程（时间轴显示用）：与日历计薪一致，休息日、节假日和请假当天为空日程，
+    # 调休上班日按常规工作日上班，单独设置过时间段的星期几使用自己的时间段
+    def schedule_on(self, day):
+        if not self.weekly.day_shifts(day):
+            return compile_schedule(())
+        weekday = day.weekday()
+        if self.weekly.holidays is not None and day in self.weekly.holidays.makeup:
+            weekday = self.weekly.regular_weekday
+        periods = self.overrides.get(weekday)
+        return self.schedule if periods is None else compile_schedule(periods)
+
+    @property
+    def daily_salary(self):
+        return self.weekly.daily_salary
+
+    @property
+    def total_work_seconds(self):
+        return self.schedule.total_seconds
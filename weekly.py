@@ -0,0 +1,329 @@
+# 周排班日历：每个星期几有自己的工作时间段（允许跨越午夜），
+# 在滚动窗口内编译为按绝对时间（Unix 秒）排序的分段线性累计收入，任意时刻的收入都通过二分查找得到
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from clock import get_timezone, local_epoch
+from engine import SECONDS_PER_DAY, time_to_seconds
+from lru import LRUCache
+from rates import base_seconds, normalize_tiers, price_shifts
+
+# 编译窗口覆盖的天数（从窗口起始日算起，另外向前多编译一天以覆盖前一晚的跨午夜班次）
+WINDOW_DAYS = 14
+ALL_WEEKDAYS = tuple(range(7))
+CALENDAR_CACHE_SIZE = 256
+# 目标反查最多向后查找的天数，更远的目标视为无法预计
+GOAL_HORIZON_DAYS = 366
+
+
+# 一天的班次：(开始秒, 结束秒)，结束不晚于开始的时间段视为跨越午夜；重叠的班次合并
+def normalize_shifts(periods):
+    shifts = []
+    for period in periods:
+        start = time_to_seconds(period["start_time"])
+        end = time_to_seconds(period["end_time"])
+        if start is None or end is None or start == end:
+            continue
+        if end < start:
+            end += SECONDS_PER_DAY
+        shifts.append((start, end))
+    shifts.sort()
+
+    merged = []
+    for start, end in shifts:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+# 每周排班：shifts[星期几] 为当天的班次（0 为星期一），daily_salary 为每个工作日的日薪，
+# 即当天不在倍率档位内的工作时间所得，tiers 为计薪倍率档位（见 rates.py）。pieces[星期几] 为按档位切分后的 (开始秒, 结束秒, 倍数)。
+# holidays 为节假日定义（见 workdays.py）：节假日和请假当天没有班次，调休上班日按常规工作日
+# （第一个有班次的星期几）的班次和倍率上班，不按当天星期几的周末倍率计薪
+class WeeklySchedule:
+    __slots__ = ("shifts", "daily_salary", "tiers", "pieces", "holidays", "regular_weekday", "regular")
+
+    def __init__(self, shifts, daily_salary, tiers=(), holidays=None):
+        self.shifts = tuple(tuple(day) for day in shifts)
+        self.daily_salary = daily_salary
+        self.tiers = normalize_tiers(tiers)
+        self.pieces = tuple(price_shifts(weekday, self.shifts[weekday], self.tiers) for weekday in ALL_WEEKDAYS)
+        self.holidays = holidays or None
+        self.regular_weekday = next((weekday for weekday in ALL_WEEKDAYS if self.shifts[weekday]), None)
+        self.regular = self.shifts[self.regular_weekday] if self.regular_weekday is not None else ()
+
+    # 选中的工作日使用同一组工作时间段；overrides 为 {星期几: 工作时间段}，这些星期几改用各自的时间段
+    # （不论是否在 workdays 中，空的时间段表示当天休息）
+    @classmethod
+    def from_periods(cls, periods, workdays, daily_salary, tiers=(), holidays=None, overrides=None):
+        shifts = normalize_shifts(periods)
+        overrides = overrides or {}
+        return cls(
+            [
+                normalize_shifts(overrides[weekday]) if weekday in overrides else shifts if weekday in workdays else ()
+                for weekday in ALL_WEEKDAYS
+            ],
+            daily_salary,
+            tiers,
+            holidays,
+        )
+
+    def key(self):
+        return (self.shifts, self.daily_salary, self.tiers, self.holidays.key() if self.holidays is not None else None)
+
+    # 某一天的班次
+    def day_shifts(self, day):
+        holidays = self.holidays
+        if holidays is not None:
+            if holidays.is_off(day):
+                return ()
+            if day in holidays.makeup:
+                return self.regular
+        return self.shifts[day.weekday()]
+
+    # 某一天按倍率档位切分后的班次
+    def day_pieces(self, day):
+        holidays = self.holidays
+        if holidays is not None:
+            if holidays.is_off(day):
+                return ()
+            if day in holidays.makeup:
+                return self.pieces[self.regular_weekday] if self.regular_weekday is not None else ()
+        return self.pieces[day.weekday()]
+
+    # 某一天按本地钟点计算的基础每秒收入：日薪 ÷ 当天不在倍率档位内的工作秒数，当天不上班时为 0
+    def base_rate(self, day):
+        seconds = base_seconds(self.day_pieces(day))
+        return self.daily_salary / seconds if seconds else 0.0
+
+    # 某一天按本地钟点计算的 (工作秒数, 收入)，不考虑夏令时切换
+    def day_totals(self, day):
+        pieces = self.day_pieces(day)
+        seconds = sum(end - start for start, end, _ in pieces)
+        if not seconds:
+            return 0, 0.0
+        return seconds, self.base_rate(day) * sum((end - start) * multiplier for start, end, multiplier in pieces)
+
+
+# 分段线性的累计收入曲线：starts/ends 为互不重叠的有序分段，slopes 为每段的每秒收入，
+# cum_pay/cum_work 为每段开始前的累计收入和累计工作秒数；任意时刻的查询都是一次二分查找
+class PayCurve:
+    __slots__ = ("starts", "ends", "slopes", "cum_pay", "cum_work")
+
+    # 扫描线：events 为按时刻排序的 (时刻, 每秒收入变化, 进行中的班次数变化)，合成为斜率分段；
+    # pay 为第一个分段开始前的累计收入
+    def _sweep(self, events, pay=0.0):
+        self.starts = []
+        self.ends = []
+        self.slopes = []
+        self.cum_pay = []
+        self.cum_work = []
+        work = 0.0
+        slope = 0.0
+        active = 0
+        previous = None
+        for moment, delta, count in events:
+            if active > 0 and moment > previous:
+                self.starts.append(previous)
+                self.ends.append(moment)
+                self.slopes.append(slope)
+                self.cum_pay.append(pay)
+                self.cum_work.append(work)
+                pay += slope * (moment - previous)
+                work += moment - previous
+            slope += delta
+            active += count
+            # 没有进行中的班次时斜率归零，避免浮点加减的残差累积
+            if active == 0:
+                slope = 0.0
+            previous = moment
+
+    def _locate(self, moment):
+        return bisect_right(self.starts, moment) - 1
+
+    # 截至某一时刻的累计收入（从窗口开始算起）
+    def pay_at(self, moment):
+        index = self._locate(moment)
+        if index < 0:
+            return self.cum_pay[0] if self.cum_pay else 0.0
+        return self.cum_pay[index] + self.slopes[index] * (min(moment, self.ends[index]) - self.starts[index])
+
+    # 截至某一时刻的累计工作秒数（从窗口开始算起）
+    def work_seconds_at(self, moment):
+        index = self._locate(moment)
+        if index < 0:
+            return 0.0
+        return self.cum_work[index] + min(moment, self.ends[index]) - self.starts[index]
+
+    # 某一时刻是否处于工作时间
+    def is_working_at(self, moment):
+        index = self._locate(moment)
+        return index >= 0 and moment < self.ends[index]
+
+    # 某一时刻的每秒收入（不在工作时间则为 0）
+    def rate_at(self, moment):
+        index = self._locate(moment)
+        if index >= 0 and moment < self.ends[index]:
+            return self.slopes[index]
+        return 0.0
+
+    # moment 之后下一次开始或停止计薪（或收入速率变化）的时刻；没有则为 None
+    def next_boundary(self, moment):
+        index = self._locate(moment)
+        if index >= 0 and moment < self.ends[index]:
+            return self.ends[index]
+        if index + 1 < len(self.starts):
+            return self.starts[index + 1]
+        return None
+
+    # 累计收入首次达到 pay 的时刻：在 cum_pay 上二分查找所在分段，再在段内反解一次线性插值；
+    # 曲线范围内达不到则为 None
+    def moment_of_pay(self, pay):
+        if not self.starts:
+            return None
+        if pay <= self.cum_pay[0]:
+            return self.starts[0]
+        index = bisect_left(self.cum_pay, pay) - 1
+        if pay > self.cum_pay[index] + self.slopes[index] * (self.ends[index] - self.starts[index]):
+            return None
+        return self.starts[index] + (pay - self.cum_pay[index]) / self.slopes[index]
+
+    # 区间 [start, end] 内赚取的金额
+    def earned_between(self, start, end):
+        return self.pay_at(end) - self.pay_at(start)
+
+
+# 编译后的日历：一个周排班在一个时区、从 first_day 起 WINDOW_DAYS 天内的累计收入曲线（已乘上倍率档位），
+# 以及用于确定“工作日”起算点的每天首个班次和本地午夜
+class CompiledCalendar(PayCurve):
+    __slots__ = ("timezone", "first_day", "day_starts", "day_ends", "day_dates", "midnights", "midnight_dates",
+                 "window_start", "window_end")
+
+    def __init__(self, weekly, timezone, first_day, days=WINDOW_DAYS):
+        tz = get_timezone(timezone)
+        self.timezone = timezone
+        self.first_day = first_day
+
+        events = []
+        self.day_starts = []
+        self.day_ends = []
+        self.day_dates = []
+        self.midnights = []
+        self.midnight_dates = []
+        for offset in range(-1, days + 1):
+            day = first_day + timedelta(days=offset)
+            self.midnights.append(local_epoch(tz, day, 0))
+            self.midnight_dates.append(day)
+            shifts = [(local_epoch(tz, day, start), local_epoch(tz, day, end)) for start, end in weekly.day_shifts(day)]
+            shifts = [(start, end) for start, end in shifts if end > start]
+            if not shifts:
+                continue
+            # 每个工作日的日薪按当天不在倍率档位内的实际工作秒数均摊为基础时薪（夏令时切换日也正好是一天的日薪），
+            # 落在倍率档位内的部分再乘上对应倍数，加班等档位在日薪之外另计
+            pieces = [(local_epoch(tz, day, start), local_epoch(tz, day, end), multiplier)
+                      for start, end, multiplier in weekly.day_pieces(day)]
+            pieces = [(start, end, multiplier) for start, end, multiplier in pieces if end > start]
+            rate = weekly.daily_salary / base_seconds(pieces)
+            for start, end, multiplier in pieces:
+                events.append((start, rate * multiplier, 1))
+                events.append((end, -rate * multiplier, -1))
+            self.day_starts.append(shifts[0][0])
+            self.day_ends.append(shifts[-1][1])
+            self.day_dates.append(day)
+        self.window_start = self.midnights[1]
+        self.window_end = self.midnights[-1]
+
+        # 扫描线：把所有班次的开始/结束事件合成为斜率分段
+        events.sort()
+        self._sweep(events)
+
+    # 某一时刻所属的“工作日”：(起算时刻, 日期)。
+    # 正在进行或跨过今天午夜的班次算作其开始那天，否则从本地午夜起算
+    def day_anchor(self, moment):
+        midnight_index = bisect_right(self.midnights, moment) - 1
+        midnight = self.midnights[midnight_index]
+        index = bisect_right(self.day_starts, moment) - 1
+        if index >= 0 and self.day_ends[index] > midnight:
+            return self.day_starts[index], self.day_dates[index]
+        return midnight, self.midnight_dates[midnight_index]
+
+    # 某一时刻所属工作日的 (日期, 已工作秒数, 已赚取金额)
+    def day_totals(self, moment):
+        anchor, day = self.day_anchor(moment)
+        return day, self.work_seconds_at(moment) - self.work_seconds_at(anchor), self.pay_at(moment) - self.pay_at(anchor)
+
+    # 工作日起算点变化的时刻及其累计收入，供浏览器端计数器在跨天时自行归零
+    def anchor_points(self):
+        moments = sorted(set(self.midnights[1:]) | set(start for start in self.day_starts if start >= self.window_start))
+        return [(moment, self.pay_at(self.day_anchor(moment)[0])) for moment in moments]
+
+
+_calendar_cache = LRUCache(CALENDAR_CACHE_SIZE)
+
+
+# 取出覆盖 moment 的编译日历：窗口从 moment 所在的本地日期开始，同一天内所有会话共享
+def get_calendar(weekly, timezone, moment):
+    first_day = datetime.fromtimestamp(moment, get_timezone(timezone)).date()
+    return _calendar_cache.get_or_create(
+        (weekly.key(), timezone, first_day),
+        lambda: CompiledCalendar(weekly, timezone, first_day),
+    )
+
+
+# 在按窗口编译的累计收入曲线上，从 moment 起再赚 amount 的时刻（Unix 秒）。get_curve(m) 返回覆盖 m 的曲线（带 window_end）；
+# 先在覆盖 moment 的曲线上反查，达不到时把剩余金额带到下一个窗口继续查（窗口在会话间共享缓存），
+# 跨天、跨月和长时间不工作的空档都只是多查几个窗口；GOAL_HORIZON_DAYS 天内达不到则为 None
+def earn_across_windows(get_curve, moment, amount):
+    curve = get_curve(moment)
+    target = curve.pay_at(moment) + amount
+    horizon = moment + GOAL_HORIZON_DAYS * SECONDS_PER_DAY
+    while True:
+        # 窗口末尾之后的分段缺少下一天的班次，只采信 window_end 之前的结果
+        reached = curve.moment_of_pay(target)
+        if reached is not None and reached <= curve.window_end:
+            return reached if reached <= horizon else None
+        if curve.window_end >= horizon:
+            return None
+        boundary = curve.window_end
+        remaining = target - curve.pay_at(boundary)
+        curve = get_curve(boundary)
+        target = curve.pay_at(boundary) + remaining
+
+
+# 一个周排班从 moment 起再赚 amount 的时刻；根本没有收入时为 None
+def time_to_earn(weekly, timezone, moment, amount):
+    if amount <= 0:
+        return moment
+    if weekly.daily_salary <= 0 or not weekly.regular:
+        return None
+    return earn_across_windows(lambda at: get_calendar(weekly, timezone, at), moment, amount)
+
+
+# 当前工作日的收入（从工作日起点算起）达到 amount 的时刻；已经达到时返回 (True, 当前时刻)
+def goal_eta(weekly, timezone, moment, amount):
+    earned = get_calendar(weekly, timezone, moment).day_totals(moment)[2]
+    if earned >= amount:
+        return True, moment
+    return False, time_to_earn(weekly, timezone, moment, amount - earned)
+
+
+# 某一时刻的收入状态（终端模式和 HTTP 接口共用的 JSON 结构）
+def status_at(weekly, timezone, epoch):
+    calendar = get_calendar(weekly, timezone, epoch)
+    day, work_seconds, earned = calendar.day_totals(epoch)
+    rate = calendar.rate_at(epoch)
+    return {
+        "time": datetime.fromtimestamp(epoch, get_timezone(timezone)).isoformat(timespec="seconds"),
+        "timezone": timezone,
+        "work_day": day.isoformat(),
+        "daily_salary": weekly.daily_salary,
+        "earned": round(earned, 4),
+        "work_seconds": round(work_seconds, 3),
+        "progress": round(earned / weekly.daily_salary * 100, 4) if weekly.daily_salary > 0 else 0.0,
+        "working": calendar.is_working_at(epoch),
+        "money_per_second": rate,
+        "seconds_per_dollar": 1 / rate if rate > 0 else None,
+    }
@@ -0,0 +1,243 @@
+# 工作日历：从本地文本文件读取节假日、调休上班日和请假，结合周排班逐年预计算工作日位图，
+# 以及每年每天之前的累计工作日数、工作秒数和收入，任意日期范围的预计收入都是两次数组查找相减，与范围长短无关
+#
+#   python workdays.py --from 2025-01-01 --to 2025-12-31 --salary 300
+#
+# 文件每行一个日期或日期范围（含两端），可带名称，# 开头为注释：
+#   2025-01-01 元旦                  节假日（不上班）
+#   2025-01-28..2025-02-04 春节      节假日范围
+#   +2025-01-26 春节调休              调休上班日（按常规班次上班）
+#   ~2025-03-10..2025-03-12 年假     请假（不上班）
+import argparse
+import os
+import threading
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+
+from importer import ImportFormatError
+from lru import LRUCache
+
+HOLIDAYS_DIR = os.environ.get(
+    "MONEYTRACKER_HOLIDAYS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "holidays"),
+)
+HOLIDAY_FILE_SUFFIX = ".txt"
+# 单个范围最多覆盖的天数，防止写错年份时生成巨大的集合
+MAX_RANGE_DAYS = 366
+WORKDAY_CALENDAR_CACHE_SIZE = 32
+
+# 行首标记 -> 日期类型
+KINDS = {"+": "makeup", "~": "leave"}
+
+
+# 一组节假日定义：holidays 和 leave 是不上班的日期，makeup 是调休上班的日期
+class HolidaySet:
+    __slots__ = ("holidays", "leave", "makeup", "names")
+
+    def __init__(self, holidays=(), leave=(), makeup=(), names=None):
+        self.holidays = frozenset(holidays)
+        self.leave = frozenset(leave)
+        self.makeup = frozenset(makeup)
+        self.names = names or {}
+
+    def __bool__(self):
+        return bool(self.holidays or self.leave or self.makeup)
+
+    # 不上班的日期
+    def is_off(self, day):
+        return day in self.holidays or day in self.leave
+
+    def key(self):
+        return (self.holidays, self.leave, self.makeup)
+
+    # [first, last] 范围内的 (日期, 类型, 名称)，按日期排序；类型为 holiday、leave 或 makeup
+    def between(self, first, last):
+        return sorted(
+            (day, kind, self.names.get(day, ""))
+            for kind, days in (("holiday", self.holidays), ("leave", self.leave), ("makeup", self.makeup))
+            for day in days
+            if first <= day <= last
+        )
+
+
+def _parse_date(text, number):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise ImportFormatError(number, f"invalid date {text!r}, expected YYYY-MM-DD")
+
+
+# 逐行解析，产出 (类型, 日期, 名称)；类型为 holiday、makeup 或 leave
+def iter_holiday_lines(lines):
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        kind = KINDS.get(line[0], "holiday")
+        if kind != "holiday":
+            line = line[1:].lstrip()
+        dates, _, name = line.partition(" ")
+        first, _, last = dates.partition("..")
+        first = _parse_date(first, number)
+        last = _parse_date(last, number) if last else first
+        if last < first or (last - first).days >= MAX_RANGE_DAYS:
+            raise ImportFormatError(number, f"invalid range {dates!r}")
+        for offset in range((last - first).days + 1):
+            yield kind, first + timedelta(days=offset), name.strip()
+
+
+# 读取若干个文件合并为一个 HolidaySet；同一天在后面的文件里出现时覆盖前面的定义
+def load_holiday_files(paths):
+    days = {}
+    names = {}
+    for path in paths:
+        with open(path, encoding="utf-8-sig") as lines:
+            try:
+                for kind, day, name in iter_holiday_lines(lines):
+                    days[day] = kind
+                    if name:
+                        names[day] = name
+            except ImportFormatError as error:
+                error.args = (f"{os.path.basename(path)}: {error.args[0]}",)
+                raise
+    return HolidaySet(
+        (day for day, kind in days.items() if kind == "holiday"),
+        (day for day, kind in days.items() if kind == "leave"),
+        (day for day, kind in days.items() if kind == "makeup"),
+        names,
+    )
+
+
+_holiday_cache = LRUCache(WORKDAY_CALENDAR_CACHE_SIZE)
+
+
+# 按路径和修改时间缓存，文件改动后自动重新读取
+def load_holidays(paths):
+    key = tuple((path, os.path.getmtime(path)) for path in paths)
+    return _holiday_cache.get_or_create(key, lambda: load_holiday_files(paths))
+
+
+# 节假日目录下可选的文件名（不含扩展名）-> 路径
+def list_holiday_files(directory=HOLIDAYS_DIR):
+    if not os.path.isdir(directory):
+        return {}
+    return {
+        name[:-len(HOLIDAY_FILE_SUFFIX)]: os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith(HOLIDAY_FILE_SUFFIX)
+    }
+
+
+# 一年的预计算表：bits 的第 i 位表示当年第 i 天（从 0 起）是否上班；
+# cum_days/cum_seconds/cum_pay[i] 为当年第 i 天之前的累计值，最后一项为全年合计
+class _YearTable:
+    __slots__ = ("first_day", "bits", "cum_days", "cum_seconds", "cum_pay")
+
+    def __init__(self, weekly, year):
+        self.first_day = date(year, 1, 1)
+        count = (date(year + 1, 1, 1) - self.first_day).days
+        bits = 0
+        days = []
+        seconds = []
+        pay = []
+        for offset in range(count):
+            day = self.first_day + timedelta(days=offset)
+            day_seconds, day_pay = weekly.day_totals(day)
+            if day_seconds > 0:
+                bits |= 1 << offset
+            days.append(1 if day_seconds > 0 else 0)
+            seconds.append(day_seconds)
+            pay.append(day_pay)
+        self.bits = bits
+        self.cum_days = array("H", accumulate(days, initial=0))
+        self.cum_seconds = array("d", accumulate(seconds, initial=0))
+        self.cum_pay = array("d", accumulate(pay, initial=0))
+
+
+# 工作日历：按需逐年建表，并维护每年年初之前的累计值，使跨年的范围查询同样只需两次查表。
+# 在会话间共享：已建表的年份和年初累计值作为一个整体替换，读取时不需要加锁
+class WorkdayCalendar:
+    def __init__(self, weekly):
+        self.weekly = weekly
+        # (年份 -> _YearTable, 年份 -> 该年年初之前（从已建表的最早一年起）的 (工作日数, 工作秒数, 收入))
+        self._state = ({}, {})
+        self._lock = threading.Lock()
+
+    # 覆盖 first..last 年的表；已建表的年份保持连续，中间的年份一并建表
+    def _covering(self, first, last):
+        state = self._state
+        if first in state[0] and last in state[0]:
+            return state
+        with self._lock:
+            years = dict(self._state[0])
+            if years:
+                first, last = min(first, min(years)), max(last, max(years))
+            for year in range(first, last + 1):
+                if year not in years:
+                    years[year] = _YearTable(self.weekly, year)
+            total = (0, 0.0, 0.0)
+            bases = {}
+            for year in sorted(years):
+                bases[year] = total
+                table = years[year]
+                total = (total[0] + table.cum_days[-1], total[1] + table.cum_seconds[-1], total[2] + table.cum_pay[-1])
+            self._state = (years, bases)
+            return self._state
+
+    @staticmethod
+    def _before(state, day):
+        table = state[0][day.year]
+        index = (day - table.first_day).days
+        base = state[1][day.year]
+        return base[0] + table.cum_days[index], base[1] + table.cum_seconds[index], base[2] + table.cum_pay[index]
+
+    # 某一天是否上班
+    def is_workday(self, day):
+        table = self._covering(day.year, day.year)[0][day.year]
+        return bool(table.bits >> (day - table.first_day).days & 1)
+
+    # [first, last] 两端都包含的日期范围内的 (工作日数, 预计工作秒数, 预计收入)
+    def expected_between(self, first, last):
+        if last < first:
+            return 0, 0.0, 0.0
+        last = last + timedelta(days=1)
+        state = self._covering(first.year, last.year)
+        after = self._before(state, last)
+        before = self._before(state, first)
+        return after[0] - before[0], after[1] - before[1], after[2] - before[2]
+
+
+_workday_cache = LRUCache(WORKDAY_CALENDAR_CACHE_SIZE)
+
+
+# 按周排班（含节假日定义）在会话间共享的工作日历
+def get_workday_calendar(weekly):
+    return _workday_cache.get_or_create(weekly.key(), lambda: WorkdayCalendar(weekly))
+
+
+def main():
+    from presets import DEFAULT_WORK_PERIODS
+    from terminal import parse_period, parse_workdays
+    from weekly import WeeklySchedule
+
+    parser = argparse.ArgumentParser(description="Count workdays and expected earnings between two dates")
+    parser.add_argument("files", nargs="*", help="holiday/leave files (default: every file in the holidays directory)")
+    parser.add_argument("--from", dest="first", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="last", type=date.fromisoformat, required=True)
+    parser.add_argument("--salary", type=float, default=300.0, help="daily salary")
+    parser.add_argument("--period", type=parse_period, action="append",
+                        help="work period HH:MM-HH:MM, repeatable (default: 09:00-12:00 and 14:00-18:00)")
+    parser.add_argument("--workdays", type=parse_workdays, default=(0, 1, 2, 3, 4),
+                        help="regular workdays, e.g. 0-4 or 0,2,4 (0 is Monday)")
+    args = parser.parse_args()
+
+    paths = args.files or list(list_holiday_files().values())
+    weekly = WeeklySchedule.from_periods(args.period or DEFAULT_WORK_PERIODS, args.workdays, args.salary,
+                                         holidays=load_holidays(paths))
+    days, seconds, earned = get_workday_calendar(weekly).expected_between(args.first, args.last)
+    print(f"{args.first} .. {args.last}: {days} workdays, {seconds / 3600:.1f} hours, ${earned:.2f}")
+
+
+if __name__ == "__main__":
+    main()